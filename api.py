@@ -0,0 +1,363 @@
+#!/usr/bin/python3
+"""Module api
+
+This Module contains a definition for HBNBRequestHandler Class, serving
+the operations of the console over HTTP with JSON bodies:
+
+    GET    /                    every object
+    GET    /<class>             the instances of a class
+    POST   /<class>             create an instance from an object
+    GET    /<class>/count       {"count": <number of instances>}
+    GET    /<class>/<id>        show an instance
+    PUT    /<class>/<id>        update an instance from an object
+    DELETE /<class>/<id>        destroy an instance
+    POST   /<class>/bulk        create instances from a list of objects
+    PUT    /<class>/bulk        update instances from an {id: object} map
+    DELETE /<class>/bulk        destroy instances from a list of ids
+
+Lists accept the where (as in the where command), order_by, reverse,
+limit and offset query parameters, return the total number of matches in
+the X-Total-Count header and are streamed in chunks. Connections are kept
+alive between requests. The server listens on HBNB_API_HOST and
+HBNB_API_PORT, 0.0.0.0:5000 by default.
+"""
+
+import json
+import os
+import threading
+from contextlib import nullcontext
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from models import storage
+from models.engine import registry
+from models.engine.query import Condition, cast_value, paginate
+
+READ_ONLY = ("id", "created_at", "updated_at", "__class__")
+
+
+class ApiError(Exception):
+    """ApiError Class
+
+    Raised to answer a request with an error
+
+    Attributes:
+        status (int): HTTP status of the response
+        message (str): error message of the response
+    """
+
+    def __init__(self, status, message):
+        """__init__ method & instantiation of class ApiError
+
+        Args:
+            status (int): HTTP status of the response
+            message (str): error message of the response
+        """
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class HBNBServer(ThreadingHTTPServer):
+    """HBNBServer Class
+
+    A server handling every connection in its own thread. Requests are
+    served one at a time unless the storage is thread-safe, in which case
+    the ones changing objects hold its lock for writing.
+
+    Attributes:
+        lock: context held while a request is served
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address):
+        """__init__ method & instantiation of class HBNBServer
+
+        Args:
+            address (tuple): (host, port) to listen on
+        """
+        super().__init__(address, HBNBRequestHandler)
+        self.lock = (threading.Lock() if getattr(storage, "lock", None) is None
+                     else nullcontext())
+
+    def storage_lock(self, method):
+        """returns the context holding the lock of a thread-safe storage for
+        writing while a POST, PUT or DELETE request is served, so that the
+        objects it reads are not changed or deleted before it writes them
+        """
+        lock = getattr(storage, "lock", None)
+        if lock is None or method == "GET":
+            return nullcontext()
+        return lock.write()
+
+    def server_close(self):
+        """Close the server and write the changes storage still holds"""
+        super().server_close()
+        flush = getattr(storage, "flush", None)
+        if flush is not None:
+            flush()
+
+
+class HBNBRequestHandler(BaseHTTPRequestHandler):
+    """HBNBRequestHandler Class
+
+    Attributes:
+        CHUNK (int): number of objects per chunk of a streamed list
+    """
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    CHUNK = 100
+
+    def do_GET(self):
+        """serves a GET request"""
+        self.dispatch("GET")
+
+    def do_POST(self):
+        """serves a POST request"""
+        self.dispatch("POST")
+
+    def do_PUT(self):
+        """serves a PUT request"""
+        self.dispatch("PUT")
+
+    def do_DELETE(self):
+        """serves a DELETE request"""
+        self.dispatch("DELETE")
+
+    def dispatch(self, method):
+        """routes a request to the method serving it and sends its response,
+        or the error it raises, if any
+
+        The response is built holding the locks and sent after releasing
+        them, so that a slow client does not hold up the other requests.
+        """
+        url = urlsplit(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        try:
+            body = self.read_body()
+            with self.server.lock:
+                reload_changes = getattr(storage, "reload_changes", None)
+                if reload_changes is not None:
+                    reload_changes()
+                with self.server.storage_lock(method):
+                    send = self.route(method, parts, parse_qs(url.query),
+                                      body)
+            send()
+        except ApiError as error:
+            self.send_json(error.status, {"error": error.message})
+        except Exception as error:
+            self.log_error("%r", error)
+            self.send_json(500, {"error": "** internal error **"})
+
+    def route(self, method, parts, params, body):
+        """calls the method serving a request and returns the function
+        sending its response
+        """
+        if len(parts) == 0 and method == "GET":
+            return self.list_objects(None, params)
+        if len(parts) == 0 or len(parts) > 2:
+            raise ApiError(404, "** unknown path **")
+        obj_cls = self.get_class(parts[0])
+        target = parts[1] if len(parts) == 2 else None
+        routes = {
+            (None, "GET"): lambda: self.list_objects(obj_cls, params),
+            (None, "POST"): lambda: partial(
+                self.send_json, 201,
+                self.create_objects(obj_cls, [body])[0]),
+            ("count", "GET"): lambda: partial(
+                self.send_json, 200, {"count": storage.count(obj_cls)}),
+            ("bulk", "POST"): lambda: partial(
+                self.send_json, 201, self.create_objects(obj_cls, body)),
+            ("bulk", "PUT"): lambda: partial(
+                self.send_json, 200, self.update_objects(obj_cls, body)),
+            ("bulk", "DELETE"): lambda: self.destroy_many(obj_cls, body),
+            ("id", "GET"): lambda: partial(
+                self.send_json, 200,
+                self.get_objects(obj_cls, [target])[0].to_dict()),
+            ("id", "PUT"): lambda: partial(
+                self.send_json, 200,
+                self.update_objects(obj_cls, {target: body})[0]),
+            ("id", "DELETE"): lambda: self.destroy_many(obj_cls, [target]),
+        }
+        kind = target if target in (None, "count", "bulk") else "id"
+        if (kind, method) not in routes:
+            raise ApiError(405, "** method not allowed **")
+        return routes[(kind, method)]()
+
+    def create_objects(self, obj_cls, records):
+        """creates instances from a list of attribute dictionaries, saves
+        them and returns their dictionaries
+        """
+        if (not isinstance(records, list)
+                or not all(isinstance(attrs, dict) for attrs in records)):
+            raise ApiError(400, "** invalid json **")
+        self.check_attributes(obj_cls, records)
+        new_objs = []
+        for attrs in records:
+            new_obj = obj_cls()
+            for name, value in attrs.items():
+                if name not in READ_ONLY:
+                    setattr(new_obj, name, cast_value(new_obj, name, value))
+            new_objs.append(new_obj)
+        storage.bulk_insert(new_objs)
+        return [new_obj.to_dict() for new_obj in new_objs]
+
+    def update_objects(self, obj_cls, changes):
+        """updates instances from an {id: attributes} mapping, saves them
+        once and returns their dictionaries
+        """
+        if (not isinstance(changes, dict)
+                or not all(isinstance(attrs, dict)
+                           for attrs in changes.values())):
+            raise ApiError(400, "** invalid json **")
+        self.check_attributes(obj_cls, changes.values())
+        saved_objs = self.get_objects(obj_cls, changes)
+        storage.bulk_update(
+            (saved_obj, {name: cast_value(saved_obj, name, value)
+                         for name, value in attrs.items()
+                         if name not in READ_ONLY})
+            for saved_obj, attrs in zip(saved_objs, changes.values()))
+        return [saved_obj.to_dict() for saved_obj in saved_objs]
+
+    def check_attributes(self, obj_cls, records):
+        """raises an error if a dictionary of records sets a private
+        attribute or hides a method of obj_cls, before any object changes
+        """
+        for attrs in records:
+            for name in attrs:
+                if name in READ_ONLY:
+                    continue
+                if (name.startswith("_")
+                        or callable(getattr(obj_cls, name, None))):
+                    raise ApiError(400, f"** invalid attribute {name} **")
+
+    def destroy_many(self, obj_cls, ids):
+        """deletes instances from a list of ids and saves once"""
+        if not isinstance(ids, list):
+            raise ApiError(400, "** invalid json **")
+        storage.bulk_delete(self.get_objects(obj_cls, ids))
+        return self.send_no_content
+
+    def send_no_content(self):
+        """sends an empty 204 response"""
+        self.send_response(204)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def list_objects(self, obj_cls, params):
+        """returns the function streaming the dictionaries of the instances
+        of obj_cls, or of every object, matching the query parameters
+        """
+        def param(name, cast=str, default=None):
+            """returns the query parameter name converted by cast"""
+            try:
+                return cast(params[name][-1]) if name in params else default
+            except ValueError:
+                raise ApiError(400, f"** invalid {name} **")
+
+        def natural(text):
+            """returns text as a non negative int"""
+            value = int(text)
+            if value < 0:
+                raise ValueError(f"negative value {value}")
+            return value
+
+        try:
+            conditions = Condition.parse(param("where", default=""))
+        except ValueError:
+            raise ApiError(400, "** invalid condition **")
+        order_by = param("order_by")
+        reverse = param("reverse", default="") in ("1", "true")
+        limit = param("limit", natural)
+        offset = param("offset", natural, 0)
+        result = storage.query(obj_cls, conditions)
+        total = len(result)
+        try:
+            result = paginate(result, order_by, reverse, limit, offset)
+        except ValueError:
+            raise ApiError(400, "** invalid order_by **")
+        return partial(self.send_list, total,
+                       [obj.to_dict() for obj in result])
+
+    def send_list(self, total, dicts):
+        """streams a list of dictionaries in chunks
+
+        Args:
+            total (int): number of matches, sent in X-Total-Count
+            dicts (list): the dictionaries of the listed objects
+        """
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.send_header("X-Total-Count", str(total))
+        self.end_headers()
+        self.write_chunk("[")
+        for start in range(0, len(dicts), self.CHUNK):
+            chunk = ", ".join(json.dumps(obj_dict)
+                              for obj_dict in dicts[start:start + self.CHUNK])
+            self.write_chunk(chunk if start == 0 else ", " + chunk)
+        self.write_chunk("]")
+        self.write_chunk("")
+
+    def write_chunk(self, text):
+        """writes a chunk of a chunked response, the last one if empty"""
+        data = text.encode("utf-8")
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data
+                         + b"\r\n")
+
+    def send_json(self, status, value):
+        """sends a response with a JSON body"""
+        data = json.dumps(value).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def read_body(self):
+        """returns the JSON value of the request body, None if empty"""
+        try:
+            length = int(self.headers.get("Content-Length", 0) or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            raise ApiError(400, "** invalid content length **")
+        if length == 0:
+            return None
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            raise ApiError(400, "** invalid json **")
+
+    def get_objects(self, obj_cls, ids):
+        """returns the list of the instances of a class with the given ids
+        """
+        saved_objs = []
+        for id in ids:
+            saved_obj = storage.get(obj_cls.__name__, str(id))
+            if saved_obj is None:
+                raise ApiError(404, "** no instance found **")
+            saved_objs.append(saved_obj)
+        return saved_objs
+
+    def get_class(self, name):
+        """returns a class from models module using its name"""
+        try:
+            return registry.get_class(name)
+        except KeyError:
+            raise ApiError(404, "** class doesn't exist **")
+
+
+if __name__ == '__main__':
+    server = HBNBServer((os.getenv("HBNB_API_HOST") or "0.0.0.0",
+                         int(os.getenv("HBNB_API_PORT") or 5000)))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
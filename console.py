@@ -5,34 +5,54 @@ This Module contains a definition for HBNBCommand Class
 """
 
 import cmd
-import importlib
 import json
 import re
-from typing import cast
 
 from models import storage
+from models.engine import registry
+from models.engine.query import Condition, cast_value
 
 
 class HBNBCommand(cmd.Cmd):
     """AirBnB clone console"""
 
     prompt = "(hbnb) "
+    RAW_ARGS_COMMANDS = ["where", "near", "within", "create_many",
+                         "update_many", "destroy_many"]
+    READ_ONLY = ["id", "created_at", "updated_at", "__class__"]
 
     def do_quit(self, line):
         """Quit command to exit the program\n"""
+        self.flush_storage()
         return True
 
     def do_EOF(self, line):
         """Exist the console using Ctrl + D"""
         print()
+        self.flush_storage()
         return True
 
+    def flush_storage(self):
+        """writes the changes a write-behind storage still holds"""
+        flush = getattr(storage, "flush", None)
+        if flush is not None:
+            flush()
+
     def emptyline(self):
         """prevents default behavior of cmd to ignore running command on
         empty line plus enter
         """
         pass
 
+    def precmd(self, line):
+        """picks up the changes other processes saved to a shared storage
+        before running a command
+        """
+        reload_changes = getattr(storage, "reload_changes", None)
+        if reload_changes is not None:
+            reload_changes()
+        return line
+
     def do_create(self, line):
         """creates a new object and saves it"""
         obj_cls = self.get_class_from_input(line)
@@ -48,7 +68,7 @@ class HBNBCommand(cmd.Cmd):
         if key is None:
             return
 
-        saved_obj = storage.all().get(key, None)
+        saved_obj = storage.get(*key.split(".", 1))
         if saved_obj is None:
             print("** no instance found **")
         else:
@@ -62,10 +82,11 @@ class HBNBCommand(cmd.Cmd):
         if key is None:
             return
 
-        saved_obj = storage.all().pop(key, None)
+        saved_obj = storage.get(*key.split(".", 1))
         if saved_obj is None:
             print("** no instance found **")
         else:
+            storage.delete(saved_obj)
             storage.save()
 
     def do_all(self, line):
@@ -78,8 +99,7 @@ class HBNBCommand(cmd.Cmd):
             obj_cls = self.get_class_from_input(line)
             if obj_cls is None:
                 return
-            result = list(filter(lambda item: isinstance(
-                item, obj_cls), storage.all().values()))
+            result = storage.all(obj_cls).values()
 
         print([str(item) for item in result])
 
@@ -91,7 +111,7 @@ class HBNBCommand(cmd.Cmd):
         if key is None:
             return
 
-        saved_obj = storage.all().get(key, None)
+        saved_obj = storage.get(*key.split(".", 1))
         if saved_obj is None:
             print("** no instance found **")
         else:
@@ -99,21 +119,184 @@ class HBNBCommand(cmd.Cmd):
             if attr_name is None or attr_val is None:
                 return
 
-            if hasattr(saved_obj, attr_name):
-                attr_type = type(getattr(saved_obj, attr_name))
-                attr_val = cast(attr_type, attr_val)
+            attr_val = cast_value(saved_obj, attr_name, attr_val)
             setattr(saved_obj, attr_name, attr_val)
             saved_obj.save()
 
+    def do_create_many(self, line):
+        """creates instances of a class from a JSON list of dictionaries of
+        attributes, saves them once and prints their ids, such as
+        create_many Place [{"name": "Loft"}, {"name": "Cabin"}]
+        """
+        obj_cls, records = self.get_json_from_input(line, list)
+        if obj_cls is None:
+            return
+        if not all(isinstance(record, dict) for record in records):
+            print("** invalid json **")
+            return
+        if not self.check_attributes(obj_cls, records):
+            return
+
+        new_objs = []
+        with storage.transaction():
+            for record in records:
+                new_obj = obj_cls()
+                for name, value in record.items():
+                    if name not in self.READ_ONLY:
+                        setattr(new_obj, name,
+                                cast_value(new_obj, name, value))
+                new_objs.append(new_obj)
+            storage.bulk_insert(new_objs)
+        for new_obj in new_objs:
+            print(new_obj.id)
+
+    def do_update_many(self, line):
+        """updates instances of a class from a JSON object mapping their ids
+        to dictionaries of attributes and saves the changes once, such as
+        update_many Place {"<id>": {"max_guest": 4}}
+        """
+        obj_cls, changes = self.get_json_from_input(line, dict)
+        if obj_cls is None:
+            return
+        if not all(isinstance(attrs, dict) for attrs in changes.values()):
+            print("** invalid json **")
+            return
+        if not self.check_attributes(obj_cls, changes.values()):
+            return
+
+        saved_objs = self.get_objects(obj_cls, changes)
+        if saved_objs is None:
+            return
+        storage.bulk_update(
+            (saved_obj, {name: cast_value(saved_obj, name, value)
+                         for name, value in attrs.items()
+                         if name not in self.READ_ONLY})
+            for saved_obj, attrs in zip(saved_objs, changes.values()))
+
+    def do_destroy_many(self, line):
+        """deletes instances of a class from a JSON list of their ids and
+        saves the change once, such as destroy_many Place ["<id>", "<id>"]
+        """
+        obj_cls, ids = self.get_json_from_input(line, list)
+        if obj_cls is None:
+            return
+
+        saved_objs = self.get_objects(obj_cls, ids)
+        if saved_objs is not None:
+            storage.bulk_delete(saved_objs)
+
     def do_count(self, line):
         """prints the count of all instances based the class name"""
         obj_cls = self.get_class_from_input(line)
         if obj_cls is None:
             return
-        result = list(filter(lambda item: isinstance(
-            item, obj_cls), storage.all().values()))
 
-        print(len(result))
+        print(storage.count(obj_cls))
+
+    def do_where(self, line):
+        """prints all string representation of the instances of a class
+        satisfying conditions such as price_by_night<100, max_guest>=4
+        """
+        obj_cls = self.get_class_from_input(line)
+        if obj_cls is None:
+            return
+        try:
+            conditions = Condition.parse(line.strip()[len(line.split()[0]):])
+        except ValueError:
+            print("** invalid condition **")
+            return
+
+        result = storage.query(obj_cls, conditions)
+        print([str(item) for item in result])
+
+    def do_near(self, line):
+        """prints all string representation of the instances of a class
+        within a radius in kilometers of a point, nearest first, such as
+        near Place 37.77 -122.41 5
+        """
+        obj_cls, args = self.get_spatial_args(line, 3)
+        if obj_cls is None:
+            return
+
+        result = storage.near(obj_cls, *args)
+        print([str(item) for item in result])
+
+    def do_within(self, line):
+        """prints all string representation of the instances of a class
+        inside a bounding box, such as within Place south west north east
+        """
+        obj_cls, args = self.get_spatial_args(line, 4)
+        if obj_cls is None:
+            return
+
+        result = storage.within(obj_cls, *args).values()
+        print([str(item) for item in result])
+
+    def get_spatial_args(self, line, count):
+        """parses and returns the class and the count numbers following it,
+        for classes with __spatial__ attributes
+        """
+        obj_cls = self.get_class_from_input(line)
+        if obj_cls is None:
+            return None, None
+        if len(getattr(obj_cls, "__spatial__", ())) != 2:
+            print("** class has no coordinates **")
+            return None, None
+        try:
+            args = [float(arg) for arg in line.replace(",", " ").split()[1:]]
+        except ValueError:
+            args = []
+        if len(args) != count:
+            print("** invalid coordinates **")
+            return None, None
+        return obj_cls, args
+
+    def get_json_from_input(self, line, json_type):
+        """parses and returns the class and the JSON value of type json_type
+        following it
+        """
+        obj_cls = self.get_class_from_input(line)
+        if obj_cls is None:
+            return None, None
+        json_str = line.strip()[len(line.split()[0]):].strip()
+        value = None
+        for text in [json_str, json_str.replace("'", '"')]:
+            try:
+                value = json.loads(text)
+                break
+            except ValueError:
+                continue
+        if not isinstance(value, json_type):
+            print("** invalid json **")
+            return None, None
+        return obj_cls, value
+
+    def check_attributes(self, obj_cls, records):
+        """returns False, after printing an error, if a dictionary of
+        records sets a private attribute or hides a method of obj_cls
+        """
+        for attrs in records:
+            for name in attrs:
+                if name in self.READ_ONLY:
+                    continue
+                if (name.startswith("_")
+                        or callable(getattr(obj_cls, name, None))):
+                    print(f"** invalid attribute {name} **")
+                    return False
+        return True
+
+    def get_objects(self, obj_cls, ids):
+        """returns the list of the instances of a class with the given ids,
+        or None if one is not found
+        """
+        saved_objs = []
+        for id in ids:
+            saved_obj = storage.get(obj_cls.__name__, str(id))
+            if saved_obj is None:
+                print("** no instance found **")
+                return None
+            saved_objs.append(saved_obj)
+        return saved_objs
 
     def get_obj_key_from_input(self, line):
         """parses and returns object key from input"""
@@ -160,10 +343,8 @@ class HBNBCommand(cmd.Cmd):
     def get_class(self, name):
         """ returns a class from models module using its name"""
         try:
-            sub_module = re.sub('(?!^)([A-Z]+)', r'_\1', name).lower()
-            module = importlib.import_module(f"models.{sub_module}")
-            return getattr(module, name)
-        except Exception:
+            return registry.get_class(name)
+        except KeyError:
             print("** class doesn't exist **")
             return None
 
@@ -179,7 +360,9 @@ class HBNBCommand(cmd.Cmd):
 
         if func_name is None:
             print(
-                "** incorrect function (all, count, show, destroy & update) **"
+                "** incorrect function "
+                "(all, count, show, destroy, update, where, near, within, "
+                "create_many, update_many & destroy_many) **"
             )
             return
 
@@ -189,6 +372,8 @@ class HBNBCommand(cmd.Cmd):
             self.do_count(cls_name)
         elif func_name == "all":
             self.do_all(cls_name)
+        elif func_name in self.RAW_ARGS_COMMANDS:
+            getattr(self, f"do_{func_name}")(f"{cls_name} {args}")
         elif func_name == "show":
             self.do_show(f"{cls_name} {id}")
         elif func_name == "destroy":
@@ -198,24 +383,26 @@ class HBNBCommand(cmd.Cmd):
                 args = " ".join([id, args])
                 self.do_update(f"{cls_name} {args}")
             elif isinstance(args, dict):
-                for k, v in args.items():
-                    self.do_update(f"{cls_name} {id} {k} {v}")
+                self.do_update_many(f"{cls_name} {json.dumps({id: args})}")
 
     def parse_input(self, input):
-        args = input.split('.')
+        args = input.split('.', 1)
         if len(args) != 2:
             return None, None, None, None
 
         cls_name = args[0]
-        valid_commands = ["all", "count", "show", "destroy", "update"]
+        valid_commands = ["all", "count", "show", "destroy", "update",
+                          *self.RAW_ARGS_COMMANDS]
         if '(' not in args[1] or ')' not in args[1]:
             return cls_name, None, None, None
 
-        func_w_args = args[1].split("(")
+        func_w_args = args[1].split("(", 1)
         if len(func_w_args) == 0 or func_w_args[0] not in valid_commands:
             return cls_name, None, None, None
         func_name = func_w_args[0]
         f_args = func_w_args[1].strip(')')
+        if func_name in self.RAW_ARGS_COMMANDS:
+            return cls_name, func_name, None, f_args
 
         id_match = re.match(r'(^\"[\w-]+\")', f_args)
         if len(f_args) == 0 or id_match is None:
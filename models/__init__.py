@@ -1,8 +1,56 @@
 #!/usr/bin/python3
-"""Creates a unique FileStorage instance for the application"""
+"""Creates a unique storage instance for the application
+
+The SQLite DBStorage engine is used when HBNB_TYPE_STORAGE is db, and
+FileStorage otherwise. The processes FileStorage starts to reload its
+shards in parallel set HBNB_STORAGE_WORKER and skip the reload.
+HBNB_COMPACT_MODELS lists the model classes, such as Place,Review, whose
+compact version is instantiated instead. HBNB_STORAGE_FSYNC sets when
+either engine syncs its files to disk: always, batch or never.
+HBNB_STORAGE_SHARED=1 lets several FileStorage processes share the files
+and HBNB_STORAGE_THREADSAFE=1 several threads share the objects.
+HBNB_STORAGE_WRITE_BEHIND sets the delay in milliseconds of the writes of
+a write-behind FileStorage, flushed when the interpreter exits.
+"""
+
+import atexit
+import os
 
 from models.engine.file_storage import FileStorage
 
 
-storage = FileStorage()
-storage.reload()
+def _env_int(name):
+    """returns the integer value of an environment variable, if set"""
+    value = os.getenv(name)
+    return int(value) if value else None
+
+
+if os.getenv("HBNB_COMPACT_MODELS"):
+    from models.engine.compact import use_compact
+    use_compact(*os.getenv("HBNB_COMPACT_MODELS").split(","))
+
+if os.getenv("HBNB_TYPE_STORAGE") == "db":
+    from models.engine.db_storage import DBStorage
+    storage = DBStorage(os.getenv("HBNB_DB_PATH"),
+                        fsync=os.getenv("HBNB_STORAGE_FSYNC") or "batch")
+else:
+    storage = FileStorage(
+        os.getenv("HBNB_STORAGE_PATH"),
+        journal=os.getenv("HBNB_STORAGE_JOURNAL") == "1",
+        compact_records=_env_int("HBNB_STORAGE_COMPACT_RECORDS"),
+        compact_bytes=_env_int("HBNB_STORAGE_COMPACT_BYTES"),
+        background=os.getenv("HBNB_STORAGE_COMPACT_BACKGROUND") == "1",
+        lazy=os.getenv("HBNB_STORAGE_LAZY") == "1",
+        format=os.getenv("HBNB_STORAGE_FORMAT") or "json",
+        compression=os.getenv("HBNB_STORAGE_COMPRESSION") or None,
+        sharded=os.getenv("HBNB_STORAGE_SHARDED") == "1",
+        workers=_env_int("HBNB_STORAGE_WORKERS"),
+        indexed=os.getenv("HBNB_STORAGE_INDEXED") == "1",
+        fsync=os.getenv("HBNB_STORAGE_FSYNC") or "never",
+        fsync_interval=_env_int("HBNB_STORAGE_FSYNC_INTERVAL") or 1000,
+        shared=os.getenv("HBNB_STORAGE_SHARED") == "1",
+        threadsafe=os.getenv("HBNB_STORAGE_THREADSAFE") == "1",
+        write_behind=_env_int("HBNB_STORAGE_WRITE_BEHIND"))
+    atexit.register(storage.flush)
+if os.getenv("HBNB_STORAGE_WORKER") != "1":
+    storage.reload()
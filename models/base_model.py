@@ -8,52 +8,106 @@ import uuid
 from datetime import datetime
 
 import models
+from models.engine import registry
 
 
 class BaseModel:
-    """BaseModel Class"""
+    """BaseModel Class
+
+    Attributes:
+        __indexes__ (tuple): names of the attributes storage indexes
+    """
+
+    __indexes__ = ()
+
+    def __init_subclass__(cls, register=True, **kwargs):
+        """Register every model class in the model registry
+
+        Args:
+            register (bool): False for classes registered explicitly, such
+                as the compact versions of the model classes
+        """
+        super().__init_subclass__(**kwargs)
+        if register:
+            registry.register(cls)
 
     def __init__(self, *args, **kwargs):
         """__init__ method & instantiation of class Basemodel
 
+        The attributes are set without reporting them to storage, which
+        does not hold the object yet.
+
         Args:
             *args.
             **kwargs (dict): Key/value pairs
         """
-        self.id = str(uuid.uuid4())
-        self.created_at = datetime.now()
-        self.updated_at = datetime.now()
-
-        if kwargs is not None and len(kwargs) > 0:
-            for k, v in kwargs.items():
-                if k == "__class__":
-                    continue
-                elif k in ["created_at", "updated_at"]:
-                    setattr(self, k, datetime.fromisoformat(v))
-                else:
-                    setattr(self, k, v)
-        else:
+        attrs = {"id": None, "created_at": None, "updated_at": None}
+        for k, v in kwargs.items():
+            if k == "__class__":
+                continue
+            if k in ["created_at", "updated_at"] and not isinstance(
+                    v, datetime):
+                v = datetime.fromisoformat(v)
+            attrs[k] = v
+        if "id" not in kwargs:
+            attrs["id"] = str(uuid.uuid4())
+        for k in ["created_at", "updated_at"]:
+            if k not in kwargs:
+                attrs[k] = datetime.now()
+        self._set_attributes(attrs)
+        if len(kwargs) == 0:
             models.storage.new(self)
 
+    def _set_attributes(self, attrs):
+        """Set attributes without reporting them to storage as changed
+
+        Args:
+            attrs (dict): names and values of the attributes
+        """
+        self.__dict__.update(attrs)
+
+    def __setattr__(self, name, value):
+        """Set an attribute and report it to storage as changed
+
+        Args:
+            name (str): name of the attribute
+            value: new value of the attribute
+        """
+        super().__setattr__(name, value)
+        models.storage.mark_dirty(self, name)
+
     def save(self):
-        """Update updated_at with the current datetime."""
+        """Update updated_at with the current datetime.
+
+        Setting updated_at marks the object dirty if storage holds it, so
+        that a deleted object is not stored again.
+        """
         self.updated_at = datetime.now()
         models.storage.save()
 
-    def to_dict(self):
+    def to_dict(self, isoformat=True):
         """
         returns a dictionary containing all
         keys/values of __dict__ of the instance
+
+        Args:
+            isoformat (bool): convert datetime values to isoformat strings
         """
-        bs_dict = (
-            {
-                k: (v.isoformat() if isinstance(v, datetime) else v)
-                for (k, v) in self.__dict__.items()
-            }
-        )
+        if not isoformat:
+            bs_dict = dict(self.__dict__)
+        else:
+            bs_dict = (
+                {
+                    k: (v.isoformat() if isinstance(v, datetime) else v)
+                    for (k, v) in self.__dict__.items()
+                }
+            )
         bs_dict["__class__"] = self.__class__.__name__
         return bs_dict
 
     def __str__(self) -> str:
         """should print/str representation of the BaseModel instance."""
         return f"[{self.__class__.__name__}] ({self.id}) {self.__dict__}"
+
+
+registry.register(BaseModel)
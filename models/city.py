@@ -15,5 +15,7 @@ class City(BaseModel):
         state_id (str): the state id
     """
 
+    __indexes__ = ("state_id",)
+
     state_id = ""
     name = ""
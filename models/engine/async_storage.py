@@ -0,0 +1,152 @@
+#!/usr/bin/python3
+"""Module async_storage
+
+This Module contains a definition for AsyncFileStorage Class
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import models
+
+
+class AsyncFileStorage:
+    """AsyncFileStorage Class
+
+    An asyncio facade over a FileStorage, or a DBStorage: every method is
+    a coroutine run in a thread, so that file I/O and waiting for the
+    storage lock never block the event loop.
+
+    Methods changing the objects or the files are queued to one writer
+    thread and run in the order they were awaited, so that a new() is
+    saved by the save() awaited after it. Reads run in a pool of reader
+    threads when the storage is thread-safe, or are queued with the writes
+    otherwise.
+
+    Attributes:
+        storage (FileStorage): the wrapped storage, or a DBStorage
+    """
+
+    def __init__(self, storage=None, readers=None):
+        """__init__ method & instantiation of class AsyncFileStorage
+
+        Args:
+            storage (FileStorage): the wrapped storage, the reloaded
+                models.storage of the application if None
+            readers (int): maximum number of reader threads, the
+                ThreadPoolExecutor default if None
+        """
+        self.storage = storage if storage is not None else models.storage
+        self.__writer = ThreadPoolExecutor(1, "hbnb-storage-writer")
+        if getattr(self.storage, "lock", None) is None:
+            self.__readers = self.__writer
+        else:
+            self.__readers = ThreadPoolExecutor(readers,
+                                                "hbnb-storage-reader")
+
+    async def __aenter__(self):
+        """returns the facade, to close it at the end of a with block"""
+        return self
+
+    async def __aexit__(self, *exc_info):
+        """Close the facade at the end of a with block"""
+        await self.close()
+
+    async def __run(self, executor, method, *args, **kwargs):
+        """returns the result of a storage method run in executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor, partial(method, *args, **kwargs))
+
+    async def __read(self, method, *args, **kwargs):
+        """returns the result of a reading storage method"""
+        return await self.__run(self.__readers, method, *args, **kwargs)
+
+    async def __write(self, method, *args, **kwargs):
+        """returns the result of a writing storage method, queued after the
+        ones awaited before it
+        """
+        return await self.__run(self.__writer, method, *args, **kwargs)
+
+    async def all(self, cls=None):
+        """returns the objects, or the instances of cls, see
+        FileStorage.all
+        """
+        return await self.__read(self.storage.all, cls)
+
+    async def get(self, cls, id):
+        """returns the object of class cls with the given id, if any"""
+        return await self.__read(self.storage.get, cls, id)
+
+    async def count(self, cls=None):
+        """returns the number of objects, or of instances of cls"""
+        return await self.__read(self.storage.count, cls)
+
+    async def lookup(self, cls, name, value):
+        """returns the instances of cls whose attribute name is or contains
+        value, see FileStorage.lookup
+        """
+        return await self.__read(self.storage.lookup, cls, name, value)
+
+    async def query(self, cls=None, where=(), **kwargs):
+        """returns the instances of cls satisfying every condition, see
+        FileStorage.query
+        """
+        return await self.__read(self.storage.query, cls, where, **kwargs)
+
+    async def near(self, cls, latitude, longitude, km, limit=None):
+        """returns the instances of cls within km kilometers of a point,
+        see FileStorage.near
+        """
+        return await self.__read(self.storage.near, cls, latitude,
+                                 longitude, km, limit)
+
+    async def within(self, cls, south, west, north, east):
+        """returns the instances of cls inside a bounding box, see
+        FileStorage.within
+        """
+        return await self.__read(self.storage.within, cls, south, west,
+                                 north, east)
+
+    async def new(self, obj):
+        """Add obj to the storage"""
+        await self.__write(self.storage.new, obj)
+
+    async def delete(self, obj=None):
+        """Remove obj from the storage"""
+        await self.__write(self.storage.delete, obj)
+
+    async def bulk_insert(self, objects):
+        """Add many objects and save them together"""
+        await self.__write(self.storage.bulk_insert, list(objects))
+
+    async def bulk_update(self, changes):
+        """Set attributes of many objects and save them together"""
+        await self.__write(self.storage.bulk_update, list(changes))
+
+    async def bulk_delete(self, objects):
+        """Remove many objects and save the change once"""
+        await self.__write(self.storage.bulk_delete, list(objects))
+
+    async def save(self):
+        """Write the changes, see FileStorage.save"""
+        await self.__write(self.storage.save)
+
+    async def reload(self):
+        """Read the objects from the files, see FileStorage.reload"""
+        await self.__write(self.storage.reload)
+
+    async def flush(self):
+        """Write the changes a write-behind storage still holds, if the
+        storage can hold some
+        """
+        flush = getattr(self.storage, "flush", None)
+        if flush is not None:
+            await self.__write(flush)
+
+    async def close(self):
+        """Flush the storage, then stop the threads of the facade"""
+        await self.flush()
+        self.__writer.shutdown()
+        self.__readers.shutdown()
@@ -0,0 +1,312 @@
+#!/usr/bin/python3
+"""Module columns
+
+This Module contains a definition for ColumnStore Class
+"""
+
+import math
+from array import array
+
+from models.engine.query import Condition
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class ColumnStore:
+    """ColumnStore Class
+
+    Keeps some attributes of the objects of a class in one array per
+    attribute, so that they can be filtered and aggregated without going
+    through the objects. Numeric attributes are held as floats, values
+    that are not numbers as NaN, which aggregates skip. Categorical
+    attributes, such as city_id, are held as integer codes.
+
+    The arrays are array.array instances; when NumPy is installed the
+    operations run on zero-copy NumPy views of them.
+
+    Attributes:
+        names (tuple): names of the numeric attributes
+        categorical (tuple): names of the categorical attributes
+    """
+
+    FUNCTIONS = ("count", "sum", "min", "max", "mean")
+
+    def __init__(self, names, categorical=()):
+        """__init__ method & instantiation of class ColumnStore
+
+        Args:
+            names (iterable): names of the numeric attributes
+            categorical (iterable): names of the categorical attributes
+        """
+        self.names = tuple(names)
+        self.categorical = tuple(categorical)
+        self.__keys = []
+        self.__rows = {}
+        self.__data = {name: array('d') for name in self.names}
+        self.__data.update((name, array('q')) for name in self.categorical)
+        self.__codes = {name: {} for name in self.categorical}
+        self.__values = {name: [] for name in self.categorical}
+
+    @classmethod
+    def of(cls, model_cls):
+        """returns an empty store for the attributes a model class lists
+        in __columns__, or None if it lists none
+
+        Attributes whose class default is a string are categorical.
+
+        Args:
+            model_cls (type): the model class
+        """
+        names = getattr(model_cls, "__columns__", ())
+        if len(names) == 0:
+            return None
+        categorical = [n for n in names
+                       if isinstance(getattr(model_cls, n, None), str)]
+        return cls([n for n in names if n not in categorical], categorical)
+
+    def __len__(self):
+        """returns the number of rows"""
+        return len(self.__keys)
+
+    def __contains__(self, name):
+        """returns True if the attribute name has a column"""
+        return name in self.__data
+
+    def __encode(self, name, value):
+        """returns the value stored in the column name for value"""
+        if name in self.__codes:
+            codes = self.__codes[name]
+            try:
+                code = codes.get(value, None)
+            except TypeError:
+                value = str(value)
+                code = codes.get(value, None)
+            if code is None:
+                code = codes[value] = len(codes)
+                self.__values[name].append(value)
+            return code
+        if isinstance(value, (int, float)):
+            return float(value)
+        return math.nan
+
+    def add(self, key, values):
+        """Add or replace the row of an object
+
+        Args:
+            key (str): <class_name>.id key of the object
+            values (dict): value of every column attribute of the object
+        """
+        if key in self.__rows:
+            for name in self.__data:
+                self.set(key, name, values.get(name, None))
+            return
+        self.__rows[key] = len(self.__keys)
+        self.__keys.append(key)
+        for name, column in self.__data.items():
+            column.append(self.__encode(name, values.get(name, None)))
+
+    def set(self, key, name, value):
+        """Update one attribute of the row of an object, if it has a column
+
+        Args:
+            key (str): <class_name>.id key of the object
+            name (str): name of the attribute
+            value: new value of the attribute
+        """
+        row = self.__rows.get(key, None)
+        if row is not None and name in self.__data:
+            self.__data[name][row] = self.__encode(name, value)
+
+    def remove(self, key):
+        """Remove the row of an object, moving the last row in its place
+
+        Args:
+            key (str): <class_name>.id key of the object
+        """
+        row = self.__rows.pop(key, None)
+        if row is None:
+            return
+        last = self.__keys.pop()
+        for column in self.__data.values():
+            value = column.pop()
+            if row < len(self.__keys):
+                column[row] = value
+        if row < len(self.__keys):
+            self.__keys[row] = last
+            self.__rows[last] = row
+
+    def column(self, name):
+        """returns the values of a column, as a NumPy array if NumPy is
+        installed, and a list otherwise
+
+        Args:
+            name (str): name of the attribute
+        """
+        if name in self.__codes:
+            values = self.__values[name]
+            return [values[code] for code in self.__data[name]]
+        if numpy is not None:
+            return numpy.array(self.__data[name])
+        return list(self.__data[name])
+
+    def __view(self, name):
+        """returns the raw values of a column, without copying them"""
+        if name not in self.__data:
+            raise KeyError(f"no column {name}")
+        data = self.__data[name]
+        if numpy is None:
+            return data
+        dtype = numpy.int64 if name in self.__codes else numpy.float64
+        return numpy.frombuffer(data, dtype=dtype) if len(data) > 0 \
+            else numpy.zeros(0, dtype=dtype)
+
+    def __mask(self, where):
+        """returns the rows satisfying every condition, as a NumPy boolean
+        array or a list of bools
+
+        Raises:
+            ValueError: for an ordering comparison on a categorical column
+        """
+        mask = None
+        for cond in where:
+            cond = cond if isinstance(cond, Condition) else Condition(*cond)
+            op = Condition.OPERATORS[cond.op]
+            value = cond.value
+            if cond.name in self.__codes:
+                if cond.op not in ["==", "!="]:
+                    raise ValueError(f"{cond.name} is categorical")
+                value = self.__codes[cond.name].get(value, -1)
+            elif not isinstance(value, (int, float)):
+                raise ValueError(f"{cond.name} is numeric")
+            data = self.__view(cond.name)
+            if numpy is not None:
+                rows = op(data, value)
+                mask = rows if mask is None else mask & rows
+            else:
+                rows = [op(x, value) for x in data]
+                mask = rows if mask is None else [
+                    a and b for a, b in zip(mask, rows)]
+        if mask is None:
+            mask = (numpy.ones(len(self), dtype=bool) if numpy is not None
+                    else [True] * len(self))
+        return mask
+
+    def keys(self, where=()):
+        """returns the keys of the objects satisfying every condition
+
+        Args:
+            where (list): Condition objects or (name, op, value) tuples
+        """
+        mask = self.__mask(where)
+        if numpy is not None:
+            return [self.__keys[i] for i in numpy.flatnonzero(mask)]
+        return [k for k, selected in zip(self.__keys, mask) if selected]
+
+    def __groups(self, name, by, where):
+        """returns the selected values of the column name, as a mapping of
+        the values of the categorical column by to their values, or a
+        single list or array if by is None
+        """
+        mask = self.__mask(where)
+        data = self.__view(name)
+        if by is None:
+            if numpy is not None:
+                values = data[mask]
+                return values[~numpy.isnan(values)]
+            return [x for x, selected in zip(data, mask)
+                    if selected and x == x]
+        if by not in self.__codes:
+            raise ValueError(f"{by} is not categorical")
+        codes = self.__view(by)
+        labels = self.__values[by]
+        if numpy is not None:
+            mask = mask & ~numpy.isnan(data)
+            return {labels[code]: data[mask & (codes == code)]
+                    for code in numpy.unique(codes[mask])}
+        groups = {}
+        for x, code, selected in zip(data, codes, mask):
+            if selected and x == x:
+                groups.setdefault(labels[code], []).append(x)
+        return groups
+
+    @staticmethod
+    def __apply(func, values):
+        """returns func, one of FUNCTIONS, applied to values"""
+        if func == "count":
+            return len(values)
+        if len(values) == 0:
+            return None if func != "sum" else 0.0
+        if numpy is not None:
+            return float(getattr(numpy, func)(values))
+        if func == "mean":
+            return math.fsum(values) / len(values)
+        if func == "sum":
+            return math.fsum(values)
+        return min(values) if func == "min" else max(values)
+
+    def aggregate(self, name, func="mean", where=(), by=None):
+        """returns count, sum, min, max or mean of a numeric column
+
+        NaN values are skipped; min, max and mean of no value are None.
+
+        Args:
+            name (str): name of the numeric attribute
+            func (str): one of count, sum, min, max and mean
+            where (list): Condition objects or (name, op, value) tuples
+            by (str): categorical attribute to group by, if any
+
+        Returns:
+            the result, or a dictionary of the result of every group
+        """
+        if func not in self.FUNCTIONS:
+            raise ValueError(f"unknown function {func}")
+        groups = self.__groups(name, by, where)
+        if by is None:
+            return self.__apply(func, groups)
+        return {k: self.__apply(func, v) for k, v in groups.items()}
+
+    def histogram(self, name, bins=10, bounds=None, where=(), by=None):
+        """returns the histogram of a numeric column
+
+        Args:
+            name (str): name of the numeric attribute
+            bins (int): number of equal width bins
+            bounds (tuple): (low, high) covered by the bins, the minimum and
+                maximum values if None
+            where (list): Condition objects or (name, op, value) tuples
+            by (str): categorical attribute to group by, if any; every
+                group uses the same bins
+
+        Returns:
+            tuple: the list of counts and the list of the bins + 1 edges,
+                or a dictionary of them by group
+        """
+        groups = self.__groups(name, by, where)
+        if by is None:
+            return self.__histogram(groups, bins, bounds)
+        if bounds is None:
+            values = [x for v in groups.values() for x in v]
+            bounds = (min(values), max(values)) if len(values) else (0, 1)
+        return {k: self.__histogram(v, bins, bounds)
+                for k, v in groups.items()}
+
+    @staticmethod
+    def __histogram(values, bins, bounds):
+        """returns the counts and edges of the histogram of values"""
+        if bounds is None:
+            bounds = (min(values), max(values)) if len(values) else (0, 1)
+        low, high = bounds
+        if high <= low:
+            high = low + 1
+        if numpy is not None:
+            counts, edges = numpy.histogram(values, bins, (low, high))
+            return counts.tolist(), edges.tolist()
+        width = (high - low) / bins
+        counts = [0] * bins
+        for x in values:
+            if low <= x <= high:
+                counts[min(int((x - low) / width), bins - 1)] += 1
+        return counts, [low + i * width for i in range(bins + 1)]
@@ -0,0 +1,243 @@
+#!/usr/bin/python3
+"""Module compact
+
+This Module contains the compact_class and use_compact functions, which
+generate memory saving versions of the model classes
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+from models.engine import registry
+
+EPOCH = datetime(1970, 1, 1)
+_compact_classes = {}
+
+
+class _Raw:
+    """_Raw Class
+
+    Holds a value assigned to a packed attribute that would otherwise be
+    read back as a packed one, such as an int assigned to city_id.
+
+    Attributes:
+        value: the assigned value
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        """__init__ method & instantiation of class _Raw"""
+        self.value = value
+
+
+def pack_id(value):
+    """returns a uuid string as a 128 bit int
+
+    Other values are returned unchanged, except ints which are wrapped.
+    """
+    if isinstance(value, str) and len(value) == 36:
+        try:
+            packed = uuid.UUID(value)
+        except ValueError:
+            return value
+        if str(packed) == value:
+            return packed.int
+    return _Raw(value) if type(value) is int else value
+
+
+def unpack_id(value):
+    """returns the uuid string of a value packed by pack_id"""
+    if type(value) is int:
+        return str(uuid.UUID(int=value))
+    return value.value if isinstance(value, _Raw) else value
+
+
+def pack_datetime(value):
+    """returns a naive datetime as seconds since the epoch
+
+    Other values are returned unchanged, except floats which are wrapped.
+    """
+    if isinstance(value, datetime) and value.tzinfo is None:
+        return (value - EPOCH) / timedelta(seconds=1)
+    return _Raw(value) if type(value) is float else value
+
+
+def unpack_datetime(value):
+    """returns the datetime of a value packed by pack_datetime"""
+    if type(value) is float:
+        return EPOCH + timedelta(seconds=value)
+    return value.value if isinstance(value, _Raw) else value
+
+
+class _Field:
+    """_Field Class
+
+    The descriptor of a compact class attribute, stored in a slot named
+    after it with an underscore, possibly packed. Unset attributes, and
+    the attribute read on the class, have the default of the model class.
+
+    Attributes:
+        name (str): name of the attribute
+        default: value of the unset attribute
+        pack (callable): converts assigned values to stored ones
+        unpack (callable): converts stored values to read ones
+    """
+
+    MISSING = object()
+
+    def __init__(self, name, default=MISSING, pack=None, unpack=None):
+        """__init__ method & instantiation of class _Field"""
+        self.name = name
+        self.default = default
+        self.pack = pack
+        self.unpack = unpack
+        self.slot = None
+
+    def is_set(self, obj):
+        """returns True if the attribute of obj was assigned"""
+        try:
+            self.slot.__get__(obj)
+        except AttributeError:
+            return False
+        return True
+
+    def __get__(self, obj, objtype=None):
+        """returns the attribute of obj, or its default"""
+        if obj is not None and self.is_set(obj):
+            value = self.slot.__get__(obj)
+            return value if self.unpack is None else self.unpack(value)
+        if self.default is self.MISSING:
+            raise AttributeError(self.name)
+        return self.default
+
+    def __set__(self, obj, value):
+        """stores the value of the attribute of obj"""
+        self.slot.__set__(obj, value if self.pack is None
+                          else self.pack(value))
+
+
+def compact_class(cls):
+    """returns the compact version of a model class
+
+    The compact class is a subclass of cls with the same name, whose
+    instances keep id, created_at, updated_at and the attributes declared
+    on the class in __slots__ instead of a __dict__. Uuid strings in id
+    and *_id attributes are held as 128 bit ints and naive datetimes as
+    epoch seconds, and are converted back when they are read. Other
+    attributes, like the ones set by the console update command, are
+    kept in a __dict__ created for the objects that have some.
+
+    The class is not registered: see use_compact.
+
+    Args:
+        cls (type): a subclass of BaseModel, or BaseModel
+    """
+    if cls in _compact_classes:
+        return _compact_classes[cls]
+    fields = [_Field("id", pack=pack_id, unpack=unpack_id),
+              _Field("created_at", pack=pack_datetime,
+                     unpack=unpack_datetime),
+              _Field("updated_at", pack=pack_datetime,
+                     unpack=unpack_datetime)]
+    declared = {}
+    for base in reversed(cls.__mro__):
+        declared.update(vars(base))
+    for name, value in declared.items():
+        if name.startswith("_") or callable(value) or isinstance(
+                value, (classmethod, staticmethod, property)):
+            continue
+        if name.endswith("_id"):
+            fields.append(_Field(name, value, pack_id, unpack_id))
+        else:
+            fields.append(_Field(name, value))
+    known = {field.name for field in fields}
+
+    def __setattr__(self, name, value):
+        """Set an attribute, noting the ones kept in __dict__"""
+        if name not in known:
+            object.__setattr__(self, "_extra", True)
+        cls.__setattr__(self, name, value)
+
+    def _set_attributes(self, attrs):
+        """Set attributes without reporting them to storage as changed"""
+        for name, value in attrs.items():
+            if name not in known:
+                object.__setattr__(self, "_extra", True)
+            object.__setattr__(self, name, value)
+
+    def attributes(self):
+        """returns a dictionary of the attributes set on the instance"""
+        result = {field.name: getattr(self, field.name)
+                  for field in fields if field.is_set(self)}
+        if getattr(self, "_extra", False):
+            result.update(self.__dict__)
+        return result
+
+    def to_dict(self, isoformat=True):
+        """
+        returns a dictionary containing all
+        keys/values of the attributes of the instance
+
+        Args:
+            isoformat (bool): convert datetime values to isoformat strings
+        """
+        bs_dict = attributes(self)
+        if isoformat:
+            bs_dict = {k: (v.isoformat() if isinstance(v, datetime) else v)
+                       for (k, v) in bs_dict.items()}
+        bs_dict["__class__"] = self.__class__.__name__
+        return bs_dict
+
+    def __str__(self):
+        """should print/str representation of the instance."""
+        return f"[{self.__class__.__name__}] ({self.id}) {attributes(self)}"
+
+    def __reduce__(self):
+        """returns how to pickle the instance, through its dictionary"""
+        return (_restore, (cls, self.to_dict(isoformat=False)))
+
+    namespace = {
+        "__slots__": tuple(f"_{field.name}" for field in fields)
+        + ("_extra",),
+        "__doc__": cls.__doc__,
+        "__module__": cls.__module__,
+        "__qualname__": cls.__qualname__,
+        "__setattr__": __setattr__,
+        "_set_attributes": _set_attributes,
+        "to_dict": to_dict,
+        "__str__": __str__,
+        "__reduce__": __reduce__,
+    }
+    compact = type(cls.__name__, (cls,), namespace, register=False)
+    for field in fields:
+        field.slot = compact.__dict__[f"_{field.name}"]
+        setattr(compact, field.name, field)
+    _compact_classes[cls] = compact
+    return compact
+
+
+def _restore(cls, record):
+    """returns the compact instance of cls holding record, when it is
+    unpickled
+    """
+    return compact_class(cls)(**record)
+
+
+def use_compact(*names):
+    """Register the compact version of model classes under their names,
+    so that storage engines and the console instantiate them
+
+    Args:
+        *names (str): names of the model classes
+
+    Returns:
+        list: the registered compact classes
+    """
+    classes = []
+    for name in names:
+        cls = registry.get_class(name)
+        if cls not in _compact_classes.values():
+            cls = registry.register(compact_class(cls))
+        classes.append(cls)
+    return classes
@@ -0,0 +1,494 @@
+#!/usr/bin/python3
+"""Module db_storage
+
+This Module contains a definition for DBStorage Class
+"""
+
+import json
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+
+from models.engine import registry
+from models.engine.query import Condition, paginate
+from models.engine.spatial import bounding_box, distance, point, split_box
+
+
+class DBStorage:
+    """DBStorage Class
+
+    Stores every object in an SQLite database with one table per class.
+    The id, created_at, updated_at and the scalar attributes a class lists
+    in __indexes__ or __spatial__ are indexed columns, and the whole object
+    is kept as JSON in the data column. A list attribute listed in
+    __indexes__ gets a <class_name>__<attribute> table of (id, value) rows.
+
+    Objects are only loaded when they are read, and each one is loaded
+    once. Changes are written in the open transaction before every read
+    and committed together by save.
+
+    The connection can be used by any thread, but by one at a time: the
+    threads sharing a DBStorage, such as the ones of the API server, take
+    turns using it.
+
+    Attributes:
+        __db_path (str): path to the SQLite database
+    """
+    __db_path = "hbnb.db"
+    FIXED_COLUMNS = ["id", "created_at", "updated_at"]
+    SYNCHRONOUS = {"always": "FULL", "batch": "NORMAL", "never": "OFF"}
+
+    def __init__(self, db_path=None, fsync="batch"):
+        """__init__ method & instantiation of class DBStorage
+
+        Args:
+            db_path (str): path to the SQLite database, defaults to hbnb.db
+            fsync (str): always syncs every commit to disk, batch only the
+                checkpoints of the write-ahead log, which a power loss can
+                roll back to but never corrupt, and never leaves it to the
+                operating system
+
+        Raises:
+            ValueError: for an unknown fsync policy
+        """
+        if fsync not in self.SYNCHRONOUS:
+            raise ValueError(f"unknown fsync policy {fsync}")
+        if db_path is not None:
+            self.__db_path = db_path
+        self.__conn = sqlite3.connect(self.__db_path,
+                                      check_same_thread=False)
+        self.__conn.execute("PRAGMA journal_mode=WAL")
+        self.__conn.execute(f"PRAGMA synchronous={self.SYNCHRONOUS[fsync]}")
+        self.__objects = {}
+        self.__dirty = {}
+        self.__indexed_names = {}
+        self.__tables = None
+        self.__in_transaction = False
+
+    def all(self, cls=None):
+        """returns a dictionary of every object, or of the instances of cls
+        if it is given
+
+        Args:
+            cls (type): class of the objects to return
+        """
+        result = {}
+        for name in self.__class_tables(cls):
+            rows = self.__conn.execute(f'SELECT id, data FROM "{name}"')
+            result.update(self.__load(name, rows))
+        return result
+
+    def get(self, cls, id):
+        """returns the object of class cls with the given id, if any
+
+        Args:
+            cls (type): class of the object, or its name
+            id (str): id of the object
+        """
+        name = cls if isinstance(cls, str) else cls.__name__
+        self.__flush()
+        if f"{name}.{id}" in self.__objects:
+            return self.__objects[f"{name}.{id}"]
+        if name not in self.__known_tables():
+            return None
+        rows = self.__conn.execute(
+            f'SELECT id, data FROM "{name}" WHERE id = ?', (id,))
+        return self.__load(name, rows).get(f"{name}.{id}", None)
+
+    def count(self, cls=None):
+        """returns the number of objects, or of instances of cls
+
+        Args:
+            cls (type): class of the objects to count
+        """
+        return sum(self.__conn.execute(
+            f'SELECT COUNT(*) FROM "{name}"').fetchone()[0]
+            for name in self.__class_tables(cls))
+
+    def new(self, obj):
+        """Add obj to the objects written by the next save"""
+        key = f"{obj.__class__.__name__}.{obj.id}"
+        self.__objects[key] = obj
+        self.__dirty[key] = None
+
+    def delete(self, obj=None):
+        """Remove obj from the database on the next save"""
+        if obj is None:
+            return
+        key = f"{obj.__class__.__name__}.{obj.id}"
+        self.__objects.pop(key, None)
+        self.__dirty[key] = None
+
+    def mark_dirty(self, obj, name):
+        """Record that the attribute name of obj changed since the last save
+
+        Args:
+            obj (BaseModel): the modified object
+            name (str): name of the modified attribute
+        """
+        key = f"{obj.__class__.__name__}.{getattr(obj, 'id', None)}"
+        if self.__objects.get(key, None) is not obj:
+            return
+        attrs = self.__dirty.get(key, set())
+        if attrs is not None:
+            attrs.add(name)
+            self.__dirty[key] = attrs
+
+    def bulk_insert(self, objects):
+        """Add many objects and save them together, in one transaction
+
+        Args:
+            objects (iterable): the new objects
+        """
+        with self.transaction():
+            for obj in objects:
+                self.new(obj)
+
+    def bulk_update(self, changes):
+        """Set attributes of many objects, update their updated_at and save
+        them together, in one transaction
+
+        Args:
+            changes (iterable): (obj, attributes) pairs, attributes being a
+                dictionary of new attribute values
+        """
+        now = datetime.now()
+        with self.transaction():
+            for obj, attributes in changes:
+                for name, value in attributes.items():
+                    setattr(obj, name, value)
+                obj.updated_at = now
+                self.new(obj)
+
+    def bulk_delete(self, objects):
+        """Remove many objects and save the change once, in one transaction
+
+        Args:
+            objects (iterable): the objects to remove
+        """
+        with self.transaction():
+            for obj in objects:
+                self.delete(obj)
+
+    @contextmanager
+    def transaction(self):
+        """Defer the saves made in a with block to its end, then commit
+        every change at once; if the block raises, roll the database
+        transaction back and discard the loaded objects instead
+
+        The changes made before the block are committed when it starts. A
+        transaction opened inside another one is part of it.
+        """
+        if self.__in_transaction:
+            yield self
+            return
+        self.save()
+        self.__in_transaction = True
+        try:
+            yield self
+        except BaseException:
+            self.__in_transaction = False
+            self.reload()
+            raise
+        self.__in_transaction = False
+        self.save()
+
+    def dirty(self):
+        """returns the keys of the objects changed since the last save,
+        mapped to the names of their changed attributes or to None when
+        the whole object is new or deleted
+        """
+        return {k: (v if v is None else set(v))
+                for k, v in self.__dirty.items()}
+
+    def save(self):
+        """Write the changed objects and commit them in one transaction,
+        unless a transaction() block is open
+        """
+        if self.__in_transaction:
+            return
+        self.__flush()
+        self.__conn.commit()
+
+    def reload(self):
+        """Discard the uncommitted changes and the loaded objects"""
+        self.__conn.rollback()
+        self.__objects = {}
+        self.__dirty = {}
+        self.__tables = None
+
+    def close(self):
+        """Commit the changes and close the database connection"""
+        self.save()
+        self.__conn.close()
+
+    def add_index(self, cls, name):
+        """Index the attribute name of cls and of its subclasses
+
+        Args:
+            cls (type): class of the indexed objects
+            name (str): name of the indexed attribute
+        """
+        self.__flush()
+        self.__indexed_names.setdefault(cls, set()).add(name)
+        for table in self.__class_tables(cls):
+            self.__table(self.get_class(table))
+
+    def lookup(self, cls, name, value):
+        """returns a dictionary of the instances of cls whose attribute name
+        is or contains value, found through an index when there is one
+
+        Args:
+            cls (type): class of the objects to return
+            name (str): name of the attribute
+            value: value to look for
+        """
+        return {obj_key(obj): obj
+                for obj in self.query(cls, [Condition(name, "==", value)])}
+
+    def query(self, cls=None, where=(), order_by=None, reverse=False,
+              limit=None, offset=0):
+        """returns the list of instances of cls satisfying every condition
+
+        Conditions on indexed columns are evaluated by SQLite, the other
+        ones on the objects it returns.
+
+        Args:
+            cls (type): class of the objects to return, any if None
+            where (list): Condition objects or (name, op, value) tuples
+            order_by (str): name of the attribute to sort on, unsorted if None
+            reverse (bool): sort in descending order
+            limit (int): maximum number of objects to return
+            offset (int): number of objects to skip
+        """
+        where = [cond if isinstance(cond, Condition) else Condition(*cond)
+                 for cond in where]
+        result = []
+        for name in self.__class_tables(cls):
+            columns, lists = self.__tables[name]
+            clauses, params, rest = [], [], []
+            for cond in where:
+                if cond.name in self.FIXED_COLUMNS + columns:
+                    clauses.append(self.__clause(cond))
+                    params.append(cond.value)
+                elif cond.name in lists and cond.op == "==":
+                    clauses.append(f'id IN (SELECT id FROM '
+                                   f'"{name}__{cond.name}" WHERE value = ?)')
+                    params.append(cond.value)
+                else:
+                    rest.append(cond)
+            sql = f'SELECT id, data FROM "{name}"'
+            if len(clauses) > 0:
+                sql += " WHERE " + " AND ".join(clauses)
+            objects = self.__load(name, self.__conn.execute(sql, params))
+            result.extend(obj for obj in objects.values()
+                          if all(cond(obj) for cond in rest))
+        return paginate(result, order_by, reverse, limit, offset)
+
+    def near(self, cls, latitude, longitude, km, limit=None):
+        """returns the list of instances of cls within km kilometers of a
+        point, nearest first, selected by SQLite on their bounding box
+
+        Args:
+            cls (type): class of the objects to return
+            latitude (float): latitude of the point in degrees
+            longitude (float): longitude of the point in degrees
+            km (float): radius in kilometers
+            limit (int): maximum number of objects to return
+        """
+        found = []
+        for obj in self.within(cls, *bounding_box(
+                latitude, longitude, km)).values():
+            location = point(*(getattr(obj, name)
+                               for name in obj.__spatial__))
+            if location is None:
+                continue
+            d = distance(latitude, longitude, *location)
+            if d <= km:
+                found.append((d, obj_key(obj), obj))
+        found.sort(key=lambda item: item[:2])
+        return [obj for _, _, obj in found[:limit]]
+
+    def within(self, cls, south, west, north, east):
+        """returns a dictionary of the instances of cls inside a bounding
+        box, which crosses the antimeridian when west is greater than east
+
+        Args:
+            cls (type): class of the objects to return
+            south (float): minimum latitude
+            west (float): western longitude
+            north (float): maximum latitude
+            east (float): eastern longitude
+        """
+        result = {}
+        for name in self.__class_tables(cls):
+            spatial = getattr(self.get_class(name), "__spatial__", ())
+            if len(spatial) != 2:
+                continue
+            lat, lon = spatial
+            for s, w, n, e in split_box(south, west, north, east):
+                result.update((obj_key(obj), obj) for obj in self.query(
+                    self.get_class(name),
+                    [(lat, ">=", s), (lat, "<=", n),
+                     (lon, ">=", w), (lon, "<=", e)])
+                    if obj.__class__.__name__ == name)
+        return result
+
+    @staticmethod
+    def __clause(cond):
+        """returns the SQL expression of a condition on a column
+
+        Like Condition, a range comparison only holds between numbers or
+        between strings.
+        """
+        op = "=" if cond.op == "==" else cond.op
+        clause = f'"{cond.name}" {op} ?'
+        if cond.op in ["==", "!="]:
+            return clause
+        if isinstance(cond.value, str):
+            return f"(typeof(\"{cond.name}\") = 'text' AND {clause})"
+        return (f"(typeof(\"{cond.name}\") IN ('integer', 'real')"
+                f" AND {clause})")
+
+    def __known_tables(self):
+        """returns the mapping of every class table name to its indexed
+        scalar and list attribute names
+        """
+        if self.__tables is None:
+            names = [row[0] for row in self.__conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'")]
+            self.__tables = {}
+            for name in names:
+                if "__" in name:
+                    continue
+                columns = [row[1] for row in self.__conn.execute(
+                    f'PRAGMA table_info("{name}")')]
+                self.__tables[name] = (
+                    [c for c in columns
+                     if c not in self.FIXED_COLUMNS + ["data"]],
+                    [n[len(name) + 2:] for n in names
+                     if n.startswith(f"{name}__")])
+        return self.__tables
+
+    def __class_tables(self, cls):
+        """returns the names of the tables of cls and of its subclasses,
+        after writing the pending changes
+        """
+        self.__flush()
+        names = []
+        for name in self.__known_tables():
+            try:
+                table_cls = self.get_class(name)
+            except KeyError:
+                continue
+            if cls is None or issubclass(table_cls, cls):
+                names.append(name)
+        return names
+
+    def __table(self, cls):
+        """Create or complete the table of cls
+
+        Returns:
+            tuple: names of the indexed scalar and list attributes of cls
+        """
+        name = cls.__name__
+        tables = self.__known_tables()
+        if name not in tables:
+            self.__conn.execute(
+                f'CREATE TABLE "{name}" (id TEXT PRIMARY KEY, '
+                'created_at TEXT, updated_at TEXT, data TEXT NOT NULL)')
+            self.__conn.execute(
+                f'CREATE INDEX "{name}_updated_at" ON "{name}" (updated_at)')
+            tables[name] = ([], [])
+        columns, lists = tables[name]
+        wanted = set(cls.__indexes__) | set(getattr(cls, "__spatial__", ()))
+        for k_cls, k_names in self.__indexed_names.items():
+            if issubclass(cls, k_cls):
+                wanted |= k_names
+        missing = [n for n in sorted(wanted)
+                   if n not in columns and n not in lists]
+        for attr in missing:
+            if isinstance(getattr(cls, attr, None), list):
+                self.__conn.execute(
+                    f'CREATE TABLE "{name}__{attr}" (id TEXT NOT NULL, value, '
+                    'PRIMARY KEY (value, id))')
+                self.__conn.execute(
+                    f'CREATE INDEX "{name}__{attr}_id" '
+                    f'ON "{name}__{attr}" (id)')
+                lists.append(attr)
+            else:
+                self.__conn.execute(
+                    f'ALTER TABLE "{name}" ADD COLUMN "{attr}"')
+                self.__conn.execute(
+                    f'CREATE INDEX "{name}_{attr}" ON "{name}" ("{attr}")')
+                columns.append(attr)
+        if len(missing) > 0:
+            rows = self.__conn.execute(f'SELECT id, data FROM "{name}"')
+            for obj in self.__load(name, rows.fetchall()).values():
+                self.__write(obj_key(obj), obj)
+        return columns, lists
+
+    def __load(self, name, rows):
+        """returns a dictionary of the objects of class name stored in rows,
+        reusing the objects already loaded
+        """
+        result = {}
+        cls = None
+        for id, data in rows:
+            key = f"{name}.{id}"
+            if key not in self.__objects:
+                cls = cls or self.get_class(name)
+                self.__objects[key] = cls(**json.loads(data))
+            result[key] = self.__objects[key]
+        return result
+
+    def __flush(self):
+        """Write the changed objects in the open transaction"""
+        dirty, self.__dirty = self.__dirty, {}
+        for key in dirty:
+            self.__write(key, self.__objects.get(key, None))
+
+    def __write(self, key, obj):
+        """Insert, update or delete the row of key"""
+        name, id = key.split(".", 1)
+        if obj is None:
+            if name not in self.__known_tables():
+                return
+            self.__conn.execute(f'DELETE FROM "{name}" WHERE id = ?', (id,))
+            for attr in self.__tables[name][1]:
+                self.__conn.execute(
+                    f'DELETE FROM "{name}__{attr}" WHERE id = ?', (id,))
+            return
+        columns, lists = self.__table(obj.__class__)
+        obj_dict = obj.to_dict()
+        values = [obj_dict.get(c, None) for c in self.FIXED_COLUMNS]
+        values += [column_value(getattr(obj, c, None)) for c in columns]
+        names = ", ".join(f'"{c}"' for c in self.FIXED_COLUMNS + columns)
+        marks = ", ".join("?" for _ in values)
+        self.__conn.execute(
+            f'INSERT OR REPLACE INTO "{name}" ({names}, data) '
+            f'VALUES ({marks}, ?)', values + [json.dumps(obj_dict)])
+        for attr in lists:
+            self.__conn.execute(
+                f'DELETE FROM "{name}__{attr}" WHERE id = ?', (id,))
+            items = getattr(obj, attr, None)
+            items = items if isinstance(items, (list, tuple, set)) else []
+            self.__conn.executemany(
+                f'INSERT OR IGNORE INTO "{name}__{attr}" VALUES (?, ?)',
+                [(id, column_value(v)) for v in items])
+
+    def get_class(self, name):
+        """ returns a class from models module using its name"""
+        return registry.get_class(name)
+
+
+def obj_key(obj):
+    """returns the <obj_class_name>.id key of obj"""
+    return f"{obj.__class__.__name__}.{obj.id}"
+
+
+def column_value(value):
+    """returns value as an SQLite value, encoding it as JSON if needed"""
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return json.dumps(value, default=str)
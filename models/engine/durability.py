@@ -0,0 +1,153 @@
+#!/usr/bin/python3
+"""Module durability
+
+This Module contains a definition for SyncPolicy Class and the
+temporary_file function
+"""
+
+import os
+import stat
+import threading
+import uuid
+
+
+class SyncPolicy:
+    """SyncPolicy Class
+
+    Writes files atomically and decides when they are flushed to disk
+    with fsync, trading throughput for durability:
+
+    always: every replaced file, its directory and every append are synced
+        before the write returns, so no saved change is lost on a crash.
+    batch: replaced files are synced before they replace the old ones, so
+        a crash never leaves a torn file, but their directories and the
+        appended files are synced together by a timer at most interval
+        milliseconds later, losing at most that much of the saved changes.
+    never: syncing is left to the operating system. Files are still
+        replaced atomically, which a process crash cannot tear, but a
+        power loss can.
+
+    Attributes:
+        policy (str): one of always, batch and never
+        interval (float): maximum delay of a batched sync in seconds
+    """
+
+    POLICIES = ("always", "batch", "never")
+
+    def __init__(self, policy="never", interval=1000):
+        """__init__ method & instantiation of class SyncPolicy
+
+        Args:
+            policy (str): one of always, batch and never
+            interval (int): maximum delay of a batched sync in milliseconds
+
+        Raises:
+            ValueError: for an unknown policy
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f"unknown fsync policy {policy}")
+        self.policy = policy
+        self.interval = interval / 1000
+        self.__lock = threading.Lock()
+        self.__pending = set()
+        self.__timer = None
+
+    def replace(self, path, write):
+        """Atomically replace the file path by a temporary file written by
+        write, created in the same directory
+
+        Args:
+            path (str): path to the replaced file
+            write (callable): called with the temporary file, open for
+                writing in binary mode
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp = temporary_file(path)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write(f)
+                if self.policy != "never":
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp, path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+        if self.policy == "always":
+            self.sync(directory)
+        elif self.policy == "batch":
+            self.__schedule(directory)
+
+    def appended(self, f, path):
+        """Sync a file after data was appended to it, now or in the next
+        batch
+
+        Args:
+            f (file): the file, still open
+            path (str): path to the file
+        """
+        if self.policy == "always":
+            f.flush()
+            os.fsync(f.fileno())
+        elif self.policy == "batch":
+            self.__schedule(path)
+
+    def __schedule(self, path):
+        """Add path to the next batch, starting its timer if needed"""
+        with self.__lock:
+            self.__pending.add(path)
+            if self.__timer is None:
+                self.__timer = threading.Timer(self.interval, self.flush)
+                self.__timer.daemon = True
+                self.__timer.start()
+
+    def flush(self):
+        """Sync the files and directories of the pending batch now"""
+        with self.__lock:
+            paths, self.__pending = self.__pending, set()
+            timer, self.__timer = self.__timer, None
+        if timer is not None and timer is not threading.current_thread():
+            timer.cancel()
+        for path in paths:
+            self.sync(path)
+
+    @staticmethod
+    def sync(path):
+        """fsync a file or directory, if it still exists
+
+        Args:
+            path (str): path to the file or directory
+        """
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except FileNotFoundError:
+            return
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def temporary_file(path):
+    """returns the descriptor and path of a new temporary file, open for
+    writing, created in the directory of path to replace it
+
+    The file gets the permissions of path if it exists, and otherwise the
+    ones of any new file, as set by the umask, instead of the owner only
+    permissions of tempfile.mkstemp.
+
+    Args:
+        path (str): path to the file to replace
+    """
+    tmp = os.path.join(os.path.dirname(os.path.abspath(path)),
+                       f".{os.path.basename(path)}.{uuid.uuid4().hex}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        os.chmod(tmp, stat.S_IMODE(os.stat(path).st_mode))
+    except FileNotFoundError:
+        pass
+    except BaseException:
+        os.close(fd)
+        os.remove(tmp)
+        raise
+    return fd, tmp
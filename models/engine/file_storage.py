@@ -5,10 +5,34 @@ This Module contains a definition for FileStorage Class
 """
 
 
-import importlib
+import io
 import json
+import logging
 import os
-import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from functools import partial
+
+from models.engine import registry
+from models.engine.columns import ColumnStore
+from models.engine.durability import SyncPolicy
+from models.engine.formats import get_format
+from models.engine.index import AttributeIndex
+from models.engine.journal import Journal
+from models.engine.locks import RWLock, reads, writes
+from models.engine.offset_index import OffsetIndex
+from models.engine.query import Condition, paginate
+from models.engine.spatial import GridIndex
+from models.engine.stream import ProgressFile
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
 
 
 class FileStorage:
@@ -17,34 +41,1236 @@ class FileStorage:
     Attributes:
         __file_path (str): string - path to the JSON file
         __objects (dict): A dictionary of instantiated objects.
+        MAX_WRITE_BEHIND (int): longest delay in milliseconds between
+            the tries of a failing write-behind save
+
+    In journal mode every save appends the objects changed since the
+    previous save to <__file_path>.log instead of rewriting __file_path,
+    and reload replays that log over the last snapshot. Once the log holds
+    compact_records records or compact_bytes bytes it is folded into a new
+    snapshot, in a background thread when background is set.
+
+    Objects created, deleted or modified since the last save are tracked
+    as dirty; the JSON encoding of every other object is reused from the
+    previous save instead of being computed again.
+
+    The keys of the objects are also indexed by class so that all(cls) and
+    count(cls) do not scan every object, and by the attributes a class
+    lists in __indexes__ or that were passed to add_index, so that
+    lookup(cls, name, value) does not either. query() uses these indexes
+    for its equality conditions before checking the other ones. The
+    attributes a class lists in __columns__ are kept in a ColumnStore,
+    returned by columns(cls), which filters and aggregates them without
+    going through the objects. The objects of a class listing its
+    (latitude, longitude) attributes in __spatial__ are located in a
+    GridIndex, searched by near and within. The attribute indexes of a
+    class, its ColumnStore and its GridIndex are only built by the first
+    call that uses them, then kept up to date.
+
+    In lazy mode reload only indexes the records it reads; an object is
+    instantiated the first time it is returned by all, get, lookup or
+    query, and records never accessed are saved again as they were read.
+
+    Snapshot files are written to a temporary file which then replaces
+    them, so that a crash during a save leaves the previous snapshot
+    intact. The fsync policy, always, batch or never, sets when they and
+    the log file are synced to disk: see SyncPolicy.
 
+    The snapshot is written in one of the formats of models.engine.formats:
+    json (the default), jsonl or binary, optionally compressed with zlib,
+    gzip or lzma. The log file is always written as JSON lines.
+
+    In sharded mode every class is saved to its own <root>.<class_name><ext>
+    file next to __file_path, such as file.User.json, and only the shards
+    of the classes changed since they were last written are written again.
+    With workers set, reload decodes the shards in that many processes.
+    When no shard exists yet, reload reads an unsharded __file_path
+    instead, and the next full write splits it into shards and removes
+    it.
+
+    Inside transaction() saves are deferred to the end of the block, which
+    writes every change at once, or rolls the objects back if it raises.
+
+    In shared mode several processes can use the same files: saves hold
+    an exclusive fcntl lock on <__file_path>.lock, reloads a shared one.
+    Before writing, a save checks whether another process saved since
+    this one last read or wrote the files, by their size, inode and
+    modification time, and if so applies the records that changed, except
+    to the objects changed here: only the appended log records are read
+    when the snapshot did not change. reload_changes() does the same
+    without saving.
+
+    In indexed mode every snapshot file is written with a <path>.idx
+    OffsetIndex, and reload only reads the keys of that index: a record is
+    read from the memory mapped snapshot and decoded when its object, or
+    one of its attributes, is first needed.
+
+    In thread-safe mode the methods reading the objects hold the lock, an
+    RWLock, for reading and the ones changing them hold it for writing,
+    so that many threads can read at once while writes are serialized.
+    all() then returns a copy of __objects, which writers do not change
+    while it is iterated. A thread holds storage.lock.read() to keep
+    several reads, or a ColumnStore it uses, consistent.
+
+    In write-behind mode save() only schedules a write, done by a timer
+    thread at most write_behind milliseconds later, so that a burst of
+    saves is written once. flush() writes the scheduled changes at once.
+    A failed write is logged and tried again after a delay doubled at
+    every failure, and the next flush() raises its error if it fails too.
+    Write-behind mode is thread-safe, since the timer thread writes while
+    others change the objects.
     """
     __file_path = "file.json"
     __objects = {}
+    MAX_WRITE_BEHIND = 60000
+
+    def __init__(self, file_path=None, journal=False, compact_records=None,
+                 compact_bytes=None, background=False, lazy=False,
+                 format="json", compression=None, sharded=False,
+                 workers=None, indexed=False, fsync="never",
+                 fsync_interval=1000, shared=False, threadsafe=False,
+                 write_behind=None):
+        """__init__ method & instantiation of class FileStorage
+
+        Args:
+            file_path (str): path to the JSON file, defaults to file.json
+            journal (bool): append changes to a log file on save
+            compact_records (int): log records that trigger a compaction
+            compact_bytes (int): log size in bytes that triggers a compaction
+            background (bool): compact in a background thread
+            lazy (bool): instantiate reloaded objects on first access
+            format (str): format of the snapshot, json, jsonl or binary
+            compression (str): compression of the snapshot, zlib, gzip or
+                lzma, if any
+            sharded (bool): save every class to its own file
+            workers (int): number of processes decoding the shards on
+                reload, none if None
+            indexed (bool): read records one by one through an offset
+                index instead of loading the snapshot, implies lazy
+            fsync (str): when written files are synced to disk, always,
+                batch or never
+            fsync_interval (int): maximum delay in milliseconds of the
+                syncs of the batch policy
+            shared (bool): lock the files and merge the changes of the
+                other processes using them
+            threadsafe (bool): lock the objects for concurrent threads
+            write_behind (int): maximum delay in milliseconds of the
+                writes of save, which writes at once if None
+
+        Raises:
+            ValueError: if indexed is set with a compression, for an
+                unknown fsync policy, or if shared is set where fcntl is
+                not available
+        """
+        if indexed and compression is not None:
+            raise ValueError("a compressed snapshot cannot be indexed")
+        if shared and fcntl is None:
+            raise ValueError("file locking is not available")
+        if file_path is not None:
+            self.__file_path = file_path
+        self.__objects = {}
+        self.__pending = {}
+        self.__lazy = lazy or indexed
+        self.__indexed = indexed
+        self.__unbuilt = set()
+        self.__classes = {}
+        self.__indexes = {}
+        self.__indexed_names = {}
+        self.__columns = {}
+        self.__grids = {}
+        self.__shared = shared
+        self.__seen = None
+        self.__rwlock = RWLock() if threadsafe or write_behind else None
+        self.__write_behind = write_behind
+        self.__flush_timer = None
+        self.__flush_error = None
+        self.__failures = 0
+        self.__unsaved = False
+        self.__fill_lock = threading.Lock()
+        self.__sync = SyncPolicy(fsync, fsync_interval)
+        self.__journal = Journal(f"{self.__file_path}.log", self.__sync)
+        self.__journaled = journal
+        self.__dirty = {}
+        self.__cache = {}
+        self.__transaction = None
+        self.__compact_records = compact_records
+        self.__compact_bytes = compact_bytes
+        self.__background = background
+        self.__log_lock = threading.Lock()
+        self.__compactor = None
+        self.__format = get_format(format, compression)
+        self.__format_args = (format, compression)
+        self.__sharded = sharded
+        self.__unsharded = False
+        self.__workers = workers
+        self.__stale = set()
+
+    @property
+    def lock(self):
+        """the RWLock of the objects in thread-safe mode, otherwise None"""
+        return self.__rwlock
+
+    @reads
+    def all(self, cls=None):
+        """returns the dictionary __objects, or a copy of it in thread-safe
+        mode, or a dictionary of the objects that are instances of cls if
+        it is given
+
+        Args:
+            cls (type): class of the objects to return
+        """
+        if cls is None:
+            for key in list(self.__pending):
+                self.__get(key)
+            if self.__rwlock is not None:
+                return dict(self.__objects)
+            return self.__objects
+        return {k: self.__get(k)
+                for keys in self.__class_keys(cls) for k in keys}
+
+    @reads
+    def get(self, cls, id):
+        """returns the object of class cls with the given id, if any
+
+        Args:
+            cls (type): class of the object, or its name
+            id (str): id of the object
+        """
+        name = cls if isinstance(cls, str) else cls.__name__
+        return self.__get(f"{name}.{id}")
+
+    def __get(self, key):
+        """returns the object of key, instantiating it if it is pending"""
+        obj = self.__objects.get(key, None)
+        if obj is not None or key not in self.__pending:
+            return obj
+        with self.__fill_lock:
+            obj = self.__objects.get(key, None)
+            if obj is None and key in self.__pending:
+                obj = self.get_class(key.split(".")[0])(**self.__record(key))
+                self.__objects[key] = obj
+                del self.__pending[key]
+        return obj
+
+    def __record(self, key):
+        """returns the record of a pending key, reading it from the
+        snapshot if it is only indexed
+        """
+        record = self.__pending[key]
+        if isinstance(record, OffsetIndex):
+            return self.__format.decode(record.fragment(key))
+        return record
+
+    @reads
+    def count(self, cls=None):
+        """returns the number of objects, or of instances of cls
+
+        Args:
+            cls (type): class of the objects to count
+        """
+        if cls is None:
+            return len(self.__objects) + len(self.__pending)
+        return sum(len(keys) for keys in self.__class_keys(cls))
+
+    def __class_keys(self, cls):
+        """returns the sets of keys of the indexed subclasses of cls"""
+        return [keys for k_cls, keys in self.__classes.items()
+                if issubclass(k_cls, cls)]
+
+    @writes
+    def add_index(self, cls, name):
+        """Index the attribute name of cls and of its subclasses
+
+        Args:
+            cls (type): class of the indexed objects
+            name (str): name of the indexed attribute
+        """
+        self.__indexed_names.setdefault(cls, set()).add(name)
+        for k_cls, keys in self.__classes.items():
+            if issubclass(k_cls, cls) and name not in self.__indexes[k_cls]:
+                index = AttributeIndex(name)
+                if k_cls not in self.__unbuilt:
+                    for key in keys:
+                        index.add(key, self.__attribute(key, k_cls, name))
+                self.__indexes[k_cls][name] = index
+
+    @reads
+    def lookup(self, cls, name, value):
+        """returns a dictionary of the instances of cls whose attribute name
+        is or contains value, found through an index when there is one
+
+        Args:
+            cls (type): class of the objects to return
+            name (str): name of the attribute
+            value: value to look for
+        """
+        result = {}
+        for k_cls, keys in self.__classes.items():
+            if not issubclass(k_cls, cls):
+                continue
+            index = self.__attribute_indexes(k_cls).get(name, None)
+            if index is not None:
+                keys = index.get(value)
+            else:
+                keys = [k for k in keys if AttributeIndex.matches(
+                    self.__attribute(k, k_cls, name), value)]
+            result.update({k: self.__get(k) for k in keys})
+        return result
 
-    def all(self):
-        """returns the dictionary __objects"""
-        return self.__objects
+    def __attribute(self, key, cls, name):
+        """returns the attribute name of the object of key, read from its
+        record if it is pending
+        """
+        if key in self.__pending:
+            return self.__record(key).get(name, getattr(cls, name, None))
+        return getattr(self.__objects[key], name, None)
 
+    def __values(self, key, cls, names):
+        """returns a dictionary of the attributes names of the object of
+        key, read from its record if it is pending
+        """
+        if key in self.__pending:
+            record = self.__record(key)
+            return {name: record.get(name, getattr(cls, name, None))
+                    for name in names}
+        obj = self.__objects[key]
+        return {name: getattr(obj, name, None) for name in names}
+
+    def __attribute_indexes(self, cls):
+        """returns the attribute indexes of cls, filling them on first use
+        """
+        indexes = self.__indexes[cls]
+        if cls not in self.__unbuilt:
+            return indexes
+        with self.__fill_lock:
+            if cls not in self.__unbuilt:
+                return indexes
+            for key in self.__classes[cls]:
+                values = self.__values(key, cls, indexes)
+                for name, index in indexes.items():
+                    index.add(key, values[name])
+            self.__unbuilt.discard(cls)
+        return indexes
+
+    def __grid(self, cls):
+        """returns the grid index of cls, building it on first use"""
+        if cls not in self.__grids:
+            with self.__fill_lock:
+                if cls not in self.__grids:
+                    grid = GridIndex()
+                    for key in self.__classes[cls]:
+                        grid.add(key, *self.__values(
+                            key, cls, cls.__spatial__).values())
+                    self.__grids[cls] = grid
+        return self.__grids[cls]
+
+    def __spatial_classes(self, cls):
+        """returns the indexed subclasses of cls listing (latitude,
+        longitude) attributes in __spatial__
+        """
+        return [k_cls for k_cls in list(self.__classes)
+                if issubclass(k_cls, cls)
+                and len(getattr(k_cls, "__spatial__", ())) == 2]
+
+    def __locate(self, key, cls):
+        """Add the object of key to the grid index of cls"""
+        self.__grids[cls].add(key, *self.__values(
+            key, cls, cls.__spatial__).values())
+
+    @reads
+    def near(self, cls, latitude, longitude, km, limit=None):
+        """returns the list of instances of cls within km kilometers of a
+        point, nearest first, found through the grid indexes of the
+        classes listing __spatial__ attributes
+
+        Args:
+            cls (type): class of the objects to return
+            latitude (float): latitude of the point in degrees
+            longitude (float): longitude of the point in degrees
+            km (float): radius in kilometers
+            limit (int): maximum number of objects to return
+        """
+        found = []
+        for k_cls in self.__spatial_classes(cls):
+            found.extend(self.__grid(k_cls).near(latitude, longitude, km))
+        found.sort()
+        return [self.__get(key) for _, key in found[:limit]]
+
+    @reads
+    def within(self, cls, south, west, north, east):
+        """returns a dictionary of the instances of cls inside a bounding
+        box, which crosses the antimeridian when west is greater than east
+
+        Args:
+            cls (type): class of the objects to return
+            south (float): minimum latitude
+            west (float): western longitude
+            north (float): maximum latitude
+            east (float): eastern longitude
+        """
+        result = {}
+        for k_cls in self.__spatial_classes(cls):
+            result.update((key, self.__get(key)) for key in self.__grid(
+                k_cls).within(south, west, north, east))
+        return result
+
+    def __add_row(self, store, key, cls):
+        """Add the column attributes of the object of key to store"""
+        store.add(key, self.__values(key, cls,
+                                     store.names + store.categorical))
+
+    @reads
+    def columns(self, cls):
+        """returns the ColumnStore of the attributes cls lists in
+        __columns__, shared by the classes named like cls, or None if it
+        lists none
+
+        Args:
+            cls (type): class of the objects
+        """
+        if cls.__name__ not in self.__columns:
+            with self.__fill_lock:
+                if cls.__name__ not in self.__columns:
+                    store = ColumnStore.of(cls)
+                    for k_cls, keys in list(self.__classes.items()):
+                        if store is None or k_cls.__name__ != cls.__name__:
+                            continue
+                        for key in keys:
+                            self.__add_row(store, key, k_cls)
+                    self.__columns[cls.__name__] = store
+        return self.__columns[cls.__name__]
+
+    @reads
+    def query(self, cls=None, where=(), order_by=None, reverse=False,
+              limit=None, offset=0):
+        """returns the list of instances of cls satisfying every condition
+
+        Equality conditions on attributes indexed for every subclass of cls
+        select the candidates through the indexes; the other conditions
+        are only checked on those candidates.
+
+        Args:
+            cls (type): class of the objects to return, any if None
+            where (list): Condition objects or (name, op, value) tuples
+            order_by (str): name of the attribute to sort on, unsorted if None
+            reverse (bool): sort in descending order
+            limit (int): maximum number of objects to return
+            offset (int): number of objects to skip
+        """
+        cls = object if cls is None else cls
+        classes = [k_cls for k_cls in self.__classes if issubclass(k_cls, cls)]
+        candidates = None
+        rest = []
+        for cond in where:
+            cond = cond if isinstance(cond, Condition) else Condition(*cond)
+            if cond.op == "==" and all(cond.name in self.__indexes[k_cls]
+                                       for k_cls in classes):
+                keys = set().union(*(self.__attribute_indexes(k_cls)[
+                    cond.name].get(cond.value) for k_cls in classes))
+                candidates = keys if candidates is None else candidates & keys
+            else:
+                rest.append(cond)
+        if candidates is None:
+            candidates = (k for k_cls in classes
+                          for k in self.__classes[k_cls])
+        result = [obj for obj in map(self.__get, candidates)
+                  if all(cond(obj) for cond in rest)]
+        return paginate(result, order_by, reverse, limit, offset)
+
+    def __index(self, key, cls):
+        """Add key, of an object of class cls, to the class and attribute
+        indexes
+        """
+        if cls not in self.__classes:
+            self.__classes[cls] = set()
+            names = set(getattr(cls, "__indexes__", ()))
+            for k_cls, k_names in self.__indexed_names.items():
+                if issubclass(cls, k_cls):
+                    names |= k_names
+            self.__indexes[cls] = {name: AttributeIndex(name)
+                                   for name in names}
+            if len(names) > 0:
+                self.__unbuilt.add(cls)
+        self.__classes[cls].add(key)
+        store = self.__columns.get(cls.__name__, None)
+        if store is not None:
+            self.__add_row(store, key, cls)
+        if cls in self.__grids:
+            self.__locate(key, cls)
+        if cls in self.__unbuilt:
+            return
+        for name, index in self.__indexes[cls].items():
+            index.add(key, self.__attribute(key, cls, name))
+
+    def __unindex(self, key, cls):
+        """Remove key, of an object of class cls, from the class and
+        attribute indexes
+        """
+        self.__classes[cls].discard(key)
+        for index in self.__indexes[cls].values():
+            index.remove(key)
+        store = self.__columns.get(cls.__name__, None)
+        if store is not None:
+            store.remove(key)
+        if cls in self.__grids:
+            self.__grids[cls].remove(key)
+
+    @writes
     def new(self, obj):
         """Set in __objects obj with key <obj_class_name>.id"""
-        self.__objects[f"{obj.__class__.__name__}.{obj.id}"] = obj
+        key = f"{obj.__class__.__name__}.{obj.id}"
+        saved_obj = self.__objects.get(key, None)
+        if saved_obj is not None and saved_obj is not obj:
+            self.__unindex(key, saved_obj.__class__)
+        elif key in self.__pending:
+            del self.__pending[key]
+            self.__unindex(key, obj.__class__)
+        self.__objects[key] = obj
+        self.__index(key, obj.__class__)
+        self.__dirty[key] = None
+
+    @writes
+    def delete(self, obj=None):
+        """Remove obj from __objects if it is inside"""
+        if obj is None:
+            return
+        key = f"{obj.__class__.__name__}.{obj.id}"
+        saved_obj = self.__objects.pop(key, None)
+        if saved_obj is None and key in self.__pending:
+            del self.__pending[key]
+            saved_obj = obj
+        if saved_obj is not None:
+            self.__unindex(key, saved_obj.__class__)
+            self.__dirty[key] = None
+
+    def mark_dirty(self, obj, name):
+        """Record that the attribute name of obj changed since the last save
+
+        Args:
+            obj (BaseModel): the modified object
+            name (str): name of the modified attribute
+        """
+        key = f"{obj.__class__.__name__}.{getattr(obj, 'id', None)}"
+        if self.__objects.get(key, None) is not obj:
+            return
+        with self.__writing():
+            self.__mark_dirty(key, obj, name)
+
+    def __mark_dirty(self, key, obj, name):
+        """Record that the attribute name of obj, stored under key, changed
+        """
+        if self.__objects.get(key, None) is not obj:
+            return
+        index = self.__indexes[obj.__class__].get(name, None)
+        if index is not None and obj.__class__ not in self.__unbuilt:
+            index.add(key, getattr(obj, name, None))
+        store = self.__columns.get(obj.__class__.__name__, None)
+        if store is not None:
+            store.set(key, name, getattr(obj, name, None))
+        if obj.__class__ in self.__grids and name in obj.__spatial__:
+            self.__locate(key, obj.__class__)
+        attrs = self.__dirty.get(key, set())
+        if attrs is not None:
+            attrs.add(name)
+            self.__dirty[key] = attrs
+
+    @writes
+    def bulk_insert(self, objects):
+        """Add many objects and save them together, in one transaction
+
+        Args:
+            objects (iterable): the new objects
+        """
+        with self.transaction():
+            for obj in objects:
+                self.new(obj)
+
+    @writes
+    def bulk_update(self, changes):
+        """Set attributes of many objects, update their updated_at and save
+        them together, in one transaction
+
+        Args:
+            changes (iterable): (obj, attributes) pairs, attributes being a
+                dictionary of new attribute values
+        """
+        now = datetime.now()
+        with self.transaction():
+            for obj, attributes in changes:
+                for name, value in attributes.items():
+                    setattr(obj, name, value)
+                obj.updated_at = now
+                self.new(obj)
+
+    @writes
+    def bulk_delete(self, objects):
+        """Remove many objects and save the change once, in one transaction
+
+        Args:
+            objects (iterable): the objects to remove
+        """
+        with self.transaction():
+            for obj in objects:
+                self.delete(obj)
+
+    @contextmanager
+    def transaction(self):
+        """Defer the saves made in a with block to its end, then save every
+        change at once; if the block raises, roll the objects back to
+        their state at its start instead, and save nothing
+
+        In journal mode the changes are appended as one group record,
+        replayed whole or not at all. Otherwise the snapshot file, or each
+        changed shard, is replaced atomically like on every save. A
+        transaction opened inside another one is part of it.
+
+        The state of the objects is kept as encoded in the save cache, so
+        the first transaction encodes every object not yet saved. Objects
+        changed in the block are restored in place, deleted ones are
+        instantiated again. In thread-safe mode the block holds the lock
+        for writing.
+        """
+        with self.__writing():
+            if self.__transaction is not None:
+                yield self
+                return
+            dirty = self.dirty()
+            self.__refresh()
+            self.__transaction = dirty
+            try:
+                yield self
+            except BaseException:
+                self.__rollback()
+                raise
+            finally:
+                self.__transaction = None
+            self.__dirty = self.__merge_dirty(dirty, self.__dirty)
+            self.__save(group=True)
 
+    def __writing(self):
+        """returns a context holding the lock for writing in thread-safe
+        mode, doing nothing otherwise
+        """
+        if self.__rwlock is None:
+            return nullcontext()
+        return self.__rwlock.write()
+
+    @staticmethod
+    def __merge_dirty(first, second):
+        """returns the union of two dirty mappings"""
+        merged = {k: (v if v is None else set(v)) for k, v in first.items()}
+        for key, attrs in second.items():
+            if key not in merged or attrs is None:
+                merged[key] = attrs if attrs is None else set(attrs)
+            elif merged[key] is not None:
+                merged[key] |= attrs
+        return merged
+
+    def __rollback(self):
+        """Restore the objects changed in the transaction from the cache,
+        which holds their encoding at its start
+        """
+        for key in list(self.__dirty):
+            fragment = self.__cache.get(key, None)
+            self.__adopt(key, None if fragment is None
+                         else self.__format.decode(fragment), fragment)
+        self.__dirty = self.__transaction
+
+    def __adopt(self, key, record, fragment=None):
+        """Replace the object of key by the one of record, restoring it in
+        place if it is instantiated, or remove it if record is None
+
+        Args:
+            key (str): <class_name>.id key of the object
+            record (dict): the to_dict() dictionary of the object, or None
+            fragment: encoding of record to cache, if any
+        """
+        cls = self.get_class(key.split(".")[0])
+        obj = self.__objects.pop(key, None)
+        if obj is not None:
+            self.__unindex(key, obj.__class__)
+        elif self.__pending.pop(key, None) is not None:
+            self.__unindex(key, cls)
+        self.__cache.pop(key, None)
+        if record is None:
+            return
+        if obj is not None:
+            if hasattr(obj, "__dict__"):
+                obj.__dict__.clear()
+            obj.__init__(**record)
+            self.__objects[key] = obj
+        elif self.__lazy:
+            self.__pending[key] = record
+        else:
+            obj = cls(**record)
+            self.__objects[key] = obj
+        if fragment is not None:
+            self.__cache[key] = fragment
+        self.__index(key, cls if obj is None else obj.__class__)
+
+    @reads
+    def dirty(self):
+        """returns the keys of the objects changed since the last save,
+        mapped to the names of their changed attributes or to None when
+        the whole object is new or deleted
+        """
+        return self.__merge_dirty(self.__transaction or {}, self.__dirty)
+
+    @writes
     def save(self):
-        """Serialize __objects to the JSON file __file_path."""
-        with open(self.__file_path, 'w') as f:
-            json.dump({k: v.to_dict() for k, v in self.__objects.items()}, f)
-
-    def reload(self):
-        """Deserialize the JSON file __file_path to __objects, if it exists."""
-        if (os.path.isfile(self.__file_path)
-                and os.path.getsize(self.__file_path) > 0):
-            with open(self.__file_path, 'r') as f:
-                self.__objects = {k: self.get_class(k.split(".")[0])(**v)
-                                  for k, v in json.load(f).items()}
+        """Serialize __objects to the JSON file __file_path.
+
+        In journal mode only the objects changed since the previous save
+        are appended to the log file. In sharded mode only the shards of
+        the classes of those objects are written. Inside a transaction
+        nothing is written until it ends. In write-behind mode the write
+        is only scheduled.
+        """
+        if self.__transaction is not None:
+            return
+        if self.__write_behind is None:
+            self.__save()
+            return
+        self.__unsaved = True
+        if self.__flush_timer is None:
+            self.__schedule_flush()
+
+    def __schedule_flush(self):
+        """Start the timer writing the scheduled changes, waiting twice as
+        long after every failed write, up to MAX_WRITE_BEHIND milliseconds
+        """
+        delay = min(self.__write_behind * 2 ** self.__failures,
+                    max(self.__write_behind, self.MAX_WRITE_BEHIND))
+        self.__flush_timer = threading.Timer(delay / 1000,
+                                             self.__flush_behind)
+        self.__flush_timer.daemon = True
+        self.__flush_timer.start()
+
+    def __flush_behind(self):
+        """Write the scheduled changes from the timer thread, logging the
+        error and scheduling another try later if the write fails
+        """
+        try:
+            self.flush()
+        except Exception as error:
+            logger.exception("write-behind save of %s failed",
+                             self.__file_path)
+            with self.__writing():
+                self.__failures += 1
+                self.__flush_error = error
+                if self.__unsaved and self.__flush_timer is None:
+                    self.__schedule_flush()
+
+    @writes
+    def flush(self):
+        """Write the changes scheduled by save in write-behind mode, then
+        sync the files whose fsync was batched
+
+        Raises:
+            Exception: the error of the write, chained to the one of the
+                last failed write-behind save, if any
+        """
+        timer, self.__flush_timer = self.__flush_timer, None
+        if timer is not None and timer is not threading.current_thread():
+            timer.cancel()
+        if self.__unsaved and self.__transaction is None:
+            try:
+                self.__save()
+            except Exception as error:
+                if (self.__flush_error is not None
+                        and self.__flush_error is not error):
+                    raise error from self.__flush_error
+                raise
+        self.__flush_error = None
+        self.__failures = 0
+        self.__sync.flush()
+
+    def __save(self, group=False):
+        """Write the changes, after the ones of the other processes in
+        shared mode
+
+        Args:
+            group (bool): append the journal records as one group record
+        """
+        dirty = self.__merge_dirty(self.__dirty, {})
+        try:
+            with self.__file_lock():
+                self.__merge_changes()
+                self.__write_changes(group)
+                if self.__shared:
+                    self.__seen = self.__signature()
+        except BaseException:
+            self.__dirty = self.__merge_dirty(dirty, self.__dirty)
+            raise
+        self.__unsaved = False
+
+    def __write_changes(self, group):
+        """Write the changes
+
+        Args:
+            group (bool): append the journal records as one group record
+        """
+        if self.__journaled:
+            records = [Journal.put(key, self.__journal_fragment(key))
+                       if key in self.__objects else Journal.delete(key)
+                       for key in self.__refresh(complete=False)]
+            with self.__log_lock:
+                self.__journal.append(records, group)
+            self.__compact_if_needed()
+        else:
+            self.__join_compactor()
+            self.__refresh()
+            if self.__sharded:
+                self.__write_shards(self.__cache, self.__stale)
+            else:
+                self.__write_file(self.__file_path, self.__cache)
+            self.__stale = set()
+            with self.__log_lock:
+                self.__journal.truncate()
+
+    def __refresh(self, complete=True):
+        """Encode the dirty objects and, if complete is set, the ones never
+        encoded before
+
+        Args:
+            complete (bool): make the cache hold every object
+
+        Returns:
+            list: keys of the objects that were dirty
+        """
+        encode = self.__format.encode
+        isoformat = not self.__format.native_datetime
+        dirty = list(self.__dirty)
+        for key in dirty:
+            self.__stale.add(key.split(".", 1)[0])
+            obj = self.__objects.get(key, None)
+            if obj is None:
+                self.__cache.pop(key, None)
+            else:
+                self.__cache[key] = encode(key, obj.to_dict(isoformat))
+        if complete and len(self.__cache) != self.count():
+            for key in [*self.__objects, *self.__pending]:
+                if key not in self.__cache:
+                    self.__cache[key] = self.__encoded(key)
+        self.__dirty.clear()
+        return dirty
+
+    def __encoded(self, key):
+        """returns the encoding of the object of key, from the cache if it
+        is there
+        """
+        if key in self.__cache:
+            return self.__cache[key]
+        if key in self.__objects:
+            return self.__format.encode(key, self.__objects[key].to_dict(
+                not self.__format.native_datetime))
+        record = self.__pending[key]
+        if not isinstance(record, OffsetIndex):
+            return self.__format.encode(key, record)
+        if self.__format.json_fragments:
+            return record.fragment(key).decode("utf-8")
+        return record.fragment(key)
+
+    @contextmanager
+    def __file_lock(self, exclusive=True):
+        """Hold the lock on <__file_path>.lock in shared mode
+
+        Args:
+            exclusive (bool): take an exclusive lock rather than a shared
+                one
+        """
+        if not self.__shared:
+            yield
+            return
+        with open(f"{self.__file_path}.lock", 'a') as f:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def __signature(self):
+        """returns the (size, inode, modification time) of the snapshot
+        files, and the (inode, size) of the log file if it exists
+        """
+        snapshot = []
+        for path in self.__snapshot_paths():
+            st = os.stat(path)
+            snapshot.append((path, st.st_size, st.st_ino, st.st_mtime_ns))
+        try:
+            st = os.stat(self.__journal.path)
+        except FileNotFoundError:
+            return tuple(snapshot), None
+        return tuple(snapshot), (st.st_ino, st.st_size)
+
+    def __merge_changes(self):
+        """Apply the changes saved by other processes since the files were
+        last read or written here, except to the objects changed here, in
+        shared mode
+        """
+        if not self.__shared:
+            return
+        snapshot, log = signature = self.__signature()
+        seen = self.__seen
+        if seen == signature:
+            return
+        changed = self.dirty()
+        encode = self.__format.encode
+        if (seen is not None and seen[0] == snapshot and seen[1] is not None
+                and log is not None and log[0] == seen[1][0]):
+            for key, record in self.__journal.tail(seen[1][1]):
+                if key not in changed:
+                    self.__stale.add(key.split(".", 1)[0])
+                    self.__adopt(key, record, None if record is None
+                                 else encode(key, record))
+            return
+        current = {}
+        for path in snapshot:
+            with open(path[0], 'rb') as f:
+                current.update(self.__format.load(f))
+        for key, record in self.__journal:
+            self.__stale.add(key.split(".", 1)[0])
+            if record is None:
+                current.pop(key, None)
+            else:
+                current[key] = record
+        for key in [*self.__objects, *self.__pending]:
+            if key not in current and key not in changed:
+                self.__adopt(key, None)
+        for key, record in current.items():
+            if key in changed:
+                continue
+            fragment = encode(key, record)
+            if (key not in self.__objects and key not in self.__pending
+                    or self.__encoded(key) != fragment):
+                self.__adopt(key, record, fragment)
+
+    @writes
+    def reload_changes(self):
+        """Apply the changes saved by other processes since this one last
+        reloaded or saved, except to the objects it changed since, in
+        shared mode
+        """
+        if not self.__shared:
+            return
+        with self.__file_lock(exclusive=False):
+            self.__merge_changes()
+            self.__seen = self.__signature()
+
+    def __journal_fragment(self, key):
+        """returns the JSON encoding of the object of key for the log file,
+        reusing its cached encoding when the snapshot format is JSON
+        """
+        if self.__format.json_fragments:
+            return self.__cache[key]
+        return json.dumps(self.__objects[key].to_dict())
+
+    @writes
+    def reload(self, progress=None):
+        """Deserialize the file __file_path to __objects, if it exists.
+
+        The file is read record by record and every record is instantiated
+        as soon as it is read. Records of the log file, if any, are
+        replayed over the snapshot. In indexed mode only the keys of the
+        offset index of a snapshot file are read, unless it has no valid
+        index.
+
+        Args:
+            progress (callable): called with the number of bytes read and
+                the size of the files while they are read
+        """
+        with self.__file_lock(exclusive=False):
+            self.__reload(progress)
+            if self.__shared:
+                self.__seen = self.__signature()
+        if self.__journaled and not self.__shared:
+            self.__compact_if_needed()
+
+    def __reload(self, progress):
+        """Deserialize the snapshot and log files to __objects
+
+        Args:
+            progress (callable): called with the number of bytes read and
+                the size of the files while they are read
+        """
+        paths = self.__snapshot_paths()
+        if len(paths) == 0 and not self.__journal.exists():
+            return
+        unsharded = self.__sharded and paths == [self.__file_path]
+        loaded = {}
+        stale = set()
+
+        def load(key, record):
+            """keeps the object of a record, or the record in lazy mode"""
+            if record is None:
+                loaded.pop(key, None)
+            elif self.__lazy:
+                loaded[key] = record
+            else:
+                loaded[key] = self.get_class(key.split(".")[0])(**record)
+
+        total = sum(os.path.getsize(path) for path in paths)
+        done = 0
+        if self.__indexed:
+            unindexed = []
+            for path in paths:
+                try:
+                    index = OffsetIndex(path, self.__format.name)
+                except ValueError:
+                    unindexed.append(path)
+                    continue
+                loaded.update(dict.fromkeys(index.keys(), index))
+                done += os.path.getsize(path)
+                if progress is not None:
+                    progress(done, total)
+            paths = unindexed
+            if self.__sharded:
+                stale.update(self.__shard_name(path) for path in paths)
+        parallel = (self.__workers is not None and self.__workers > 1
+                    and len(paths) > 1)
+        for path, items in self.__load_parallel(paths) if parallel else []:
+            loaded.update(items)
+            done += os.path.getsize(path)
+            if progress is not None:
+                progress(done, total)
+        for path in [] if parallel else paths:
+            with open(path, 'rb') as f:
+                if progress is not None:
+                    f = io.BufferedReader(
+                        ProgressFile(f, total, progress, start=done))
+                for key, record in self.__format.load(f):
+                    load(key, record)
+            done += os.path.getsize(path)
+        for key, record in self.__journal:
+            load(key, record)
+            stale.add(key.split(".", 1)[0])
+        if unsharded:
+            stale.update(key.split(".", 1)[0] for key in loaded)
+
+        self.__classes = {}
+        self.__indexes = {}
+        self.__columns = {}
+        self.__grids = {}
+        self.__unbuilt = set()
+        self.__objects = {} if self.__lazy else loaded
+        self.__pending = loaded if self.__lazy else {}
+        for key in loaded:
+            self.__index(key, self.get_class(key.split(".")[0]))
+        self.__dirty.clear()
+        self.__cache.clear()
+        self.__stale = stale
+        self.__unsharded = unsharded
+
+    def __load_parallel(self, paths):
+        """yields every path with the (key, value) pairs decoded from it by
+        a pool of worker processes, in the order of paths
+
+        The workers are started with HBNB_STORAGE_WORKER set so that they
+        do not reload the default storage when they import models.
+        """
+        environ = os.environ.get("HBNB_STORAGE_WORKER", None)
+        os.environ["HBNB_STORAGE_WORKER"] = "1"
+        try:
+            with ProcessPoolExecutor(
+                    min(self.__workers, len(paths))) as executor:
+                format, compression = self.__format_args
+                results = executor.map(partial(
+                    load_file, format=format, compression=compression,
+                    lazy=self.__lazy), paths)
+                yield from zip(paths, results)
+        finally:
+            if environ is None:
+                del os.environ["HBNB_STORAGE_WORKER"]
+            else:
+                os.environ["HBNB_STORAGE_WORKER"] = environ
+
+    def __shard_path(self, name):
+        """returns the path of the shard file of the class name"""
+        root, ext = os.path.splitext(self.__file_path)
+        return f"{root}.{name}{ext}"
+
+    def __shard_name(self, path):
+        """returns the name of the class of the shard file path"""
+        root, ext = os.path.splitext(self.__file_path)
+        prefix = os.path.basename(root)
+        name = os.path.basename(path)
+        return name[len(prefix) + 1:len(name) - len(ext)]
+
+    def __snapshot_paths(self):
+        """returns the paths of the non empty snapshot files: __file_path,
+        or the shard files of the registered classes in sharded mode, or
+        __file_path in sharded mode when no shard exists yet
+        """
+        def non_empty(paths):
+            """returns the paths of the non empty files of paths"""
+            return [path for path in paths
+                    if os.path.isfile(path) and os.path.getsize(path) > 0]
+
+        if not self.__sharded:
+            return non_empty([self.__file_path])
+        root, ext = os.path.splitext(os.path.abspath(self.__file_path))
+        directory, prefix = os.path.split(root)
+        paths = []
+        for entry in sorted(os.listdir(directory)):
+            name = entry[len(prefix) + 1:len(entry) - len(ext)]
+            if (not entry.startswith(f"{prefix}.")
+                    or not entry.endswith(ext) or "." in name):
+                continue
+            try:
+                self.get_class(name)
+            except KeyError:
+                continue
+            paths.append(self.__shard_path(name))
+        return non_empty(paths) or non_empty([self.__file_path])
+
+    @writes
+    def compact(self, background=False):
+        """Fold the log file into a fresh snapshot of __objects.
+
+        The snapshot is written to a temporary file that atomically
+        replaces __file_path, then the records it covers are dropped from
+        the log. Records appended meanwhile are kept.
+
+        In shared mode the snapshot is written in the foreground, under
+        the lock, after merging the changes of the other processes.
+
+        Args:
+            background (bool): write the snapshot in a background thread
+
+        Returns:
+            threading.Thread: the compaction thread, if background is set
+        """
+        if not self.__shared:
+            return self.__compact(background)
+        with self.__file_lock():
+            self.__merge_changes()
+            self.__compact(False)
+            self.__seen = self.__signature()
+        return None
+
+    def __compact(self, background):
+        """Fold the log file into a fresh snapshot of __objects
+
+        Args:
+            background (bool): write the snapshot in a background thread
+
+        Returns:
+            threading.Thread: the compaction thread, if background is set
+        """
+        self.__join_compactor()
+        with self.__log_lock:
+            self.__refresh()
+            fragments = dict(self.__cache)
+            offset = self.__journal.size()
+            names, self.__stale = self.__stale, set()
+        if not background:
+            self.__write_snapshot(fragments, offset, names)
+            return None
+        self.__compactor = threading.Thread(
+            target=self.__write_snapshot, args=(fragments, offset, names),
+            daemon=True)
+        self.__compactor.start()
+        return self.__compactor
+
+    def __join_compactor(self):
+        """Wait for the background compaction, if one is running, so that
+        its older snapshot is not written over a newer one
+        """
+        compactor = self.__compactor
+        if (compactor is not None
+                and compactor is not threading.current_thread()):
+            compactor.join()
+
+    def __compact_if_needed(self):
+        """Compact the log once it reaches one of the configured thresholds
+        """
+        if self.__compactor is not None and self.__compactor.is_alive():
+            return
+        if ((self.__compact_records is not None
+             and self.__journal.records >= self.__compact_records)
+                or (self.__compact_bytes is not None
+                    and self.__journal.size() >= self.__compact_bytes)):
+            self.__compact(self.__background and not self.__shared)
+
+    def __write_snapshot(self, fragments, offset, names):
+        """Atomically write a snapshot and drop the log records it covers
+
+        Args:
+            fragments (dict): <key>: <encoded dict> mapping to write
+            offset (int): size of the log when fragments was taken
+            names (set): names of the classes whose shards are stale
+        """
+        if self.__sharded:
+            self.__write_shards(fragments, names)
+        else:
+            self.__write_file(self.__file_path, fragments)
+        with self.__log_lock:
+            self.__journal.discard(offset)
+
+    def __write_shards(self, fragments, names):
+        """Write the shard files of the classes names, removing the ones
+        left without objects
+
+        Args:
+            fragments (dict): <key>: <encoded dict> mapping of every object
+            names (set): names of the classes whose shards are written
+        """
+        shards = {name: {} for name in names}
+        for key, fragment in fragments.items():
+            shard = shards.get(key.split(".", 1)[0], None)
+            if shard is not None:
+                shard[key] = fragment
+        for name, shard in shards.items():
+            path = self.__shard_path(name)
+            if len(shard) > 0:
+                self.__write_file(path, shard)
+                continue
+            for old_path in [path, f"{path}.idx"]:
+                if os.path.exists(old_path):
+                    os.remove(old_path)
+        if self.__unsharded:
+            self.__unsharded = False
+            for old_path in [self.__file_path, f"{self.__file_path}.idx"]:
+                if os.path.exists(old_path):
+                    os.remove(old_path)
+
+    def __write_file(self, path, fragments):
+        """Atomically replace the file path by the encoded objects, and
+        write its offset index in indexed mode
+
+        The file is replaced rather than rewritten so that objects still
+        pending on the memory mapped previous file can be read from it.
+
+        Args:
+            path (str): path to the written file
+            fragments (dict): <key>: <encoded dict> mapping to write
+        """
+        offsets = [] if self.__indexed else None
+        self.__sync.replace(path, lambda f: self.__format.dump(
+            fragments, f, offsets))
+        if offsets is not None:
+            OffsetIndex.write(path, self.__format.name, offsets)
 
     def get_class(self, name):
         """ returns a class from models module using its name"""
-        sub_module = re.sub('(?!^)([A-Z]+)', r'_\1', name).lower()
-        module = importlib.import_module(f"models.{sub_module}")
-        return getattr(module, name)
+        return registry.get_class(name)
+
+
+def load_file(path, format="json", compression=None, lazy=False):
+    """returns the (key, object) pairs of a snapshot file, or its (key,
+    record) pairs if lazy is set
+
+    This is the function the reload worker processes run.
+
+    Args:
+        path (str): path to the snapshot file
+        format (str): format of the file
+        compression (str): compression of the file, if any
+        lazy (bool): return the records without instantiating them
+    """
+    with open(path, 'rb') as f:
+        records = get_format(format, compression).load(f)
+        if lazy:
+            return list(records)
+        return [(key, registry.get_class(key.split(".")[0])(**record))
+                for key, record in records]
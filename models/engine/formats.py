@@ -0,0 +1,505 @@
+#!/usr/bin/python3
+"""Module formats
+
+This Module contains the file formats FileStorage can persist objects
+in: JSONFormat, JSONLinesFormat, BinaryFormat and CompressedFormat. It
+can also be run to convert a store from one format to another:
+
+    python3 -m models.engine.formats file.json file.bin --to binary
+"""
+
+import argparse
+import gzip
+import io
+import json
+import lzma
+import struct
+import zlib
+from datetime import datetime, timedelta
+
+from models.engine.stream import RecordReader
+
+
+def _default(value):
+    """returns datetime values in isoformat for the JSON encoder"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def record_key(record):
+    """returns the <class_name>.id key of a record"""
+    return f"{record['__class__']}.{record['id']}"
+
+
+class JSONFormat:
+    """JSONFormat Class
+
+    One JSON object mapping every <class_name>.id key to its record, as
+    in the original file.json.
+
+    Attributes:
+        name (str): name of the format
+        json_fragments (bool): True if encode returns JSON text
+        native_datetime (bool): True if datetime values are stored as such
+    """
+
+    name = "json"
+    json_fragments = True
+    native_datetime = False
+
+    def encode(self, key, record):
+        """returns the encoding of a record
+
+        Args:
+            key (str): <class_name>.id key of the record
+            record (dict): the to_dict() dictionary of an object
+        """
+        return json.dumps(record, default=_default)
+
+    def dump(self, fragments, f, offsets=None):
+        """Write encoded records to a file
+
+        Args:
+            fragments (dict): <key>: <encoded record> mapping
+            f (file): file open for writing in binary mode
+            offsets (list): if given, receives the (key, offset, length)
+                of every encoded record in the file
+        """
+        pos = f.write(b"{")
+        sep = b""
+        for key, fragment in fragments.items():
+            head = sep + json.dumps(key).encode() + b": "
+            data = fragment.encode("utf-8")
+            f.write(head)
+            f.write(data)
+            if offsets is not None:
+                offsets.append((key, pos + len(head), len(data)))
+            pos += len(head) + len(data)
+            sep = b", "
+        f.write(b"}")
+
+    def decode(self, fragment):
+        """returns the record of an encoded record
+
+        Args:
+            fragment (bytes): a record as returned by encode
+        """
+        return json.loads(fragment)
+
+    def load(self, f):
+        """yields the (key, record) pairs of a file
+
+        Args:
+            f (file): file open for reading in binary mode
+        """
+        return iter(RecordReader(f))
+
+
+class JSONLinesFormat(JSONFormat):
+    """JSONLinesFormat Class
+
+    One JSON record per line; the key of a record is built from its
+    __class__ and id values.
+    """
+
+    name = "jsonl"
+
+    def dump(self, fragments, f, offsets=None):
+        """Write encoded records to a file, one per line
+
+        Args:
+            fragments (dict): <key>: <encoded record> mapping
+            f (file): file open for writing in binary mode
+            offsets (list): if given, receives the (key, offset, length)
+                of every encoded record in the file
+        """
+        pos = 0
+        for key, fragment in fragments.items():
+            data = fragment.encode("utf-8")
+            f.write(data)
+            f.write(b"\n")
+            if offsets is not None:
+                offsets.append((key, pos, len(data)))
+            pos += len(data) + 1
+
+    def load(self, f):
+        """yields the (key, record) pairs of a file
+
+        Args:
+            f (file): file open for reading in binary mode
+        """
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield record_key(record), record
+
+
+class BinaryFormat:
+    """BinaryFormat Class
+
+    A compact msgpack-style encoding: a magic header followed by length
+    prefixed records. Values are tagged with one byte; datetime values are
+    stored as microseconds since the epoch, so they are neither formatted
+    nor parsed as text.
+
+    Attributes:
+        name (str): name of the format
+        json_fragments (bool): True if encode returns JSON text
+        native_datetime (bool): True if datetime values are stored as such
+    """
+
+    name = "binary"
+    json_fragments = False
+    native_datetime = True
+    MAGIC = b"HBNB\x01"
+    EPOCH = datetime(1970, 1, 1)
+    MICROSECOND = timedelta(microseconds=1)
+    INT = struct.Struct("<q")
+    FLOAT = struct.Struct("<d")
+
+    def encode(self, key, record):
+        """returns the encoding of a record
+
+        Args:
+            key (str): <class_name>.id key of the record
+            record (dict): the to_dict() dictionary of an object
+        """
+        out = bytearray()
+        self.pack(record, out)
+        return self.varint(len(out)) + bytes(out)
+
+    def dump(self, fragments, f, offsets=None):
+        """Write encoded records to a file
+
+        Args:
+            fragments (dict): <key>: <encoded record> mapping
+            f (file): file open for writing in binary mode
+            offsets (list): if given, receives the (key, offset, length)
+                of every encoded record in the file
+        """
+        pos = f.write(self.MAGIC)
+        for key, fragment in fragments.items():
+            f.write(fragment)
+            if offsets is not None:
+                offsets.append((key, pos, len(fragment)))
+            pos += len(fragment)
+
+    def decode(self, fragment):
+        """returns the record of an encoded record
+
+        Args:
+            fragment (bytes): a record as returned by encode
+        """
+        size, pos = self.unpack_varint(fragment, 0)
+        return self.unpack(fragment, pos)[0]
+
+    def load(self, f):
+        """yields the (key, record) pairs of a file
+
+        Args:
+            f (file): file open for reading in binary mode
+
+        Raises:
+            ValueError: if the file is not in this format
+        """
+        data = f.read()
+        if data[:len(self.MAGIC)] != self.MAGIC:
+            raise ValueError("not a binary storage file")
+        pos = len(self.MAGIC)
+        while pos < len(data):
+            size, pos = self.unpack_varint(data, pos)
+            record, end = self.unpack(data, pos)
+            if end != pos + size:
+                raise ValueError(f"corrupted record at byte {pos}")
+            pos = end
+            yield record_key(record), record
+
+    @staticmethod
+    def varint(n):
+        """returns the LEB128 encoding of a non negative integer"""
+        out = bytearray()
+        while n > 0x7f:
+            out.append((n & 0x7f) | 0x80)
+            n >>= 7
+        out.append(n)
+        return bytes(out)
+
+    @staticmethod
+    def unpack_varint(data, pos):
+        """returns the LEB128 integer at pos and the position after it"""
+        n = shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            n |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                return n, pos
+            shift += 7
+
+    def pack(self, value, out):
+        """Append the encoding of a value to out
+
+        Args:
+            value: None, bool, int, float, str, datetime, list, tuple or
+                dict with str keys
+            out (bytearray): the encoded bytes
+        """
+        if value is None:
+            out += b"N"
+        elif value is True:
+            out += b"T"
+        elif value is False:
+            out += b"F"
+        elif isinstance(value, str):
+            data = value.encode("utf-8")
+            out += b"s" + self.varint(len(data)) + data
+        elif isinstance(value, int):
+            if -(1 << 63) <= value < (1 << 63):
+                out += b"i" + self.INT.pack(value)
+            else:
+                data = str(value).encode()
+                out += b"I" + self.varint(len(data)) + data
+        elif isinstance(value, float):
+            out += b"d" + self.FLOAT.pack(value)
+        elif isinstance(value, datetime):
+            if value.tzinfo is None:
+                out += b"t" + self.INT.pack(
+                    (value - self.EPOCH) // self.MICROSECOND)
+            else:
+                data = value.isoformat().encode()
+                out += b"z" + self.varint(len(data)) + data
+        elif isinstance(value, (list, tuple)):
+            out += b"l" + self.varint(len(value))
+            for item in value:
+                self.pack(item, out)
+        elif isinstance(value, dict):
+            out += b"m" + self.varint(len(value))
+            for k, item in value.items():
+                self.pack(str(k), out)
+                self.pack(item, out)
+        else:
+            raise TypeError(f"cannot encode {type(value).__name__}")
+
+    def unpack(self, data, pos):
+        """returns the value encoded at pos and the position after it"""
+        tag = data[pos:pos + 1]
+        pos += 1
+        if tag == b"s":
+            size, pos = self.unpack_varint(data, pos)
+            return data[pos:pos + size].decode("utf-8"), pos + size
+        if tag == b"i":
+            return self.INT.unpack_from(data, pos)[0], pos + 8
+        if tag == b"t":
+            us = self.INT.unpack_from(data, pos)[0]
+            return self.EPOCH + timedelta(microseconds=us), pos + 8
+        if tag == b"d":
+            return self.FLOAT.unpack_from(data, pos)[0], pos + 8
+        if tag == b"N":
+            return None, pos
+        if tag in [b"T", b"F"]:
+            return tag == b"T", pos
+        if tag in [b"I", b"z"]:
+            size, pos = self.unpack_varint(data, pos)
+            text = data[pos:pos + size].decode()
+            value = int(text) if tag == b"I" else datetime.fromisoformat(text)
+            return value, pos + size
+        if tag == b"l":
+            size, pos = self.unpack_varint(data, pos)
+            items = []
+            for _ in range(size):
+                item, pos = self.unpack(data, pos)
+                items.append(item)
+            return items, pos
+        if tag == b"m":
+            size, pos = self.unpack_varint(data, pos)
+            items = {}
+            for _ in range(size):
+                k, pos = self.unpack(data, pos)
+                items[k], pos = self.unpack(data, pos)
+            return items, pos
+        raise ValueError(f"unknown tag {tag!r} at byte {pos - 1}")
+
+
+class ZlibFile(io.RawIOBase):
+    """ZlibFile Class
+
+    A file compressing what is written to, or decompressing what is read
+    from, another binary file with zlib.
+    """
+
+    def __init__(self, file, mode):
+        """__init__ method & instantiation of class ZlibFile
+
+        Args:
+            file (file): the compressed file, in binary mode
+            mode (str): 'rb' or 'wb'
+        """
+        super().__init__()
+        self.file = file
+        self.mode = mode
+        self.__zlib = (zlib.compressobj() if mode == "wb"
+                       else zlib.decompressobj())
+        self.__buf = b""
+
+    def readable(self):
+        """returns True if the file is open for reading"""
+        return self.mode == "rb"
+
+    def writable(self):
+        """returns True if the file is open for writing"""
+        return self.mode == "wb"
+
+    def readinto(self, buffer):
+        """Decompress bytes of the file into buffer
+
+        Returns:
+            int: the number of bytes read
+        """
+        while len(self.__buf) == 0 and not self.__zlib.eof:
+            chunk = self.file.read(1 << 16)
+            if len(chunk) == 0:
+                self.__buf = self.__zlib.flush()
+                break
+            self.__buf = self.__zlib.decompress(chunk)
+        size = min(len(buffer), len(self.__buf))
+        buffer[:size] = self.__buf[:size]
+        self.__buf = self.__buf[size:]
+        return size
+
+    def write(self, data):
+        """Compress data to the file
+
+        Returns:
+            int: the number of bytes written
+        """
+        self.file.write(self.__zlib.compress(data))
+        return len(data)
+
+    def close(self):
+        """Flush the compressed data, without closing the file"""
+        if not self.closed and self.mode == "wb":
+            self.file.write(self.__zlib.flush())
+        super().close()
+
+
+class CompressedFormat:
+    """CompressedFormat Class
+
+    Another format whose file is compressed with zlib, gzip or lzma.
+
+    Attributes:
+        format: the format of the uncompressed data
+        compression (str): zlib, gzip or lzma
+    """
+
+    OPENERS = {
+        "zlib": ZlibFile,
+        "gzip": lambda f, mode: gzip.GzipFile(fileobj=f, mode=mode),
+        "lzma": lzma.LZMAFile,
+    }
+
+    def __init__(self, format, compression):
+        """__init__ method & instantiation of class CompressedFormat
+
+        Args:
+            format: the format of the uncompressed data
+            compression (str): zlib, gzip or lzma
+        """
+        if compression not in self.OPENERS:
+            raise ValueError(f"unknown compression {compression}")
+        self.format = format
+        self.compression = compression
+        self.name = f"{format.name}.{compression}"
+        self.json_fragments = format.json_fragments
+        self.native_datetime = format.native_datetime
+
+    def encode(self, key, record):
+        """returns the encoding of a record in the uncompressed format"""
+        return self.format.encode(key, record)
+
+    def dump(self, fragments, f, offsets=None):
+        """Write encoded records to a file, compressed
+
+        Offsets in a compressed file are meaningless, so offsets, if
+        given, is left empty.
+        """
+        with self.OPENERS[self.compression](f, "wb") as out:
+            self.format.dump(fragments, out)
+
+    def decode(self, fragment):
+        """returns the record of an encoded record"""
+        return self.format.decode(fragment)
+
+    def load(self, f):
+        """yields the (key, record) pairs of a compressed file"""
+        with self.OPENERS[self.compression](f, "rb") as data:
+            yield from self.format.load(io.BufferedReader(data)
+                                        if isinstance(data, ZlibFile)
+                                        else data)
+
+
+FORMATS = {
+    "json": JSONFormat,
+    "jsonl": JSONLinesFormat,
+    "binary": BinaryFormat,
+}
+
+
+def get_format(name="json", compression=None):
+    """returns a format by name, optionally compressed
+
+    Args:
+        name (str): json, jsonl or binary
+        compression (str): None, zlib, gzip or lzma
+    """
+    if name not in FORMATS:
+        raise ValueError(f"unknown format {name}")
+    fmt = FORMATS[name]()
+    return fmt if compression is None else CompressedFormat(fmt, compression)
+
+
+def convert(src, src_format, dst, dst_format):
+    """Copy every record of a store to another file in another format
+
+    Args:
+        src (str): path to the source file
+        src_format: format of the source file
+        dst (str): path to the destination file
+        dst_format: format of the destination file
+
+    Returns:
+        int: the number of records copied
+    """
+    with open(src, 'rb') as f:
+        fragments = {key: dst_format.encode(key, record)
+                     for key, record in src_format.load(f)}
+    with open(dst, 'wb') as f:
+        dst_format.dump(fragments, f)
+    return len(fragments)
+
+
+def main(argv=None):
+    """Convert a store between formats from the command line"""
+    parser = argparse.ArgumentParser(
+        description="Convert a FileStorage file to another format")
+    parser.add_argument("src")
+    parser.add_argument("dst")
+    parser.add_argument("--from", dest="src_format", default="json",
+                        choices=sorted(FORMATS))
+    parser.add_argument("--from-compression", choices=sorted(
+        CompressedFormat.OPENERS))
+    parser.add_argument("--to", dest="dst_format", default="json",
+                        choices=sorted(FORMATS))
+    parser.add_argument("--to-compression", choices=sorted(
+        CompressedFormat.OPENERS))
+    args = parser.parse_args(argv)
+    count = convert(args.src,
+                    get_format(args.src_format, args.from_compression),
+                    args.dst,
+                    get_format(args.dst_format, args.to_compression))
+    print(f"{count} records written to {args.dst}")
+
+
+if __name__ == "__main__":
+    main()
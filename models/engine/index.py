@@ -0,0 +1,93 @@
+#!/usr/bin/python3
+"""Module index
+
+This Module contains a definition for AttributeIndex Class
+"""
+
+
+class AttributeIndex:
+    """AttributeIndex Class
+
+    Maps the values of one attribute to the keys of the objects holding
+    them. Every item of a list, tuple or set value is indexed on its own,
+    so Place.amenity_ids can be searched by amenity id. Unhashable values
+    are not indexed.
+
+    Attributes:
+        name (str): name of the indexed attribute
+    """
+
+    def __init__(self, name):
+        """__init__ method & instantiation of class AttributeIndex
+
+        Args:
+            name (str): name of the indexed attribute
+        """
+        self.name = name
+        self.__keys = {}
+        self.__values = {}
+
+    @staticmethod
+    def __hashable(value):
+        """returns the indexable items of value"""
+        items = value if isinstance(value, (list, tuple, set)) else [value]
+        result = []
+        for item in items:
+            try:
+                hash(item)
+            except TypeError:
+                continue
+            result.append(item)
+        return result
+
+    @staticmethod
+    def matches(attr_value, value):
+        """returns True if an index on attr_value would map value to it
+
+        Args:
+            attr_value: value of the attribute of an object
+            value: value looked for
+        """
+        if isinstance(attr_value, (list, tuple, set)):
+            return value in attr_value
+        return attr_value == value
+
+    def add(self, key, value):
+        """Index the key of an object under its attribute value
+
+        Args:
+            key (str): <obj_class_name>.id of the object
+            value: value of the indexed attribute
+        """
+        self.remove(key)
+        items = self.__hashable(value)
+        for item in items:
+            self.__keys.setdefault(item, set()).add(key)
+        self.__values[key] = items
+
+    def remove(self, key):
+        """Remove the key of an object from the index
+
+        Args:
+            key (str): <obj_class_name>.id of the object
+        """
+        for item in self.__values.pop(key, []):
+            keys = self.__keys[item]
+            keys.discard(key)
+            if len(keys) == 0:
+                del self.__keys[item]
+
+    def get(self, value):
+        """returns the set of keys of the objects holding value
+
+        Args:
+            value: value of the indexed attribute
+        """
+        try:
+            return set(self.__keys.get(value, ()))
+        except TypeError:
+            return set()
+
+    def __len__(self):
+        """returns the number of indexed keys"""
+        return len(self.__values)
@@ -0,0 +1,149 @@
+#!/usr/bin/python3
+"""Module journal
+
+This Module contains a definition for Journal Class
+"""
+
+import json
+import os
+
+from models.engine.durability import SyncPolicy
+
+
+class Journal:
+    """Journal Class
+
+    An append-only log of storage changes. Every record is one JSON line
+    of the form {"op": "put", "key": <key>, "obj": <dict>} or
+    {"op": "del", "key": <key>}, so a save only costs the changed objects.
+    Records are built by put and delete from already encoded objects.
+    Records appended as a group are written as one
+    {"op": "group", "records": [...]} line, which is replayed whole or,
+    if a crash left it incomplete, not at all.
+
+    A line left incomplete by a crash is skipped when the log is read, and
+    the next append starts on a new line so that its records are not
+    written onto the torn one.
+
+    Attributes:
+        path (str): path to the log file
+        records (int): number of records appended since the last truncate
+        sync (SyncPolicy): when appends and rewrites are synced to disk
+    """
+
+    def __init__(self, path, sync=None):
+        """__init__ method & instantiation of class Journal
+
+        Args:
+            path (str): path to the log file
+            sync (SyncPolicy): when appends and rewrites are synced to
+                disk, never if None
+        """
+        self.path = path
+        self.records = 0
+        self.sync = sync if sync is not None else SyncPolicy()
+
+    def exists(self):
+        """returns True if the log file exists and is not empty"""
+        return os.path.isfile(self.path) and os.path.getsize(self.path) > 0
+
+    def size(self):
+        """returns the size of the log file in bytes"""
+        return os.path.getsize(self.path) if os.path.isfile(self.path) else 0
+
+    @staticmethod
+    def put(key, fragment):
+        """returns the record storing an object
+
+        Args:
+            key (str): <obj_class_name>.id of the object
+            fragment (str): JSON encoding of the object dictionary
+        """
+        return f'{{"op": "put", "key": {json.dumps(key)}, "obj": {fragment}}}'
+
+    @staticmethod
+    def delete(key):
+        """returns the record removing an object
+
+        Args:
+            key (str): <obj_class_name>.id of the object
+        """
+        return f'{{"op": "del", "key": {json.dumps(key)}}}'
+
+    def append(self, records, group=False):
+        """Append records to the log file.
+
+        Args:
+            records (list): list of records built by put or delete
+            group (bool): write the records as one group record
+        """
+        if len(records) == 0:
+            return
+        lines = records
+        if group and len(records) > 1:
+            lines = ['{"op": "group", "records": [' + ", ".join(records)
+                     + ']}']
+        data = "".join(rec + "\n" for rec in lines).encode("utf-8")
+        with open(self.path, 'a+b') as f:
+            size = f.seek(0, os.SEEK_END)
+            if size > 0:
+                f.seek(size - 1)
+                if f.read(1) != b"\n":
+                    data = b"\n" + data
+            f.write(data)
+            self.sync.appended(f, self.path)
+        self.records += len(records)
+
+    def __iter__(self):
+        """yields the (key, dict) records of the log file in order, with
+        None instead of a dict for deletions
+
+        Lines left incomplete by a crash are skipped.
+        """
+        self.records = 0
+        yield from self.tail(0)
+
+    def tail(self, offset):
+        """yields the (key, dict) records of the log file appended after its
+        first offset bytes, like __iter__
+
+        Args:
+            offset (int): size of the log file already read
+        """
+        if not self.exists():
+            return
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue
+                for rec in rec.get("records", [rec]):
+                    self.records += 1
+                    yield rec["key"], rec.get("obj", None)
+
+    def discard(self, offset):
+        """Drop the first offset bytes of the log file, which a snapshot now
+        holds, keeping the records appended after them.
+
+        Args:
+            offset (int): size of the log when the snapshot was taken
+        """
+        if not os.path.isfile(self.path):
+            self.records = 0
+            return
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            tail = f.read()
+        if len(tail) == 0:
+            self.truncate()
+            return
+        self.sync.replace(self.path, lambda f: f.write(tail))
+        self.records = tail.count(b"\n")
+
+    def truncate(self):
+        """Remove the log file once its records are part of a snapshot"""
+        if os.path.isfile(self.path):
+            os.remove(self.path)
+        self.records = 0
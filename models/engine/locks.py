@@ -0,0 +1,138 @@
+#!/usr/bin/python3
+"""Module locks
+
+This Module contains a definition for RWLock Class
+"""
+
+import threading
+from contextlib import contextmanager
+from functools import wraps
+
+
+class RWLock:
+    """RWLock Class
+
+    A reader/writer lock: any number of threads can hold it for reading
+    at once, and one thread at a time for writing, without readers. A
+    waiting writer keeps new readers out so that it is not starved.
+
+    Both modes are reentrant: a thread holding the lock for reading can
+    read again even while a writer waits, and a thread holding it for
+    writing can read or write again. A reader cannot upgrade to writing,
+    which would deadlock with another upgrading reader.
+    """
+
+    def __init__(self):
+        """__init__ method & instantiation of class RWLock"""
+        self.__cond = threading.Condition(threading.Lock())
+        self.__readers = {}
+        self.__writer = None
+        self.__depth = 0
+        self.__waiting = 0
+
+    def acquire_read(self):
+        """Acquire the lock for reading, waiting for writers to release it
+        """
+        me = threading.get_ident()
+        with self.__cond:
+            if self.__writer != me and me not in self.__readers:
+                while self.__writer is not None or self.__waiting > 0:
+                    self.__cond.wait()
+            self.__readers[me] = self.__readers.get(me, 0) + 1
+
+    def release_read(self):
+        """Release the lock acquired for reading"""
+        me = threading.get_ident()
+        with self.__cond:
+            self.__readers[me] -= 1
+            if self.__readers[me] == 0:
+                del self.__readers[me]
+                if len(self.__readers) == 0:
+                    self.__cond.notify_all()
+
+    def acquire_write(self):
+        """Acquire the lock for writing, waiting for readers and writers to
+        release it
+
+        Raises:
+            RuntimeError: if the thread holds the lock for reading only
+        """
+        me = threading.get_ident()
+        with self.__cond:
+            if self.__writer != me:
+                if me in self.__readers:
+                    raise RuntimeError("cannot upgrade a read lock")
+                self.__waiting += 1
+                try:
+                    while self.__writer is not None or self.__readers:
+                        self.__cond.wait()
+                finally:
+                    self.__waiting -= 1
+                self.__writer = me
+            self.__depth += 1
+
+    def release_write(self):
+        """Release the lock acquired for writing"""
+        with self.__cond:
+            self.__depth -= 1
+            if self.__depth == 0:
+                self.__writer = None
+                self.__cond.notify_all()
+
+    @contextmanager
+    def read(self):
+        """Hold the lock for reading"""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self):
+        """Hold the lock for writing
+
+        Raises:
+            RuntimeError: if the thread holds the lock for reading only
+        """
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+def reads(method):
+    """Decorator running a method under the read lock of the lock attribute
+    of its object, unless it is None
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        """calls method holding the read lock"""
+        lock = self.lock
+        if lock is None:
+            return method(self, *args, **kwargs)
+        lock.acquire_read()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            lock.release_read()
+    return wrapper
+
+
+def writes(method):
+    """Decorator running a method under the write lock of the lock
+    attribute of its object, unless it is None
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        """calls method holding the write lock"""
+        lock = self.lock
+        if lock is None:
+            return method(self, *args, **kwargs)
+        lock.acquire_write()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            lock.release_write()
+    return wrapper
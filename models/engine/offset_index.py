@@ -0,0 +1,148 @@
+#!/usr/bin/python3
+"""Module offset_index
+
+This Module contains a definition for OffsetIndex Class
+"""
+
+import mmap
+import os
+import struct
+
+from models.engine.durability import temporary_file
+
+
+class OffsetIndex:
+    """OffsetIndex Class
+
+    A <data_path>.idx file mapping the key of every record of a snapshot
+    file to the byte offset and length of its encoding, so that a single
+    record can be read from the memory mapped snapshot without decoding
+    the others. Entries have a fixed width and are sorted by key, and a
+    key is found by binary search in the memory mapped index.
+
+    The header records the format of the snapshot, and its size and
+    modification time when the index was written; an index that does not
+    match its snapshot is rejected.
+
+    Attributes:
+        path (str): path to the index file
+        data_path (str): path to the snapshot file
+    """
+
+    MAGIC = b"HBNBIDX1"
+    HEADER = struct.Struct("<8s16sIQQQ")
+    OFFSET = struct.Struct("<QI")
+
+    def __init__(self, data_path, format_name):
+        """__init__ method & instantiation of class OffsetIndex
+
+        Args:
+            data_path (str): path to the snapshot file
+            format_name (str): name of the format of the snapshot
+
+        Raises:
+            ValueError: if the index is missing, invalid or out of date
+        """
+        self.data_path = data_path
+        self.path = f"{data_path}.idx"
+        try:
+            with open(self.path, 'rb') as f:
+                header = f.read(self.HEADER.size)
+                if len(header) < self.HEADER.size:
+                    raise ValueError(f"invalid index {self.path}")
+                (magic, name, self.__width, self.__count,
+                 size, mtime) = self.HEADER.unpack(header)
+                stat = os.stat(data_path)
+                if (magic != self.MAGIC
+                        or name.rstrip(b"\0").decode() != format_name
+                        or (size, mtime) != (stat.st_size, stat.st_mtime_ns)):
+                    raise ValueError(f"{self.path} does not match "
+                                     f"{data_path}")
+                self.__index = mmap.mmap(f.fileno(), 0,
+                                         access=mmap.ACCESS_READ)
+            with open(data_path, 'rb') as f:
+                self.__data = mmap.mmap(f.fileno(), 0,
+                                        access=mmap.ACCESS_READ)
+        except OSError as e:
+            raise ValueError(f"cannot open index {self.path}: {e}")
+        self.__entry = self.__width + self.OFFSET.size
+
+    @classmethod
+    def write(cls, data_path, format_name, offsets):
+        """Atomically write the index of a snapshot file
+
+        Args:
+            data_path (str): path to the snapshot file, already written
+            format_name (str): name of the format of the snapshot
+            offsets (list): (key, offset, length) tuple of every record
+        """
+        entries = sorted((key.encode("utf-8"), offset, length)
+                         for key, offset, length in offsets)
+        width = max((len(key) for key, _, _ in entries), default=0)
+        stat = os.stat(data_path)
+        fd, tmp = temporary_file(f"{data_path}.idx")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(cls.HEADER.pack(
+                    cls.MAGIC, format_name.encode(), width, len(entries),
+                    stat.st_size, stat.st_mtime_ns))
+                for key, offset, length in entries:
+                    f.write(key.ljust(width, b"\0"))
+                    f.write(cls.OFFSET.pack(offset, length))
+            os.replace(tmp, f"{data_path}.idx")
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+    def __len__(self):
+        """returns the number of indexed records"""
+        return self.__count
+
+    def __key(self, i):
+        """returns the key of the entry i"""
+        start = self.HEADER.size + i * self.__entry
+        return self.__index[start:start + self.__width].rstrip(b"\0")
+
+    def keys(self):
+        """yields the key of every record, in sorted order"""
+        for i in range(self.__count):
+            yield self.__key(i).decode("utf-8")
+
+    def find(self, key):
+        """returns the (offset, length) of the record of key, or None
+
+        Args:
+            key (str): <class_name>.id key of the record
+        """
+        key = key.encode("utf-8")
+        low, high = 0, self.__count
+        while low < high:
+            middle = (low + high) // 2
+            if self.__key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low == self.__count or self.__key(low) != key:
+            return None
+        start = self.HEADER.size + low * self.__entry + self.__width
+        return self.OFFSET.unpack_from(self.__index, start)
+
+    def fragment(self, key):
+        """returns the encoded record of key as it is in the snapshot
+
+        Args:
+            key (str): <class_name>.id key of the record
+
+        Raises:
+            KeyError: if key is not indexed
+        """
+        found = self.find(key)
+        if found is None:
+            raise KeyError(key)
+        offset, length = found
+        return self.__data[offset:offset + length]
+
+    def close(self):
+        """Unmap the index and the snapshot"""
+        self.__index.close()
+        self.__data.close()
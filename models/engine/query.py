@@ -0,0 +1,177 @@
+#!/usr/bin/python3
+"""Module query
+
+This Module contains a definition for Condition Class and the paginate
+and cast_value functions shared by the storage engines, the console and
+the API
+"""
+
+import heapq
+import operator
+import re
+
+from models.engine.index import AttributeIndex
+
+
+class Condition:
+    """Condition Class
+
+    A comparison of an object attribute with a value, such as
+    price_by_night < 100. An equality on a list attribute holds when the
+    list contains the value, like an AttributeIndex lookup.
+
+    Attributes:
+        name (str): name of the compared attribute
+        op (str): one of ==, !=, <, <=, > and >=
+        value: value the attribute is compared with
+    """
+
+    OPERATORS = {
+        "==": operator.eq,
+        "!=": operator.ne,
+        "<": operator.lt,
+        "<=": operator.le,
+        ">": operator.gt,
+        ">=": operator.ge,
+    }
+    PATTERN = re.compile(
+        r'(\w+)\s*(==|!=|<=|>=|<|>|=)\s*("[^"]*"|\'[^\']*\'|[^,\s]+)')
+
+    def __init__(self, name, op, value):
+        """__init__ method & instantiation of class Condition
+
+        Args:
+            name (str): name of the compared attribute
+            op (str): comparison operator, = is read as ==
+            value: value the attribute is compared with
+        """
+        op = "==" if op == "=" else op
+        if op not in self.OPERATORS:
+            raise ValueError(f"unknown operator {op}")
+        self.name = name
+        self.op = op
+        self.value = value
+
+    @classmethod
+    def parse(cls, text):
+        """returns the list of conditions written in text
+
+        Conditions are separated by commas or spaces, as in
+        'price_by_night<100, max_guest>=4'. Quoted values are strings,
+        other values are read as int or float when possible.
+
+        Args:
+            text (str): the conditions to parse
+        """
+        conditions = []
+        end = 0
+        for match in cls.PATTERN.finditer(text):
+            if text[end:match.start()].strip(", ") != "":
+                raise ValueError(f"invalid condition {text[end:]}")
+            name, op, value = match.groups()
+            conditions.append(cls(name, op, cls.parse_value(value)))
+            end = match.end()
+        if text[end:].strip(", ") != "":
+            raise ValueError(f"invalid condition {text[end:]}")
+        return conditions
+
+    @staticmethod
+    def parse_value(text):
+        """returns text as a str, int or float value
+
+        Args:
+            text (str): quoted string or number
+        """
+        if len(text) > 1 and text[0] == text[-1] and text[0] in "\"'":
+            return text[1:-1]
+        for value_type in [int, float]:
+            try:
+                return value_type(text)
+            except ValueError:
+                pass
+        return text
+
+    def __call__(self, obj):
+        """returns True if obj satisfies the condition
+
+        Attributes that cannot be compared with the value do not satisfy it.
+
+        Args:
+            obj (BaseModel): the tested object
+        """
+        attr_value = getattr(obj, self.name, None)
+        if self.op == "==":
+            return AttributeIndex.matches(attr_value, self.value)
+        if self.op == "!=":
+            return not AttributeIndex.matches(attr_value, self.value)
+        try:
+            return self.OPERATORS[self.op](attr_value, self.value)
+        except TypeError:
+            return False
+
+    def __repr__(self):
+        """returns the condition as it is written"""
+        return f"{self.name}{self.op}{self.value!r}"
+
+
+def paginate(result, order_by=None, reverse=False, limit=None, offset=0):
+    """returns a sorted slice of a list of objects
+
+    A limited sorted slice uses a heap instead of sorting every object.
+    Numbers are sorted before the values of every other type, which are
+    grouped by type name. Objects missing the attribute, or where it is
+    None, come last in either order.
+
+    Args:
+        result (list): the objects
+        order_by (str): name of the attribute to sort on, unsorted if None
+        reverse (bool): sort in descending order
+        limit (int): maximum number of objects to return
+        offset (int): number of objects to skip
+
+    Raises:
+        ValueError: if values of the attribute cannot be compared, such as
+            two dictionaries
+    """
+    end = None if limit is None else offset + limit
+    if order_by is not None:
+        def sort_key(obj):
+            """returns the (type, value) pair objects are sorted on"""
+            value = getattr(obj, order_by)
+            if isinstance(value, (int, float)):
+                return ("", value)
+            return (type(value).__name__, value)
+        missing = [obj for obj in result
+                   if getattr(obj, order_by, None) is None]
+        if len(missing) > 0:
+            result = [obj for obj in result
+                      if getattr(obj, order_by, None) is not None]
+        try:
+            if end is not None and end < len(result):
+                select = heapq.nlargest if reverse else heapq.nsmallest
+                result = select(end, result, key=sort_key)
+            else:
+                result = sorted(result, key=sort_key, reverse=reverse)
+        except TypeError:
+            raise ValueError(f"cannot sort on {order_by}")
+        result.extend(missing)
+    return result[offset:end]
+
+
+def cast_value(obj, attr_name, attr_val):
+    """returns a string attribute value converted to the int or float type
+    of the attribute of obj, if it has one
+
+    Args:
+        obj (BaseModel): the object the value is set on
+        attr_name (str): name of the attribute
+        attr_val: the value, unchanged if it is not a str
+    """
+    if isinstance(attr_val, str) and hasattr(obj, attr_name):
+        attr_type = type(getattr(obj, attr_name))
+        if attr_type in [int, float]:
+            try:
+                attr_val = attr_type(attr_val)
+            except ValueError:
+                pass
+    return attr_val
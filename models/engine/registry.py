@@ -0,0 +1,61 @@
+#!/usr/bin/python3
+"""Module registry
+
+This Module contains the registry mapping model class names to classes.
+Subclasses of BaseModel register themselves when they are defined and the
+modules of the models package are imported once, the first time a name
+is not found.
+"""
+
+import importlib
+import pkgutil
+
+_classes = {}
+_discovered = False
+
+
+def register(cls):
+    """Register a model class under its name
+
+    Args:
+        cls (type): the model class
+
+    Returns:
+        type: cls
+    """
+    _classes[cls.__name__] = cls
+    return cls
+
+
+def discover():
+    """Import every module of the models package, once"""
+    global _discovered
+    if _discovered:
+        return
+    _discovered = True
+    import models
+    for module in pkgutil.iter_modules(models.__path__):
+        if not module.ispkg:
+            importlib.import_module(f"models.{module.name}")
+
+
+def get_class(name):
+    """returns the model class registered under name
+
+    Args:
+        name (str): name of the class
+
+    Raises:
+        KeyError: if no model class has that name
+    """
+    cls = _classes.get(name, None)
+    if cls is None:
+        discover()
+        cls = _classes[name]
+    return cls
+
+
+def classes():
+    """returns a dictionary of every model class by name"""
+    discover()
+    return dict(_classes)
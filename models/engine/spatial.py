@@ -0,0 +1,172 @@
+#!/usr/bin/python3
+"""Module spatial
+
+This Module contains a definition for GridIndex Class and the distance,
+bounding_box, split_box and point functions shared by the storage engines
+"""
+
+import math
+
+EARTH_RADIUS = 6371.0088
+
+
+def distance(lat1, lon1, lat2, lon2):
+    """returns the great circle distance in kilometers between two points
+    given in degrees
+    """
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    h = (math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2)
+         * math.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS * math.asin(min(1.0, math.sqrt(h)))
+
+
+def bounding_box(latitude, longitude, km):
+    """returns the (south, west, north, east) box holding every point within
+    km kilometers of a point
+
+    west is greater than east when the box crosses the antimeridian.
+    """
+    delta = math.degrees(km / EARTH_RADIUS)
+    south, north = max(-90.0, latitude - delta), min(90.0, latitude + delta)
+    if south == -90.0 or north == 90.0:
+        return south, -180.0, north, 180.0
+    ratio = math.sin(km / EARTH_RADIUS) / math.cos(math.radians(latitude))
+    if ratio >= 1.0 or km >= math.pi * EARTH_RADIUS / 2:
+        return south, -180.0, north, 180.0
+    spread = math.degrees(math.asin(ratio))
+    west = (longitude - spread + 180.0) % 360.0 - 180.0
+    east = (longitude + spread + 180.0) % 360.0 - 180.0
+    return south, west, north, east
+
+
+def split_box(south, west, north, east):
+    """returns the boxes, without any crossing the antimeridian, covering
+    a (south, west, north, east) box
+    """
+    if west <= east:
+        return [(south, west, north, east)]
+    return [(south, west, north, 180.0), (south, -180.0, north, east)]
+
+
+def point(latitude, longitude):
+    """returns (latitude, longitude) as floats, or None if they are not
+    valid coordinates
+    """
+    for value in (latitude, longitude):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return None
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        return None
+    return float(latitude), float(longitude)
+
+
+class GridIndex:
+    """GridIndex Class
+
+    Maps the cells of a grid of latitude and longitude to the keys of the
+    objects located in them, so that bounding box and radius searches only
+    check the objects of the cells they overlap. Objects whose
+    coordinates are not numbers in range are not indexed.
+
+    Attributes:
+        cell (float): size of the cells in degrees
+    """
+
+    def __init__(self, cell=0.1):
+        """__init__ method & instantiation of class GridIndex
+
+        Args:
+            cell (float): size of the cells in degrees
+        """
+        self.cell = cell
+        self.__cells = {}
+        self.__points = {}
+
+    def __cell(self, latitude, longitude):
+        """returns the cell of a point"""
+        return (math.floor(latitude / self.cell),
+                math.floor(longitude / self.cell))
+
+    def add(self, key, latitude, longitude):
+        """Index the key of an object under its coordinates
+
+        Args:
+            key (str): <obj_class_name>.id of the object
+            latitude: latitude of the object in degrees
+            longitude: longitude of the object in degrees
+        """
+        self.remove(key)
+        location = point(latitude, longitude)
+        if location is None:
+            return
+        self.__cells.setdefault(self.__cell(*location), set()).add(key)
+        self.__points[key] = location
+
+    def remove(self, key):
+        """Remove the key of an object from the index
+
+        Args:
+            key (str): <obj_class_name>.id of the object
+        """
+        location = self.__points.pop(key, None)
+        if location is None:
+            return
+        cell = self.__cell(*location)
+        keys = self.__cells[cell]
+        keys.discard(key)
+        if len(keys) == 0:
+            del self.__cells[cell]
+
+    def __len__(self):
+        """returns the number of indexed keys"""
+        return len(self.__points)
+
+    def __candidates(self, south, west, north, east):
+        """returns the keys of the cells overlapping a box that does not
+        cross the antimeridian
+        """
+        low_i, low_j = self.__cell(south, west)
+        high_i, high_j = self.__cell(north, east)
+        if (high_i - low_i + 1) * (high_j - low_j + 1) > len(self.__cells):
+            return [key for (i, j), keys in self.__cells.items()
+                    if low_i <= i <= high_i and low_j <= j <= high_j
+                    for key in keys]
+        return [key for i in range(low_i, high_i + 1)
+                for j in range(low_j, high_j + 1)
+                for key in self.__cells.get((i, j), ())]
+
+    def within(self, south, west, north, east):
+        """returns the keys of the objects inside a box, which crosses the
+        antimeridian when west is greater than east
+
+        Args:
+            south (float): minimum latitude
+            west (float): western longitude
+            north (float): maximum latitude
+            east (float): eastern longitude
+        """
+        result = []
+        for box in split_box(south, west, north, east):
+            s, w, n, e = box
+            for key in self.__candidates(*box):
+                lat, lon = self.__points[key]
+                if s <= lat <= n and w <= lon <= e:
+                    result.append(key)
+        return result
+
+    def near(self, latitude, longitude, km):
+        """returns the (distance, key) pairs of the objects within km
+        kilometers of a point, nearest first
+
+        Args:
+            latitude (float): latitude of the point in degrees
+            longitude (float): longitude of the point in degrees
+            km (float): radius in kilometers
+        """
+        result = []
+        for key in self.within(*bounding_box(latitude, longitude, km)):
+            d = distance(latitude, longitude, *self.__points[key])
+            if d <= km:
+                result.append((d, key))
+        result.sort()
+        return result
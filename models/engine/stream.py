@@ -0,0 +1,177 @@
+#!/usr/bin/python3
+"""Module stream
+
+This Module contains a definition for RecordReader and ProgressFile
+Classes
+"""
+
+import codecs
+import io
+import json
+import re
+
+
+class RecordReader:
+    """RecordReader Class
+
+    Iterates over the <key>: <value> members of a file holding one JSON
+    object, reading it chunk by chunk, so that only one member is decoded
+    and held in memory at a time.
+
+    Attributes:
+        file (file): the JSON file, open for reading in binary mode
+        chunk_size (int): number of bytes read at a time
+    """
+
+    WHITESPACE = " \t\n\r"
+    KEY = re.compile(r'[ \t\n\r]*"((?:[^"\\]|\\.)*)"[ \t\n\r]*:[ \t\n\r]*')
+    NEXT = re.compile(r'[ \t\n\r]*([,}])')
+    MAX_KEY = 4096
+
+    def __init__(self, file, chunk_size=1 << 16):
+        """__init__ method & instantiation of class RecordReader
+
+        Args:
+            file (file): the JSON file, open for reading in binary mode
+            chunk_size (int): number of bytes read at a time
+        """
+        self.file = file
+        self.chunk_size = chunk_size
+        self.__decoder = json.JSONDecoder()
+
+    def __iter__(self):
+        """yields the (key, value) members of the JSON object in order"""
+        self.__text = codecs.getincrementaldecoder("utf-8")()
+        self.__buf = ""
+        self.__eof = False
+        pos = self.__expect(0, "{")
+        pos = self.__skip(pos)
+        if self.__buf[pos:pos + 1] == "}":
+            return
+        while True:
+            match = self.__match(self.KEY, pos, '"<key>":')
+            key = match.group(1)
+            if "\\" in key:
+                key = json.loads(f'"{key}"')
+            value, pos = self.__decode(match.end())
+            yield key, value
+            match = self.__match(self.NEXT, pos, "',' or '}'")
+            if match.group(1) == "}":
+                return
+            pos = match.end()
+            if pos > self.chunk_size:
+                self.__buf = self.__buf[pos:]
+                pos = 0
+
+    def __fill(self):
+        """Append the next chunk of the file to the buffer
+
+        Returns:
+            bool: False once the whole file was read
+        """
+        if self.__eof:
+            return False
+        chunk = self.file.read(self.chunk_size)
+        self.__eof = len(chunk) == 0
+        self.__buf += self.__text.decode(chunk, final=self.__eof)
+        return not self.__eof
+
+    def __skip(self, pos):
+        """returns the position of the next non whitespace character"""
+        while True:
+            while pos < len(self.__buf) and self.__buf[pos] in self.WHITESPACE:
+                pos += 1
+            if pos < len(self.__buf) or not self.__fill():
+                return pos
+
+    def __expect(self, pos, char):
+        """returns the position after char, the next non whitespace
+        character
+
+        Raises:
+            ValueError: if the next character is not char
+        """
+        pos = self.__skip(pos)
+        if self.__buf[pos:pos + 1] != char:
+            raise ValueError(f"Expecting '{char}' in the JSON object at "
+                             f"character {pos} of the current chunk")
+        return pos + 1
+
+    def __match(self, pattern, pos, expected):
+        """returns the match of pattern at pos, reading more chunks until it
+        is complete
+
+        Raises:
+            ValueError: if pattern does not match
+        """
+        while True:
+            match = pattern.match(self.__buf, pos)
+            if match is not None and match.end() < len(self.__buf):
+                return match
+            if ((match is None and len(self.__buf) - pos > self.MAX_KEY)
+                    or not self.__fill()):
+                break
+        if match is None:
+            raise ValueError(f"Expecting {expected} in the JSON object at "
+                             f"character {pos} of the current chunk")
+        return match
+
+    def __decode(self, pos):
+        """returns the JSON value starting at pos and the position after it,
+        reading more chunks until it is complete
+        """
+        while True:
+            try:
+                value, end = self.__decoder.raw_decode(self.__buf, pos)
+            except ValueError:
+                if not self.__fill():
+                    raise
+                continue
+            if end < len(self.__buf) or not self.__fill():
+                return value, end
+
+
+class ProgressFile(io.RawIOBase):
+    """ProgressFile Class
+
+    A read only file reporting how much of another file was read.
+
+    Attributes:
+        file (file): the file being read, in binary mode
+        total (int): size of the file in bytes
+        progress (callable): called with the number of bytes read and total
+            after every read
+    """
+
+    def __init__(self, file, total, progress, start=0):
+        """__init__ method & instantiation of class ProgressFile
+
+        Args:
+            file (file): the file being read, in binary mode
+            total (int): size of the file in bytes
+            progress (callable): progress(bytes_read, total_bytes)
+            start (int): number of bytes read before this file, when total
+                covers several files
+        """
+        super().__init__()
+        self.file = file
+        self.total = total
+        self.progress = progress
+        self.__read = start
+
+    def readable(self):
+        """returns True, the file can be read"""
+        return True
+
+    def readinto(self, buffer):
+        """Read bytes of the file into buffer
+
+        Returns:
+            int: the number of bytes read
+        """
+        data = self.file.read(len(buffer))
+        buffer[:len(data)] = data
+        if len(data) > 0:
+            self.__read += len(data)
+            self.progress(self.__read, self.total)
+        return len(data)
@@ -4,6 +4,7 @@
 This Module contains a definition for Place Class
 """
 
+import models
 from models.base_model import BaseModel
 
 
@@ -24,6 +25,11 @@ class Place(BaseModel):
         amenity_ids (list): A list of Amenity ids.
     """
 
+    __indexes__ = ("city_id", "user_id", "amenity_ids")
+    __columns__ = ("city_id", "price_by_night", "max_guest", "number_rooms",
+                   "number_bathrooms", "latitude", "longitude")
+    __spatial__ = ("latitude", "longitude")
+
     city_id = ""
     user_id = ""
     name = ""
@@ -35,3 +41,30 @@ class Place(BaseModel):
     latitude = 0.0
     longitude = 0.0
     amenity_ids = []
+
+    @classmethod
+    def near(cls, latitude, longitude, km, limit=None):
+        """returns the list of places within km kilometers of a point,
+        nearest first
+
+        Args:
+            latitude (float): latitude of the point in degrees
+            longitude (float): longitude of the point in degrees
+            km (float): radius in kilometers
+            limit (int): maximum number of places to return
+        """
+        return models.storage.near(cls, latitude, longitude, km, limit)
+
+    @classmethod
+    def within(cls, south, west, north, east):
+        """returns the list of places inside a bounding box, which crosses
+        the antimeridian when west is greater than east
+
+        Args:
+            south (float): minimum latitude
+            west (float): western longitude
+            north (float): maximum latitude
+            east (float): eastern longitude
+        """
+        return list(models.storage.within(
+            cls, south, west, north, east).values())
@@ -16,6 +16,8 @@ class Review(BaseModel):
         text (str): The text of the review.
     """
 
+    __indexes__ = ("place_id", "user_id")
+
     place_id = ""
     user_id = ""
     text = ""
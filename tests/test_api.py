@@ -0,0 +1,268 @@
+#!/usr/bin/python3
+"""Module test_api
+
+This Module contains a tests for the HTTP API
+"""
+
+import inspect
+import json
+import os
+import threading
+import time
+import unittest
+from http.client import HTTPConnection
+from unittest.mock import patch
+
+import api
+import models
+import pycodestyle
+from models.engine.db_storage import DBStorage
+from models.engine.file_storage import FileStorage
+from models.place import Place
+
+
+class TestApiDocsAndStyle(unittest.TestCase):
+    """Tests the api module for documentation and style conformance"""
+
+    def test_pycodestyle(self):
+        """Tests compliance with pycodestyle"""
+        style = pycodestyle.StyleGuide(quiet=False)
+        result = style.check_files(["api.py", "tests/test_api.py"])
+        self.assertEqual(result.total_errors, 0)
+
+    def test_module_docstring(self):
+        """Tests whether the module is documented"""
+        self.assertTrue(len(api.__doc__) >= 1)
+
+    def test_classes_docstring(self):
+        """Tests whether the classes and their methods are documented"""
+        for cls in [api.ApiError, api.HBNBServer, api.HBNBRequestHandler]:
+            self.assertTrue(len(cls.__doc__) >= 1)
+            for func in vars(cls).values():
+                if inspect.isfunction(func):
+                    self.assertTrue(len(func.__doc__) >= 1)
+
+
+class TestApi(unittest.TestCase):
+    """Tests the HTTP API"""
+
+    @classmethod
+    def setUpClass(cls):
+        """starts the server on a free port"""
+        api.HBNBRequestHandler.log_message = lambda *args: None
+        cls.server = api.HBNBServer(("127.0.0.1", 0))
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        """stops the server and removes the file.json temporary file"""
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.thread.join()
+        del api.HBNBRequestHandler.log_message
+        if os.path.exists('file.json'):
+            os.remove('file.json')
+
+    def setUp(self):
+        """opens a connection to the server"""
+        self.conn = HTTPConnection(*self.server.server_address)
+
+    def tearDown(self):
+        """closes the connection"""
+        self.conn.close()
+
+    def request(self, method, path, body=None):
+        """returns the status, headers and JSON body of a response"""
+        self.conn.request(method, path, None if body is None
+                          else json.dumps(body))
+        response = self.conn.getresponse()
+        data = response.read()
+        return (response.status, response.headers,
+                json.loads(data) if data else None)
+
+    def test_crud_on_one_connection(self):
+        """create, show, update, count and destroy share a connection"""
+        status, _, created = self.request(
+            "POST", "/Place", {"name": "Loft", "max_guest": "4", "id": "x"})
+        self.assertEqual(status, 201)
+        self.assertNotEqual(created["id"], "x")
+        self.assertEqual(api.storage.get(Place, created["id"]).max_guest, 4)
+        sock = self.conn.sock
+
+        path = f"/Place/{created['id']}"
+        self.assertEqual(self.request("GET", path)[2], created)
+        status, _, updated = self.request("PUT", path, {"name": "Cabin"})
+        self.assertEqual((status, updated["name"]), (200, "Cabin"))
+        count = api.storage.count(Place)
+        self.assertEqual(self.request("GET", "/Place/count")[2],
+                         {"count": count})
+        self.assertEqual(self.request("DELETE", path)[0], 204)
+        self.assertEqual(self.request("GET", path)[:3:2],
+                         (404, {"error": "** no instance found **"}))
+        self.assertIs(self.conn.sock, sock)
+
+    def test_list_is_paginated_and_streamed(self):
+        """lists are filtered, sorted, sliced and sent in chunks"""
+        status, _, created = self.request(
+            "POST", "/Place/bulk",
+            [{"city_id": "paged", "price_by_night": i} for i in range(5)])
+        self.assertEqual(status, 201)
+        status, headers, result = self.request(
+            "GET", "/Place?where=city_id==paged&order_by=price_by_night"
+            "&reverse=1&limit=2&offset=1")
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["Transfer-Encoding"], "chunked")
+        self.assertEqual(headers["X-Total-Count"], "5")
+        self.assertEqual([obj["price_by_night"] for obj in result], [3, 2])
+        self.assertEqual(len(self.request("GET", "/")[2]),
+                         api.storage.count())
+
+        ids = [obj["id"] for obj in created]
+        status, _, updated = self.request(
+            "PUT", "/Place/bulk", {ids[0]: {"name": "A"}, ids[1]: {}})
+        self.assertEqual([obj.get("name", "") for obj in updated], ["A", ""])
+        self.assertEqual(self.request("DELETE", "/Place/bulk", ids)[0], 204)
+        self.assertEqual(self.request(
+            "GET", "/Place?where=city_id==paged")[1]["X-Total-Count"], "0")
+
+    def test_errors(self):
+        """invalid requests are answered with an error"""
+        self.assertEqual(self.request("GET", "/Nope")[:3:2],
+                         (404, {"error": "** class doesn't exist **"}))
+        self.assertEqual(self.request("POST", "/Place/bulk", {"a": 1})[0],
+                         400)
+        self.assertEqual(self.request("GET", "/Place?limit=x")[0], 400)
+        self.assertEqual(self.request("GET", "/Place?limit=-1")[2],
+                         {"error": "** invalid limit **"})
+        self.assertEqual(self.request("GET", "/Place?offset=-1")[0], 400)
+        self.assertEqual(self.request("GET", "/Place?where=none")[0], 400)
+        self.assertEqual(self.request("GET", "/Place?order_by=nope")[0], 200)
+        self.request("POST", "/Place/bulk",
+                     [{"rank": {"a": 1}}, {"rank": {"b": 2}}])
+        self.assertEqual(self.request("GET", "/Place?order_by=rank")[:3:2],
+                         (400, {"error": "** invalid order_by **"}))
+        count = api.storage.count(Place)
+        self.assertEqual(
+            self.request("POST", "/Place/bulk",
+                         [{"name": "ok"}, {"to_dict": 1}])[:3:2],
+            (400, {"error": "** invalid attribute to_dict **"}))
+        self.assertEqual(api.storage.count(Place), count)
+        status, _, created = self.request("POST", "/Place", {"name": "ok"})
+        path = f"/Place/{created['id']}"
+        self.assertEqual(self.request("PUT", path, {"_dirty": 1})[0], 400)
+        self.assertEqual(self.request("GET", path)[2], created)
+        self.assertEqual(self.request("POST", "/Place/count")[0], 405)
+        self.conn.request("POST", "/Place", "{not json")
+        response = self.conn.getresponse()
+        response.read()
+        self.assertEqual(response.status, 400)
+        self.assertEqual(self.request("GET", "/Place/count")[0], 200)
+        self.conn.putrequest("POST", "/Place")
+        self.conn.putheader("Content-Length", "-1")
+        self.conn.endheaders()
+        response = self.conn.getresponse()
+        self.assertEqual(json.loads(response.read()),
+                         {"error": "** invalid content length **"})
+        self.assertEqual(response.status, 400)
+
+    def test_slow_client_does_not_block_other_requests(self):
+        """a response is sent after releasing the locks"""
+        release = threading.Event()
+        send_list = api.HBNBRequestHandler.send_list
+
+        def slow_send_list(handler, total, dicts):
+            """waits before streaming the list"""
+            release.wait(2)
+            send_list(handler, total, dicts)
+
+        other = HTTPConnection(*self.server.server_address)
+        with patch.object(api.HBNBRequestHandler, "send_list",
+                          slow_send_list):
+            self.conn.request("GET", "/Place")
+            time.sleep(0.1)
+            start = time.monotonic()
+            other.request("POST", "/Place", json.dumps({}))
+            self.assertEqual(other.getresponse().status, 201)
+            self.assertLess(time.monotonic() - start, 1)
+            release.set()
+            self.assertEqual(self.conn.getresponse().status, 200)
+        other.close()
+
+
+class TestApiDBStorage(TestApi):
+    """Tests the HTTP API serving a DBStorage, whose connection is used by
+    the threads of the server
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """starts the server on a free port with a DBStorage"""
+        cls.db_path = "api_test.db"
+        db_storage = DBStorage(cls.db_path)
+        cls.patches = [patch.object(api, "storage", db_storage),
+                       patch.object(models, "storage", db_storage)]
+        for storage_patch in cls.patches:
+            storage_patch.start()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        """stops the server and removes the database"""
+        super().tearDownClass()
+        api.storage.close()
+        for storage_patch in cls.patches:
+            storage_patch.stop()
+        for suffix in ["", "-wal", "-shm"]:
+            if os.path.exists(cls.db_path + suffix):
+                os.remove(cls.db_path + suffix)
+
+
+class TestApiThreadSafeStorage(TestApi):
+    """Tests the HTTP API serving a thread-safe FileStorage, whose requests
+    run concurrently
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """starts the server on a free port with a thread-safe storage"""
+        cls.file_path = "api_test.json"
+        file_storage = FileStorage(cls.file_path, threadsafe=True)
+        cls.patches = [patch.object(api, "storage", file_storage),
+                       patch.object(models, "storage", file_storage)]
+        for storage_patch in cls.patches:
+            storage_patch.start()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        """stops the server and removes the file of the storage"""
+        super().tearDownClass()
+        for storage_patch in cls.patches:
+            storage_patch.stop()
+        if os.path.exists(cls.file_path):
+            os.remove(cls.file_path)
+
+    def test_writing_request_holds_the_write_lock(self):
+        """other threads cannot read while a PUT finds and updates objects
+        """
+        path = f"/Place/{self.request('POST', '/Place', {})[2]['id']}"
+        blocked = []
+
+        def bulk_update(changes):
+            """records whether a reader thread waits for the lock"""
+            reader = threading.Thread(target=lambda: api.storage.count())
+            reader.start()
+            reader.join(0.1)
+            blocked.append(reader.is_alive())
+            FileStorage.bulk_update(api.storage, changes)
+
+        with patch.object(api.storage, "bulk_update", bulk_update):
+            self.assertEqual(self.request("PUT", path, {"name": "A"})[0],
+                             200)
+        self.assertEqual(blocked, [True])
+        self.assertEqual(self.request("GET", path)[2]["name"], "A")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,6 +10,8 @@ from io import StringIO
 from unittest.mock import patch
 
 from console import HBNBCommand
+from models import storage
+from models.city import City
 
 
 class TestConsole(unittest.TestCase):
@@ -145,6 +147,53 @@ class TestConsole(unittest.TestCase):
             self.assertIn('name', output.getvalue())
             self.assertIn('example_state', output.getvalue())
 
+    def test_update_keeps_attribute_index_consistent(self):
+        """test update command moves the object in the attribute index"""
+        with patch('sys.stdout', new=StringIO()) as output:
+            self.cmd.onecmd('create City')
+            id = output.getvalue().strip('\n')
+            self.cmd.onecmd(f'update City {id} state_id st_1')
+            self.assertIn(f"City.{id}",
+                          storage.lookup(City, "state_id", "st_1"))
+            self.cmd.onecmd(f'City.update("{id}", {{"state_id": "st_2"}})')
+            self.assertNotIn(f"City.{id}",
+                             storage.lookup(City, "state_id", "st_1"))
+            self.assertIn(f"City.{id}",
+                          storage.lookup(City, "state_id", "st_2"))
+
+    def test_update_casts_numeric_attributes(self):
+        """test update command keeps the type of numeric attributes"""
+        with patch('sys.stdout', new=StringIO()) as output:
+            self.cmd.onecmd('create Place')
+            id = output.getvalue().strip('\n')
+            self.cmd.onecmd(f'update Place {id} max_guest 4')
+            self.cmd.onecmd(f'update Place {id} latitude 1.5')
+            place = storage.all()[f"Place.{id}"]
+            self.assertEqual(place.max_guest, 4)
+            self.assertEqual(place.latitude, 1.5)
+
+    def test_classname_where_filters_instances(self):
+        """tests the where command filters on conditions"""
+        with patch('sys.stdout', new=StringIO()) as output:
+            self.cmd.onecmd('create Place')
+            cheap = output.getvalue().strip('\n')
+            self.cmd.onecmd(f'update Place {cheap} price_by_night 50')
+            self.cmd.onecmd(f'update Place {cheap} max_guest 4')
+            self.cmd.onecmd('create Place')
+            expensive = output.getvalue().split('\n')[-2]
+            self.cmd.onecmd(f'update Place {expensive} price_by_night 500')
+
+        with patch('sys.stdout', new=StringIO()) as output:
+            self.cmd.onecmd('Place.where(price_by_night<100, max_guest>=4)')
+            self.assertIn(cheap, output.getvalue())
+            self.assertNotIn(expensive, output.getvalue())
+
+    def test_where_invalid_condition_error(self):
+        """tests the where command invalid condition error"""
+        with patch('sys.stdout', new=StringIO()) as output:
+            self.cmd.onecmd('where Place price_by_night')
+            self.assertEqual("** invalid condition **\n", output.getvalue())
+
     def test_classname_all_displays_instance_objects(self):
         """tests the all shows instance objects"""
         with patch('sys.stdout', new=StringIO()) as output:
@@ -204,3 +253,96 @@ class TestConsole(unittest.TestCase):
             self.assertIn('amne', output.getvalue())
             self.assertIn('rev_k', output.getvalue())
             self.assertIn('rev_v', output.getvalue())
+
+    def test_classname_near_and_within_find_places(self):
+        """tests the near and within commands"""
+        with patch('sys.stdout', new=StringIO()) as output:
+            self.cmd.onecmd('create Place')
+            near = output.getvalue().strip('\n')
+            self.cmd.onecmd(f'update Place {near} latitude 48.8566')
+            self.cmd.onecmd(f'update Place {near} longitude 2.3522')
+            self.cmd.onecmd('create Place')
+            far = output.getvalue().split('\n')[-2]
+            self.cmd.onecmd(f'update Place {far} latitude 51.5074')
+
+        with patch('sys.stdout', new=StringIO()) as output:
+            self.cmd.onecmd('Place.near(48.85, 2.35, 5)')
+            self.assertIn(near, output.getvalue())
+            self.assertNotIn(far, output.getvalue())
+        with patch('sys.stdout', new=StringIO()) as output:
+            self.cmd.onecmd('within Place 48 2 49 3')
+            self.assertIn(near, output.getvalue())
+            self.assertNotIn(far, output.getvalue())
+
+    def test_near_errors(self):
+        """tests the near command errors"""
+        with patch('sys.stdout', new=StringIO()) as output:
+            self.cmd.onecmd('near User 1 2 3')
+            self.cmd.onecmd('near Place 1 north 3')
+            self.assertEqual("** class has no coordinates **\n"
+                             "** invalid coordinates **\n", output.getvalue())
+
+    def test_classname_create_many_saves_instances(self):
+        """tests create_many creates and saves every instance"""
+        with patch('sys.stdout', new=StringIO()) as output:
+            self.cmd.onecmd('Place.create_many([{"name": "Loft", '
+                            '"max_guest": "4"}, {"name": "Cabin"}])')
+            ids = output.getvalue().split()
+        self.assertEqual(len(ids), 2)
+        self.assertEqual(storage.dirty(), {})
+        place = storage.all()[f"Place.{ids[0]}"]
+        self.assertEqual((place.name, place.max_guest), ("Loft", 4))
+
+    def test_update_many_and_destroy_many(self):
+        """tests update_many and destroy_many apply every change"""
+        with patch('sys.stdout', new=StringIO()) as output:
+            self.cmd.onecmd('create_many City [{}, {}]')
+            first, second = output.getvalue().split()
+            self.cmd.onecmd(f'City.update_many({{"{first}": {{"name": "A"}},'
+                            f' "{second}": {{"name": "B"}}}})')
+            self.assertEqual(storage.all()[f"City.{second}"].name, "B")
+            self.cmd.onecmd(f'destroy_many City ["{first}", "missing"]')
+            self.assertEqual(output.getvalue().split('\n')[-2],
+                             "** no instance found **")
+            self.assertIn(f"City.{first}", storage.all())
+            self.cmd.onecmd(f'City.destroy_many(["{first}", "{second}"])')
+            self.assertNotIn(f"City.{first}", storage.all())
+            self.assertNotIn(f"City.{second}", storage.all())
+            self.cmd.onecmd('create_many City {"name": "A"}')
+            self.assertEqual(output.getvalue().split('\n')[-2],
+                             "** invalid json **")
+
+    def test_many_commands_filter_attributes(self):
+        """tests create_many and update_many ignore read-only attributes
+        and reject private and method ones before changing storage
+        """
+        count = storage.count()
+        with patch('sys.stdout', new=StringIO()) as output:
+            self.cmd.onecmd('create_many Place [{"name": "a"}, '
+                            '{"__class__": "X"}, {"_x": 1}]')
+            self.assertEqual(output.getvalue(),
+                             "** invalid attribute _x **\n")
+        self.assertEqual(storage.count(), count)
+        with patch('sys.stdout', new=StringIO()) as output:
+            self.cmd.onecmd('create_many Place [{"id": "fixed"}]')
+            new_id = output.getvalue().strip()
+        self.assertNotEqual(new_id, "fixed")
+        self.assertEqual(storage.count(), count + 1)
+        self.assertNotIn("Place.fixed", storage.all())
+        with patch('sys.stdout', new=StringIO()) as output:
+            self.cmd.onecmd(f'update_many Place {{"{new_id}": '
+                            '{"to_dict": 1}}')
+            self.cmd.onecmd(f'update_many Place {{"{new_id}": '
+                            '{"id": "other", "name": "b"}}')
+            self.assertEqual(output.getvalue(),
+                             "** invalid attribute to_dict **\n")
+        place = storage.all()[f"Place.{new_id}"]
+        self.assertEqual((place.id, place.name), (new_id, "b"))
+
+    def test_quit_and_eof_flush_storage(self):
+        """tests quit and EOF write the changes storage still holds"""
+        for command in ["quit", "EOF"]:
+            with patch.object(storage, "flush") as flush:
+                with patch('sys.stdout', new=StringIO()):
+                    self.assertTrue(self.cmd.onecmd(command))
+                flush.assert_called_once_with()
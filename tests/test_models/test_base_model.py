@@ -14,6 +14,7 @@ from io import StringIO
 from uuid import UUID
 
 import pycodestyle
+import models
 from models import base_model
 from models.engine.file_storage import FileStorage
 
@@ -129,6 +130,16 @@ class TestBaseModel(unittest.TestCase):
         if os.path.exists(file_path):
             os.remove(file_path)
 
+    def test_setattr_marks_attribute_dirty(self):
+        """setting an attribute reports it to storage as changed"""
+        models.storage.save()
+        self.test_obj.name = "My_First_Model"
+        key = f"{self.test_obj.__class__.__name__}.{self.test_obj.id}"
+        self.assertEqual(models.storage.dirty()[key], {"name"})
+
+        if os.path.exists("file.json"):
+            os.remove("file.json")
+
     def test_to_dict_returns_a_dictionary_of_attributes(self):
         """to_dict should return a dictionary containing all key/value of
         self.__dict__
@@ -0,0 +1,140 @@
+#!/usr/bin/python3
+"""Module test_async_storage
+
+This Module contains a tests for AsyncFileStorage Class
+"""
+
+import asyncio
+import inspect
+import os
+import time
+import unittest
+from unittest.mock import patch
+
+import models
+import pycodestyle
+from models.engine import async_storage
+from models.engine.db_storage import DBStorage
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.user import User
+
+AsyncFileStorage = async_storage.AsyncFileStorage
+
+
+class TestAsyncFileStorageDocsAndStyle(unittest.TestCase):
+    """Tests AsyncFileStorage class for documentation and style conformance
+    """
+
+    def test_pycodestyle(self):
+        """Tests compliance with pycodestyle"""
+        style = pycodestyle.StyleGuide(quiet=False)
+        result = style.check_files(
+            [
+                "models/engine/async_storage.py",
+                "tests/test_models/test_engine/test_async_storage.py"
+            ])
+        self.assertEqual(result.total_errors, 0)
+
+    def test_module_docstring(self):
+        """Tests whether the module is documented"""
+        self.assertTrue(len(async_storage.__doc__) >= 1)
+
+    def test_class_docstring(self):
+        """Tests whether the class is documented"""
+        self.assertTrue(len(AsyncFileStorage.__doc__) >= 1)
+
+    def test_methods_docstring(self):
+        """Tests whether the class methods are documented"""
+        funcs = inspect.getmembers(AsyncFileStorage, inspect.isfunction)
+        for func in funcs:
+            self.assertTrue(len(func[1].__doc__) >= 1)
+
+
+class TestAsyncFileStorage(unittest.IsolatedAsyncioTestCase):
+    """Test cases for AsyncFileStorage Class"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.file_path = "async_test.json"
+
+    def tearDown(self):
+        """cleanup test files"""
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+    async def test_wraps_application_storage_by_default(self):
+        """the facade wraps models.storage, which is already reloaded"""
+        async with AsyncFileStorage() as storage:
+            self.assertIs(storage.storage, models.storage)
+            self.assertEqual(await storage.count(), models.storage.count())
+
+    async def test_wraps_db_storage(self):
+        """a DBStorage, which has no lock and nothing to flush, is used
+        from the writer thread
+        """
+        db_path = "async_test.db"
+        db_storage = DBStorage(db_path)
+        try:
+            with patch("models.storage", db_storage):
+                async with AsyncFileStorage(db_storage) as storage:
+                    await storage.bulk_insert([Place(name="loft")])
+                    self.assertEqual(await storage.count(Place), 1)
+        finally:
+            db_storage.close()
+            for suffix in ["", "-wal", "-shm"]:
+                if os.path.exists(db_path + suffix):
+                    os.remove(db_path + suffix)
+
+    async def test_writes_run_in_order(self):
+        """awaited changes are saved and read back"""
+        async with AsyncFileStorage(FileStorage(self.file_path,
+                                                threadsafe=True)) as storage:
+            user = User(first_name="Betty")
+            await storage.new(user)
+            await storage.save()
+            await storage.bulk_insert([Place(name="loft"), Place()])
+            self.assertIs(await storage.get(User, user.id), user)
+            self.assertEqual(await storage.count(Place), 2)
+            self.assertEqual(len(await storage.query(
+                Place, [("name", "==", "loft")])), 1)
+
+        other = AsyncFileStorage(FileStorage(self.file_path))
+        await other.reload()
+        self.assertEqual(set(await other.all()),
+                         set(storage.storage.all()))
+        await other.close()
+
+    async def test_save_does_not_block_the_loop(self):
+        """the loop runs other tasks while a slow save writes"""
+        file_storage = FileStorage(self.file_path)
+        write = file_storage._FileStorage__write_changes
+
+        def slow_write(group):
+            """writes the changes after a delay"""
+            time.sleep(0.2)
+            write(group)
+
+        ticks = 0
+
+        async def tick():
+            """counts the turns of the loop"""
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        storage = AsyncFileStorage(file_storage)
+        await storage.new(User())
+        ticker = asyncio.create_task(tick())
+        with patch.object(file_storage, "_FileStorage__write_changes",
+                          slow_write):
+            await storage.save()
+        ticker.cancel()
+        self.assertGreater(ticks, 5)
+        self.assertEqual(await storage.count(), 1)
+        await storage.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
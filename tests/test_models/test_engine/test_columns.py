@@ -0,0 +1,166 @@
+#!/usr/bin/python3
+"""Module test_columns
+
+This Module contains a tests for ColumnStore Class
+"""
+
+import inspect
+import math
+import os
+import unittest
+
+import pycodestyle
+from models.engine import columns
+from models.engine.file_storage import FileStorage
+from models.place import Place
+
+ColumnStore = columns.ColumnStore
+
+
+class TestColumnStoreDocsAndStyle(unittest.TestCase):
+    """Tests ColumnStore class for documentation and style conformance"""
+
+    def test_pycodestyle(self):
+        """Tests compliance with pycodestyle"""
+        style = pycodestyle.StyleGuide(quiet=False)
+        result = style.check_files(
+            [
+                "models/engine/columns.py",
+                "tests/test_models/test_engine/test_columns.py"
+            ])
+        self.assertEqual(result.total_errors, 0)
+
+    def test_module_docstring(self):
+        """Tests whether the module is documented"""
+        self.assertTrue(len(columns.__doc__) >= 1)
+
+    def test_class_docstring(self):
+        """Tests whether the class is documented"""
+        self.assertTrue(len(ColumnStore.__doc__) >= 1)
+
+    def test_methods_docstring(self):
+        """Tests whether the class methods are documented"""
+        funcs = inspect.getmembers(ColumnStore, inspect.isfunction)
+        for func in funcs:
+            self.assertTrue(len(func[1].__doc__) >= 1)
+
+
+class TestColumnStore(unittest.TestCase):
+    """Test cases for ColumnStore Class"""
+
+    def setUp(self):
+        """fills a store with a few places"""
+        self.store = ColumnStore.of(Place)
+        rows = [("a", "c1", 100, 2), ("b", "c1", 50, 4), ("c", "c2", 80, 1),
+                ("d", "c2", "free", 3), ("e", "c3", 300, 6)]
+        for key, city_id, price, guests in rows:
+            self.store.add(key, {"city_id": city_id, "price_by_night": price,
+                                 "max_guest": guests})
+
+    def test_columns_of_the_model_class(self):
+        """string attributes are categorical, the others numeric"""
+        self.assertEqual(self.store.categorical, ("city_id",))
+        self.assertIn("latitude", self.store.names)
+        self.assertIsNone(ColumnStore.of(object))
+        self.assertEqual(len(self.store), 5)
+        self.assertEqual(self.store.column("city_id"),
+                         ["c1", "c1", "c2", "c2", "c3"])
+        self.assertTrue(math.isnan(list(self.store.column("latitude"))[0]))
+
+    def test_filter(self):
+        """keys returns the rows satisfying every condition"""
+        self.assertEqual(self.store.keys([("price_by_night", "<=", 100)]),
+                         ["a", "b", "c"])
+        self.assertEqual(self.store.keys([("price_by_night", ">", 60),
+                                          ("city_id", "==", "c2")]), ["c"])
+        self.assertEqual(self.store.keys([("city_id", "==", "c9")]), [])
+        self.assertEqual(len(self.store.keys()), 5)
+        with self.assertRaises(ValueError):
+            self.store.keys([("city_id", "<", "c2")])
+        with self.assertRaises(KeyError):
+            self.store.keys([("color", "==", 1)])
+
+    def test_aggregate(self):
+        """aggregates skip NaN values and can be grouped"""
+        self.assertEqual(self.store.aggregate("price_by_night", "count"), 4)
+        self.assertEqual(self.store.aggregate("price_by_night", "max"), 300)
+        self.assertEqual(self.store.aggregate("price_by_night"), 132.5)
+        self.assertEqual(
+            self.store.aggregate("price_by_night", "min", by="city_id"),
+            {"c1": 50, "c2": 80, "c3": 300})
+        self.assertEqual(
+            self.store.aggregate("max_guest", "sum", by="city_id",
+                                 where=[("max_guest", ">", 1)]),
+            {"c1": 6, "c2": 3, "c3": 6})
+        self.assertIsNone(self.store.aggregate(
+            "price_by_night", where=[("price_by_night", ">", 1000)]))
+        with self.assertRaises(ValueError):
+            self.store.aggregate("price_by_night", "median")
+
+    def test_histogram(self):
+        """histogram counts the values in equal width bins"""
+        counts, edges = self.store.histogram("max_guest", 5, (1, 6))
+        self.assertEqual(counts, [1, 1, 1, 1, 1])
+        self.assertEqual(edges, [1, 2, 3, 4, 5, 6])
+        groups = self.store.histogram("max_guest", 5, by="city_id")
+        self.assertEqual(groups["c2"], ([1, 0, 1, 0, 0], edges))
+
+    def test_updates(self):
+        """rows can be changed and removed"""
+        self.store.set("d", "price_by_night", 10)
+        self.store.remove("a")
+        self.store.remove("a")
+        self.store.add("b", {"city_id": "c3", "price_by_night": 20})
+        self.assertEqual(sorted(self.store.keys()), ["b", "c", "d", "e"])
+        self.assertEqual(
+            self.store.aggregate("price_by_night", "sum", by="city_id"),
+            {"c2": 90, "c3": 320})
+
+
+class TestFileStorageColumns(unittest.TestCase):
+    """Test cases for the column stores of FileStorage"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.file_path = "columns_test.json"
+        self.storage = FileStorage(self.file_path)
+        self.places = [Place(city_id=f"c{i % 2}", price_by_night=i * 10)
+                       for i in range(6)]
+        for place in self.places:
+            self.storage.new(place)
+
+    def tearDown(self):
+        """cleanup test files"""
+        for path in [self.file_path, f"{self.file_path}.idx"]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_store_follows_the_objects(self):
+        """the store is updated by new, delete and attribute changes"""
+        store = self.storage.columns(Place)
+        self.assertEqual(store.aggregate("price_by_night", "max",
+                                         by="city_id"),
+                         {"c0": 40, "c1": 50})
+        self.storage.delete(self.places[5])
+        self.places[4].__dict__["price_by_night"] = 5
+        self.storage.mark_dirty(self.places[4], "price_by_night")
+        self.assertEqual(store.aggregate("price_by_night", "max",
+                                         by="city_id"),
+                         {"c0": 20, "c1": 30})
+        self.assertIsNone(self.storage.columns(type(self.storage)))
+
+    def test_reload(self):
+        """the store is rebuilt by reload, on first use when indexed"""
+        self.storage.save()
+        for kwargs in [{}, {"lazy": True}, {"indexed": True}]:
+            storage = FileStorage(self.file_path, **kwargs)
+            storage.reload()
+            store = storage.columns(Place)
+            self.assertEqual(store.aggregate("price_by_night", "sum"), 150)
+            self.assertEqual(sorted(store.keys([("city_id", "==", "c1")])),
+                             sorted(f"Place.{p.id}"
+                                    for p in self.places[1::2]))
+
+
+if __name__ == "__main__":
+    unittest.main()
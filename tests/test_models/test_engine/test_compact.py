@@ -0,0 +1,164 @@
+#!/usr/bin/python3
+"""Module test_compact
+
+This Module contains a tests for the compact model classes
+"""
+
+import inspect
+import json
+import os
+import pickle
+import tracemalloc
+import unittest
+import uuid
+from datetime import datetime
+from unittest.mock import patch
+
+import pycodestyle
+from models.engine import compact, registry
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.review import Review
+
+
+class TestCompactDocsAndStyle(unittest.TestCase):
+    """Tests the compact module for documentation and style conformance"""
+
+    def test_pycodestyle(self):
+        """Tests compliance with pycodestyle"""
+        style = pycodestyle.StyleGuide(quiet=False)
+        result = style.check_files(
+            [
+                "models/engine/compact.py",
+                "tests/test_models/test_engine/test_compact.py"
+            ])
+        self.assertEqual(result.total_errors, 0)
+
+    def test_module_docstring(self):
+        """Tests whether the module is documented"""
+        self.assertTrue(len(compact.__doc__) >= 1)
+
+    def test_functions_docstring(self):
+        """Tests whether the functions and methods are documented"""
+        for func in inspect.getmembers(compact, inspect.isfunction):
+            self.assertTrue(len(func[1].__doc__) >= 1)
+        for func in inspect.getmembers(compact.compact_class(Place),
+                                       inspect.isfunction):
+            self.assertTrue(len(func[1].__doc__) >= 1)
+
+
+class TestCompactClass(unittest.TestCase):
+    """Test cases for the compact model classes"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.record = {"id": str(uuid.uuid4()),
+                       "created_at": "2024-01-02T03:04:05.123456",
+                       "updated_at": "2024-02-03T04:05:06.654321",
+                       "city_id": str(uuid.uuid4()), "user_id": "u1",
+                       "name": "Loft", "max_guest": 4,
+                       "amenity_ids": ["a1"], "__class__": "Place"}
+        self.CompactPlace = compact.compact_class(Place)
+
+    def test_behaves_like_the_model_class(self):
+        """to_dict, __str__ and the defaults match the model class"""
+        place = Place(**self.record)
+        small = self.CompactPlace(**self.record)
+        self.assertIsInstance(small, Place)
+        self.assertEqual(self.CompactPlace.__name__, "Place")
+        self.assertEqual(small.to_dict(), place.to_dict())
+        self.assertEqual(str(small), str(place))
+        self.assertEqual(small.created_at, place.created_at)
+        self.assertEqual(small.description, "")
+        self.assertEqual(self.CompactPlace.amenity_ids, [])
+        self.assertIs(compact.compact_class(Place), self.CompactPlace)
+
+    def test_class_methods_are_kept(self):
+        """class methods of the model class are not turned into fields"""
+        self.assertNotIn("_near", self.CompactPlace.__slots__)
+        storage = FileStorage("compact_near_test.json")
+        small = self.CompactPlace(**dict(self.record, latitude=1.0,
+                                         longitude=1.0))
+        storage.new(small)
+        with patch("models.storage", storage):
+            self.assertEqual(self.CompactPlace.near(1, 1, 5), [small])
+            self.assertEqual(self.CompactPlace.within(0, 0, 2, 2), [small])
+
+    def test_values_are_packed(self):
+        """uuids and datetimes are stored as numbers"""
+        small = self.CompactPlace(**self.record)
+        self.assertEqual(small._id, uuid.UUID(self.record["id"]).int)
+        self.assertIsInstance(small._created_at, float)
+        self.assertEqual(small._user_id, "u1")
+
+    def test_update_semantics(self):
+        """any attribute can be set, and ints are kept as ints"""
+        small = self.CompactPlace(**self.record)
+        small.city_id = 5
+        small.number_rooms = 3
+        small.color = "blue"
+        small.updated_at = datetime(2024, 5, 6)
+        self.assertEqual(small.city_id, 5)
+        expected = dict(self.record, city_id=5, number_rooms=3,
+                        color="blue", updated_at="2024-05-06T00:00:00")
+        self.assertEqual(small.to_dict(), expected)
+        self.assertEqual(pickle.loads(pickle.dumps(small)).to_dict(),
+                         expected)
+
+    def test_uses_less_memory(self):
+        """compact instances of decoded records take less memory"""
+        records = json.dumps([dict(
+            self.record, id=str(uuid.uuid4()), city_id=str(uuid.uuid4()),
+            user_id=str(uuid.uuid4()), description="Nice loft",
+            number_rooms=3, number_bathrooms=1, price_by_night=120,
+            latitude=37.77, longitude=-122.41) for _ in range(2000)])
+
+        def measure(cls):
+            """returns the memory held by the objects of the records"""
+            tracemalloc.start()
+            objects = [cls(**r) for r in json.loads(records)]
+            size = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            return size, objects
+
+        self.assertLess(measure(self.CompactPlace)[0], measure(Place)[0])
+
+
+class TestUseCompact(unittest.TestCase):
+    """Test cases for registering the compact model classes"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.file_path = "compact_test.json"
+
+    def tearDown(self):
+        """restores the model classes and cleans up test files"""
+        registry.register(Place)
+        registry.register(Review)
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+    def test_storage_reloads_compact_objects(self):
+        """reload instantiates the registered compact classes"""
+        storage = FileStorage(self.file_path)
+        place = Place(city_id="c1")
+        review = Review(place_id=place.id)
+        for obj in [place, review]:
+            storage.new(obj)
+        storage.save()
+        CompactPlace, CompactReview = compact.use_compact("Place", "Review")
+        self.assertEqual(compact.use_compact("Place"), [CompactPlace])
+        self.assertIs(registry.get_class("Place"), CompactPlace)
+
+        storage = FileStorage(self.file_path)
+        storage.reload()
+        loaded = storage.get(Place, place.id)
+        self.assertIs(type(loaded), CompactPlace)
+        self.assertEqual(loaded.to_dict(), place.to_dict())
+        self.assertEqual(list(storage.lookup(Review, "place_id", place.id)),
+                         [f"Review.{review.id}"])
+        self.assertEqual(storage.count(Place), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,212 @@
+#!/usr/bin/python3
+"""Module test_db_storage
+
+This Module contains a tests for DBStorage Class
+"""
+
+import inspect
+import os
+import sqlite3
+import unittest
+
+import pycodestyle
+from models.city import City
+from models.engine import db_storage
+from models.place import Place
+from models.review import Review
+from models.user import User
+
+DBStorage = db_storage.DBStorage
+
+
+class TestDBStorageDocsAndStyle(unittest.TestCase):
+    """Tests DBStorage class for documentation and style conformance"""
+
+    def test_pycodestyle(self):
+        """Tests compliance with pycodestyle"""
+        style = pycodestyle.StyleGuide(quiet=False)
+        result = style.check_files(
+            [
+                "models/engine/db_storage.py",
+                "tests/test_models/test_engine/test_db_storage.py"
+            ])
+        self.assertEqual(result.total_errors, 0)
+
+    def test_module_docstring(self):
+        """Tests whether the module is documented"""
+        self.assertTrue(len(db_storage.__doc__) >= 1)
+
+    def test_class_docstring(self):
+        """Tests whether the class is documented"""
+        self.assertTrue(len(DBStorage.__doc__) >= 1)
+
+    def test_methods_docstring(self):
+        """Tests whether the class methods are documented"""
+        funcs = inspect.getmembers(DBStorage, inspect.isfunction)
+        for func in funcs:
+            self.assertTrue(len(func[1].__doc__) >= 1)
+
+    def test_class_name(self):
+        """Test whether the class name is correct"""
+        self.assertEqual(DBStorage.__name__, "DBStorage")
+
+
+class TestDBStorage(unittest.TestCase):
+    """Test cases for DBStorage Class"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.db_path = "test_db_storage.db"
+        self.storage = DBStorage(self.db_path)
+
+    def tearDown(self):
+        """cleanup test files"""
+        self.storage.close()
+        for suffix in ["", "-wal", "-shm"]:
+            if os.path.exists(self.db_path + suffix):
+                os.remove(self.db_path + suffix)
+
+    def test_save_commits_objects(self):
+        """saved objects are found by another connection"""
+        users = [User(email=f"{i}@hbnb.io") for i in range(3)]
+        for obj in users:
+            self.storage.new(obj)
+        self.storage.save()
+
+        other = DBStorage(self.db_path)
+        self.assertEqual(other.count(User), 3)
+        saved = other.get(User, users[0].id)
+        self.assertEqual(saved.to_dict(), users[0].to_dict())
+        self.assertEqual(set(other.all(User).keys()),
+                         {f"User.{obj.id}" for obj in users})
+        other.close()
+
+    def test_reload_discards_uncommitted_changes(self):
+        """reload rolls back what was not saved"""
+        self.storage.new(User())
+        self.storage.save()
+        self.storage.new(User())
+        self.assertEqual(self.storage.count(User), 2)
+        self.storage.reload()
+        self.assertEqual(self.storage.count(User), 1)
+
+    def test_delete_and_updates(self):
+        """deleted and updated objects are written on save"""
+        city, other_city = City(name="a"), City(name="b")
+        self.storage.new(city)
+        self.storage.new(other_city)
+        self.storage.save()
+        self.storage.delete(other_city)
+        city.__dict__["name"] = "c"
+        self.storage.mark_dirty(city, "name")
+        self.assertEqual(self.storage.dirty(),
+                         {f"City.{city.id}": {"name"},
+                          f"City.{other_city.id}": None})
+        self.storage.save()
+
+        other = DBStorage(self.db_path)
+        self.assertIsNone(other.get(City, other_city.id))
+        self.assertEqual(other.get("City", city.id).name, "c")
+        other.close()
+
+    def test_all_and_count_follow_subclasses(self):
+        """all() and count() include the instances of subclasses"""
+        from models.base_model import BaseModel
+        self.storage.new(User())
+        self.storage.new(Place())
+        self.assertEqual(self.storage.count(), 2)
+        self.assertEqual(len(self.storage.all(BaseModel)), 2)
+        self.assertEqual(self.storage.count(Review), 0)
+
+    def test_lookup_uses_indexed_columns(self):
+        """declared indexes are columns or value tables with an index"""
+        place = Place(city_id="c1", amenity_ids=["a1", "a2"])
+        self.storage.new(place)
+        self.storage.new(Place(city_id="c2"))
+        self.storage.save()
+
+        self.assertEqual(list(self.storage.lookup(Place, "city_id", "c1")),
+                         [f"Place.{place.id}"])
+        self.assertEqual(list(self.storage.lookup(Place, "amenity_ids",
+                                                  "a2")),
+                         [f"Place.{place.id}"])
+        conn = sqlite3.connect(self.db_path)
+        indexes = [row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'")]
+        conn.close()
+        self.assertIn("Place_city_id", indexes)
+        self.assertIn("Place__amenity_ids_id", indexes)
+
+    def test_add_index_backfills_existing_rows(self):
+        """an index added later covers the rows already stored"""
+        users = [User(first_name="Betty"), User(first_name="Bob")]
+        for obj in users:
+            self.storage.new(obj)
+        scanned = self.storage.lookup(User, "first_name", "Betty")
+        self.storage.add_index(User, "first_name")
+        self.assertEqual(self.storage.lookup(User, "first_name", "Betty"),
+                         scanned)
+        self.assertEqual(len(scanned), 1)
+
+    def test_query(self):
+        """conditions are evaluated in SQL or on the loaded objects"""
+        places = [Place(city_id="c1", price_by_night=i * 10, max_guest=i)
+                  for i in range(6)]
+        for obj in places:
+            self.storage.new(obj)
+        self.storage.new(Place(city_id="c1", price_by_night="30"))
+        result = self.storage.query(
+            Place, [("city_id", "==", "c1"), ("max_guest", ">=", 2),
+                    ("price_by_night", "<", 50)],
+            order_by="max_guest", reverse=True)
+        self.assertEqual(result, [places[4], places[3], places[2]])
+
+    def test_bulk_operations(self):
+        """bulk changes are committed together"""
+        users = [User(first_name="Betty") for _ in range(3)]
+        self.storage.bulk_insert(users)
+        self.storage.bulk_update([(users[0], {"first_name": "Bob"})])
+        self.storage.bulk_delete(users[1:])
+
+        other = DBStorage(self.db_path)
+        self.assertEqual(list(other.all(User)), [f"User.{users[0].id}"])
+        self.assertEqual(other.get(User, users[0].id).first_name, "Bob")
+        other.close()
+
+    def test_transaction_rollback(self):
+        """a failed transaction leaves the database unchanged"""
+        user = User(first_name="Betty")
+        self.storage.new(user)
+        with self.assertRaises(ValueError):
+            with self.storage.transaction():
+                self.storage.delete(user)
+                self.storage.new(User())
+                self.storage.save()
+                raise ValueError("abort")
+        self.assertEqual(list(self.storage.all(User)), [f"User.{user.id}"])
+
+        with self.storage.transaction():
+            self.storage.delete(self.storage.get(User, user.id))
+        self.assertEqual(DBStorage(self.db_path).count(User), 0)
+
+    def test_near_and_within(self):
+        """spatial searches select the places on indexed coordinates"""
+        sf = Place(latitude=37.7749, longitude=-122.4194)
+        oak = Place(latitude=37.8044, longitude=-122.2712)
+        fiji = Place(latitude=-17.7134, longitude=178.065)
+        for obj in [fiji, oak, sf, Place(latitude="unknown")]:
+            self.storage.new(obj)
+        self.storage.save()
+        columns = [row[1] for row in self.storage._DBStorage__conn.execute(
+            'PRAGMA table_info("Place")')]
+        self.assertIn("latitude", columns)
+        self.assertEqual([p.id for p in self.storage.near(
+            Place, 37.7749, -122.4194, 20)], [sf.id, oak.id])
+        self.assertEqual([p.id for p in self.storage.near(
+            Place, -17, 180, 300)], [fiji.id])
+        self.assertEqual(set(self.storage.within(Place, -20, 170, 40, -120)),
+                         {f"Place.{p.id}" for p in [sf, oak, fiji]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+#!/usr/bin/python3
+"""Module test_durability
+
+This Module contains a tests for SyncPolicy Class
+"""
+
+import inspect
+import os
+import time
+import unittest
+from unittest.mock import patch
+
+import pycodestyle
+from models.engine import durability
+
+SyncPolicy = durability.SyncPolicy
+
+
+class TestSyncPolicyDocsAndStyle(unittest.TestCase):
+    """Tests SyncPolicy class for documentation and style conformance"""
+
+    def test_pycodestyle(self):
+        """Tests compliance with pycodestyle"""
+        style = pycodestyle.StyleGuide(quiet=False)
+        result = style.check_files(
+            [
+                "models/engine/durability.py",
+                "tests/test_models/test_engine/test_durability.py"
+            ])
+        self.assertEqual(result.total_errors, 0)
+
+    def test_module_docstring(self):
+        """Tests whether the module is documented"""
+        self.assertTrue(len(durability.__doc__) >= 1)
+
+    def test_class_docstring(self):
+        """Tests whether the class is documented"""
+        self.assertTrue(len(SyncPolicy.__doc__) >= 1)
+
+    def test_methods_docstring(self):
+        """Tests whether the class methods are documented"""
+        funcs = inspect.getmembers(SyncPolicy, inspect.isfunction)
+        for func in funcs:
+            self.assertTrue(len(func[1].__doc__) >= 1)
+
+
+class TestSyncPolicy(unittest.TestCase):
+    """Test cases for SyncPolicy Class"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.path = "test_durability.data"
+        with open(self.path, 'wb') as f:
+            f.write(b"old")
+
+    def tearDown(self):
+        """cleanup test files"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def append(self, sync):
+        """appends to the test file through sync"""
+        with open(self.path, 'ab') as f:
+            f.write(b"+")
+            sync.appended(f, self.path)
+
+    def test_replace_is_atomic(self):
+        """a failed write leaves the file and its directory unchanged"""
+        def write(f):
+            """writes half of the new content then fails"""
+            f.write(b"ne")
+            raise OSError("disk full")
+
+        before = set(os.listdir("."))
+        with self.assertRaises(OSError):
+            SyncPolicy().replace(self.path, write)
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), b"old")
+        self.assertEqual(set(os.listdir(".")), before)
+
+        SyncPolicy().replace(self.path, lambda f: f.write(b"new"))
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), b"new")
+
+    def test_replace_keeps_permissions(self):
+        """a replaced file keeps its permissions, and a new one gets the
+        ones set by the umask
+        """
+        os.chmod(self.path, 0o640)
+        SyncPolicy().replace(self.path, lambda f: f.write(b"new"))
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o640)
+        os.remove(self.path)
+        umask = os.umask(0o022)
+        try:
+            SyncPolicy().replace(self.path, lambda f: f.write(b"new"))
+        finally:
+            os.umask(umask)
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o644)
+
+    def test_policies(self):
+        """always syncs at once, batch later and together, never not"""
+        with patch("os.fsync") as fsync:
+            sync = SyncPolicy("always")
+            sync.replace(self.path, lambda f: f.write(b"new"))
+            self.assertEqual(fsync.call_count, 2)
+            self.append(sync)
+            self.assertEqual(fsync.call_count, 3)
+
+            fsync.reset_mock()
+            sync = SyncPolicy("never")
+            sync.replace(self.path, lambda f: f.write(b"new"))
+            self.append(sync)
+            sync.flush()
+            self.assertEqual(fsync.call_count, 0)
+
+            sync = SyncPolicy("batch", interval=50)
+            sync.replace(self.path, lambda f: f.write(b"new"))
+            for _ in range(10):
+                self.append(sync)
+            self.assertEqual(fsync.call_count, 1)
+            time.sleep(0.3)
+            self.assertEqual(fsync.call_count, 3)
+            self.append(sync)
+            sync.flush()
+            self.assertEqual(fsync.call_count, 4)
+
+        with self.assertRaises(ValueError):
+            SyncPolicy("sometimes")
+
+
+if __name__ == "__main__":
+    unittest.main()
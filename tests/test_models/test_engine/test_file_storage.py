@@ -7,10 +7,19 @@ This Module contains a tests for FileStorage Class
 import inspect
 import json
 import os
+import threading
+import time
 import unittest
+from unittest.mock import patch
 
 import pycodestyle
+from models.city import City
 from models.engine import file_storage
+from models.engine.journal import Journal
+from models.engine.query import Condition
+from models.place import Place
+from models.review import Review
+from models.user import User
 from tests.test_models.test_base_model import BaseModel
 
 FileStorage = file_storage.FileStorage
@@ -64,6 +73,28 @@ class TestFileStorage(unittest.TestCase):
         if os.path.exists(self.file_path):
             os.remove(self.file_path)
 
+    def test_failed_save_keeps_previous_file(self):
+        """a save failing halfway leaves the previous snapshot intact"""
+        saved = BaseModel()
+        self.storage.new(saved)
+        self.storage.save()
+
+        def dump(fragments, f, offsets=None):
+            """writes part of the snapshot then fails"""
+            f.write(b'{"BaseModel.')
+            raise OSError("disk full")
+
+        self.storage.new(BaseModel())
+        with patch.object(self.storage._FileStorage__format, "dump",
+                          side_effect=dump):
+            with self.assertRaises(OSError):
+                self.storage.save()
+        storage = FileStorage()
+        storage.reload()
+        self.assertEqual(list(storage.all()), [f"BaseModel.{saved.id}"])
+        with self.assertRaises(ValueError):
+            FileStorage(fsync="sometimes")
+
     def test_all_returns_a_dictionary(self):
         """tests wether the instance method 'all' returns a valid dictionary"""
         self.assertIsInstance(self.storage.all(), dict)
@@ -75,6 +106,33 @@ class TestFileStorage(unittest.TestCase):
         key = f"{temp_obj.__class__.__name__}.{temp_obj.id}"
         self.assertIn(key, self.storage.all().keys())
 
+    def test_all_with_class_returns_its_instances(self):
+        """all(cls) returns the instances of cls and of its subclasses"""
+        users = [User() for _ in range(2)]
+        base = BaseModel()
+        for obj in users + [base]:
+            self.storage.new(obj)
+
+        self.assertEqual(set(self.storage.all(User).keys()),
+                         {f"User.{obj.id}" for obj in users})
+        self.assertEqual(len(self.storage.all(BaseModel)), 3)
+
+    def test_count_uses_class_index(self):
+        """count(cls) follows new, delete and reload"""
+        users = [User() for _ in range(3)]
+        for obj in users:
+            self.storage.new(obj)
+        self.storage.new(BaseModel())
+        self.assertEqual(self.storage.count(User), 3)
+        self.assertEqual(self.storage.count(), 4)
+
+        self.storage.delete(users[0])
+        self.assertEqual(self.storage.count(User), 2)
+        self.storage.save()
+        self.storage.reload()
+        self.assertEqual(self.storage.count(User), 2)
+        self.assertEqual(self.storage.count(BaseModel), 3)
+
     def test_save_method_saves_objects_to_file(self):
         """tests wether the save method saves objects to file"""
         expected_objects = {}
@@ -110,6 +168,18 @@ class TestFileStorage(unittest.TestCase):
         saved_objects_dict = {k: v.to_dict() for k, v in saved_objects.items()}
         self.assertEqual(expected_objects, saved_objects_dict)
 
+    def test_reload_reports_progress(self):
+        """reload calls progress while the file is read"""
+        for _ in range(4):
+            self.storage.new(BaseModel())
+        self.storage.save()
+        calls = []
+        self.storage.reload(
+            progress=lambda read, total: calls.append((read, total)))
+        size = os.path.getsize(self.file_path)
+        self.assertEqual(calls[-1], (size, size))
+        self.assertEqual(self.storage.count(), 4)
+
     def test_reload_method_does_not_do_anything_for_non_existent_file(self):
         """reload does not do anything if the file does not exist"""
         if os.path.exists(self.file_path):
@@ -128,3 +198,1092 @@ class TestFileStorage(unittest.TestCase):
         existing_objects_dict = {k: v.to_dict()
                                  for k, v in existing_objects.items()}
         self.assertEqual(expected_objects, existing_objects_dict)
+
+
+class TestFileStorageJournal(unittest.TestCase):
+    """Test cases for FileStorage in journal mode"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.file_path = "journal_test.json"
+        self.log_path = f"{self.file_path}.log"
+        self.storage = FileStorage(self.file_path, journal=True)
+        self.storage.reload()
+
+    def tearDown(self):
+        """cleanup test files"""
+        for path in [self.file_path, self.log_path]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_save_appends_only_changed_objects(self):
+        """save appends one record per changed object to the log"""
+        for _ in range(3):
+            self.storage.new(BaseModel())
+        self.storage.save()
+        self.assertFalse(os.path.exists(self.file_path))
+        with open(self.log_path, 'r') as f:
+            self.assertEqual(len(f.readlines()), 3)
+
+        bs_mdl = BaseModel()
+        self.storage.new(bs_mdl)
+        self.storage.save()
+        with open(self.log_path, 'r') as f:
+            self.assertEqual(len(f.readlines()), 4)
+
+    def test_save_of_deleted_object_does_not_store_it(self):
+        """saving an object after deleting it keeps it deleted, while
+        saving a stored object appends its update
+        """
+        kept, removed = BaseModel(), BaseModel()
+        with patch("models.storage", self.storage):
+            self.storage.new(kept)
+            self.storage.new(removed)
+            self.storage.save()
+            self.storage.delete(removed)
+            removed.name = "x"
+            removed.save()
+            kept.name = "y"
+            kept.save()
+        reloaded = FileStorage(self.file_path, journal=True)
+        reloaded.reload()
+        self.assertEqual(list(reloaded.all()), [f"BaseModel.{kept.id}"])
+        self.assertEqual(reloaded.all()[f"BaseModel.{kept.id}"].name, "y")
+
+    def test_reload_replays_log_over_snapshot(self):
+        """reload applies put and del records over the snapshot"""
+        kept, removed = BaseModel(), BaseModel()
+        snapshot = FileStorage(self.file_path)
+        snapshot.reload()
+        snapshot.new(kept)
+        snapshot.new(removed)
+        snapshot.save()
+
+        added = BaseModel()
+        self.storage.reload()
+        self.storage.new(added)
+        self.storage.delete(self.storage.all()[f"BaseModel.{removed.id}"])
+        self.storage.save()
+
+        storage = FileStorage(self.file_path, journal=True)
+        storage.reload()
+        self.assertEqual(set(storage.all().keys()),
+                         {f"BaseModel.{kept.id}", f"BaseModel.{added.id}"})
+
+    def test_reload_ignores_torn_last_record(self):
+        """a partially written trailing record is skipped"""
+        bs_mdl = BaseModel()
+        self.storage.new(bs_mdl)
+        self.storage.save()
+        with open(self.log_path, 'a') as f:
+            f.write('{"op": "put", "key": "BaseModel.x", "ob')
+
+        storage = FileStorage(self.file_path, journal=True)
+        storage.reload()
+        self.assertEqual(list(storage.all().keys()),
+                         [f"BaseModel.{bs_mdl.id}"])
+
+        for _ in range(2):
+            storage.new(BaseModel())
+            storage.save()
+        storage = FileStorage(self.file_path, journal=True)
+        storage.reload()
+        self.assertEqual(storage.count(), 3)
+
+    def test_bulk_operations_save_once(self):
+        """bulk_insert, bulk_update and bulk_delete append one batch each"""
+        places = [Place(city_id="c1") for _ in range(3)]
+        self.storage.bulk_insert(places)
+        self.storage.bulk_update((place, {"city_id": "c2", "max_guest": i})
+                                 for i, place in enumerate(places))
+        self.assertEqual(len(self.storage.lookup(Place, "city_id", "c2")), 3)
+        self.storage.bulk_delete(places[:2])
+        with open(self.log_path, 'r') as f:
+            self.assertEqual(len(f.readlines()), 3)
+
+        storage = FileStorage(self.file_path, journal=True)
+        storage.reload()
+        saved = storage.all(Place)
+        self.assertEqual(list(saved), [f"Place.{places[2].id}"])
+        self.assertEqual(saved[f"Place.{places[2].id}"].to_dict(),
+                         places[2].to_dict())
+        self.assertGreater(places[2].updated_at, places[2].created_at)
+
+    def test_full_save_folds_log_into_snapshot(self):
+        """a save outside journal mode writes a snapshot and drops the log"""
+        self.storage.new(BaseModel())
+        self.storage.save()
+        storage = FileStorage(self.file_path)
+        storage.reload()
+        storage.save()
+        self.assertFalse(os.path.exists(self.log_path))
+        with open(self.file_path, 'r') as f:
+            self.assertEqual(len(json.load(f)), 1)
+
+
+class TestFileStorageCompaction(unittest.TestCase):
+    """Test cases for FileStorage log compaction"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.file_path = "compaction_test.json"
+        self.log_path = f"{self.file_path}.log"
+
+    def tearDown(self):
+        """cleanup test files"""
+        for path in [self.file_path, self.log_path]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_compact_folds_log_into_snapshot(self):
+        """compact writes every object to the snapshot and drops the log"""
+        storage = FileStorage(self.file_path, journal=True)
+        storage.reload()
+        for _ in range(3):
+            storage.new(BaseModel())
+        storage.save()
+        storage.compact()
+
+        self.assertFalse(os.path.exists(self.log_path))
+        with open(self.file_path, 'r') as f:
+            self.assertEqual(set(json.load(f).keys()),
+                             set(storage.all().keys()))
+
+    def test_record_threshold_triggers_compaction(self):
+        """the log never holds more than compact_records records"""
+        storage = FileStorage(self.file_path, journal=True,
+                              compact_records=3)
+        storage.reload()
+        for _ in range(5):
+            storage.new(BaseModel())
+            storage.save()
+            self.assertLess(storage._FileStorage__journal.records, 3)
+
+        reloaded = FileStorage(self.file_path, journal=True)
+        reloaded.reload()
+        self.assertEqual(set(reloaded.all().keys()),
+                         set(storage.all().keys()))
+
+    def test_byte_threshold_triggers_background_compaction(self):
+        """a log larger than compact_bytes is compacted in a thread"""
+        storage = FileStorage(self.file_path, journal=True,
+                              compact_bytes=1, background=True)
+        storage.reload()
+        storage.new(BaseModel())
+        storage.save()
+        storage._FileStorage__compactor.join()
+
+        self.assertFalse(os.path.exists(self.log_path))
+        with open(self.file_path, 'r') as f:
+            self.assertEqual(len(json.load(f)), 1)
+
+    def test_compact_waits_for_background_compaction(self):
+        """a compaction started while a background one runs writes its
+        snapshot after it, so that the older snapshot does not win
+        """
+        storage = FileStorage(self.file_path, journal=True)
+        storage.reload()
+        for _ in range(3):
+            storage.new(BaseModel())
+        storage.save()
+        release = threading.Event()
+        write_file = FileStorage._FileStorage__write_file
+
+        def slow_write(self, path, fragments):
+            """holds the write of the background snapshot"""
+            if threading.current_thread() is not threading.main_thread():
+                release.wait(2)
+            write_file(self, path, fragments)
+
+        with patch.object(FileStorage, "_FileStorage__write_file",
+                          slow_write):
+            compactor = storage.compact(background=True)
+            for _ in range(4):
+                storage.new(BaseModel())
+            storage.save()
+            threading.Timer(0.2, release.set).start()
+            storage.compact()
+            compactor.join()
+
+        reloaded = FileStorage(self.file_path, journal=True)
+        reloaded.reload()
+        self.assertEqual(reloaded.count(), 7)
+
+    def test_records_appended_during_compaction_are_kept(self):
+        """records appended after the snapshot was taken stay in the log"""
+        storage = FileStorage(self.file_path, journal=True)
+        storage.reload()
+        storage.new(BaseModel())
+        storage.save()
+        fragments = {k: json.dumps(v.to_dict())
+                     for k, v in storage.all().items()}
+        offset = os.path.getsize(self.log_path)
+        late = BaseModel()
+        storage.new(late)
+        storage.save()
+        storage._FileStorage__write_snapshot(fragments, offset, set())
+
+        with open(self.log_path, 'r') as f:
+            self.assertEqual(len(f.readlines()), 1)
+        reloaded = FileStorage(self.file_path, journal=True)
+        reloaded.reload()
+        self.assertIn(f"BaseModel.{late.id}", reloaded.all())
+
+
+class TestFileStorageTransaction(unittest.TestCase):
+    """Test cases for FileStorage transactions"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.file_path = "transaction_test.json"
+        self.storage = FileStorage(self.file_path)
+        self.kept = Review(place_id="p1", text="kept")
+        self.removed = Review(place_id="p1")
+        for obj in [self.kept, self.removed]:
+            self.storage.new(obj)
+        self.storage.save()
+
+    def tearDown(self):
+        """cleanup test files"""
+        for path in [self.file_path, f"{self.file_path}.log"]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def saved_keys(self, **kwargs):
+        """returns the keys reloaded from the test file"""
+        storage = FileStorage(self.file_path, **kwargs)
+        storage.reload()
+        return set(storage.all())
+
+    def test_commit_saves_once_at_the_end(self):
+        """saves in the block are deferred to its end"""
+        added = Review(place_id="p2")
+        with self.storage.transaction():
+            with self.storage.transaction():
+                self.storage.new(added)
+                self.storage.save()
+            self.storage.delete(self.removed)
+            self.storage.save()
+            self.assertEqual(self.saved_keys(), {f"Review.{self.kept.id}",
+                                                 f"Review.{self.removed.id}"})
+            self.assertEqual(set(self.storage.dirty()),
+                             {f"Review.{added.id}",
+                              f"Review.{self.removed.id}"})
+        self.assertEqual(self.saved_keys(), {f"Review.{self.kept.id}",
+                                             f"Review.{added.id}"})
+        self.assertEqual(self.storage.dirty(), {})
+
+    def test_rollback_restores_the_objects(self):
+        """an exception in the block restores the state at its start"""
+        before = self.storage.all().copy()
+        with self.assertRaises(KeyError):
+            with self.storage.transaction():
+                self.storage.new(Review(place_id="p1"))
+                self.kept.__dict__.update(place_id="p2", color="red")
+                self.storage.mark_dirty(self.kept, "place_id")
+                self.storage.delete(self.removed)
+                raise KeyError("abort")
+        self.assertEqual(set(self.storage.all()), set(before))
+        self.assertIs(self.storage.all()[f"Review.{self.kept.id}"],
+                      self.kept)
+        self.assertEqual((self.kept.place_id, self.kept.text), ("p1", "kept"))
+        self.assertFalse(hasattr(self.kept, "color"))
+        self.assertEqual(len(self.storage.lookup(Review, "place_id", "p1")),
+                         2)
+        self.assertEqual(self.storage.dirty(), {})
+
+    def test_journal_group(self):
+        """in journal mode the changes are appended as one record"""
+        storage = FileStorage(self.file_path, journal=True)
+        storage.reload()
+        storage.bulk_insert([Review(), Review()])
+        with open(f"{self.file_path}.log", 'r') as f:
+            self.assertEqual(len(f.readlines()), 1)
+        self.assertEqual(len(self.saved_keys(journal=True)), 4)
+
+
+class TestFileStorageShared(unittest.TestCase):
+    """Test cases for FileStorage instances sharing their files"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.file_path = "shared_test.json"
+
+    def tearDown(self):
+        """cleanup test files"""
+        for suffix in ["", ".log", ".lock"]:
+            if os.path.exists(self.file_path + suffix):
+                os.remove(self.file_path + suffix)
+
+    def workers(self, **kwargs):
+        """returns two reloaded storages sharing the test file"""
+        result = []
+        for _ in range(2):
+            storage = FileStorage(self.file_path, shared=True, **kwargs)
+            storage.reload()
+            result.append(storage)
+        return result
+
+    def test_saves_merge_changes(self):
+        """no save loses the changes saved by another storage"""
+        first, second = self.workers()
+        betty, bob = User(first_name="Betty"), User(first_name="Bob")
+        first.new(betty)
+        first.save()
+        second.new(bob)
+        second.save()
+        self.assertEqual(set(second.all()),
+                         {f"User.{betty.id}", f"User.{bob.id}"})
+
+        first.reload_changes()
+        self.assertEqual(set(first.all()), set(second.all()))
+        self.assertEqual(list(first.lookup(User, "first_name", "Bob")),
+                         [f"User.{bob.id}"])
+        second.delete(second.get(User, bob.id))
+        second.save()
+        first.reload_changes()
+        self.assertIsNone(first.get(User, bob.id))
+
+    def test_local_changes_win(self):
+        """unsaved local changes are kept, others are updated in place"""
+        first, second = self.workers()
+        user, place = User(first_name="Betty"), Place(name="loft")
+        first.new(user)
+        first.new(place)
+        first.save()
+        second.reload_changes()
+        for obj, storage in [(user, first), (place, second)]:
+            obj = storage.get(obj.__class__, obj.id)
+            obj.__dict__["name"] = "theirs"
+            storage.mark_dirty(obj, "name")
+        second.get(User, user.id).__dict__["first_name"] = "Bob"
+        second.mark_dirty(second.get(User, user.id), "first_name")
+        second.save()
+        first.save()
+
+        self.assertIs(first.get(Place, place.id), place)
+        self.assertEqual(place.name, "theirs")
+        self.assertEqual(user.first_name, "Betty")
+        reader = FileStorage(self.file_path)
+        reader.reload()
+        self.assertEqual(reader.get(User, user.id).first_name, "Betty")
+        self.assertEqual(reader.get(Place, place.id).name, "theirs")
+
+    def test_journal_reads_only_new_records(self):
+        """in journal mode only the appended log records are read"""
+        first, second = self.workers(journal=True)
+        first.new(User())
+        first.save()
+        second.reload_changes()
+        added = User()
+        first.new(added)
+        first.save()
+        with patch.object(file_storage.Journal, "tail", autospec=True,
+                          side_effect=file_storage.Journal.tail) as tail:
+            second.reload_changes()
+        self.assertEqual(tail.call_count, 1)
+        self.assertGreater(tail.call_args.args[1], 0)
+        self.assertEqual(set(second.all()), set(first.all()))
+        self.assertIn(f"User.{added.id}", second.all())
+
+    def test_locks(self):
+        """saves hold an exclusive lock, reloads a shared one"""
+        storage = FileStorage(self.file_path, shared=True)
+        with patch.object(file_storage.fcntl, "flock") as flock:
+            storage.new(User())
+            storage.save()
+            storage.reload_changes()
+        fcntl = file_storage.fcntl
+        self.assertEqual([call.args[1] for call in flock.call_args_list],
+                         [fcntl.LOCK_EX, fcntl.LOCK_UN,
+                          fcntl.LOCK_SH, fcntl.LOCK_UN])
+        with patch.object(file_storage, "fcntl", None):
+            with self.assertRaises(ValueError):
+                FileStorage(self.file_path, shared=True)
+
+
+class TestFileStorageThreadSafe(unittest.TestCase):
+    """Test cases for FileStorage used by several threads"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.file_path = "threadsafe_test.json"
+
+    def tearDown(self):
+        """cleanup test files"""
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+    def test_concurrent_reads_and_writes(self):
+        """readers see consistent objects while writers change them"""
+        storage = FileStorage(self.file_path, threadsafe=True)
+        self.assertIsNotNone(storage.lock)
+        self.assertIsNone(FileStorage(self.file_path).lock)
+        errors = []
+
+        def write(n):
+            """creates, updates and deletes users"""
+            for i in range(200):
+                user = User(first_name=f"{n}.{i}")
+                storage.new(user)
+                if i % 2:
+                    storage.delete(user)
+                if i % 50 == 0:
+                    storage.save()
+
+        def read():
+            """iterates the users and their index"""
+            try:
+                for _ in range(200):
+                    for key, obj in storage.all().items():
+                        self.assertEqual(key, f"User.{obj.id}")
+                    with storage.lock.read():
+                        self.assertEqual(len(storage.all(User)),
+                                         storage.count(User))
+                    storage.lookup(User, "first_name", "0.0")
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=write, args=(n,))
+                   for n in range(4)]
+        threads += [threading.Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(storage.count(User), 400)
+        storage.save()
+        reader = FileStorage(self.file_path)
+        reader.reload()
+        self.assertEqual(reader.count(User), 400)
+
+
+class TestFileStorageWriteBehind(unittest.TestCase):
+    """Test cases for FileStorage in write-behind mode"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.file_path = "write_behind_test.json"
+        self.storage = FileStorage(self.file_path, write_behind=50)
+
+    def tearDown(self):
+        """cleanup test files"""
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+    def saved_count(self):
+        """returns the number of objects reloaded from the test file"""
+        storage = FileStorage(self.file_path)
+        storage.reload()
+        return storage.count()
+
+    def test_saves_are_coalesced(self):
+        """a burst of saves is written once by the timer thread"""
+        self.assertIsNotNone(self.storage.lock)
+        with patch.object(FileStorage, "_FileStorage__write_changes",
+                          autospec=True,
+                          side_effect=FileStorage._FileStorage__write_changes
+                          ) as write:
+            for _ in range(20):
+                self.storage.new(User())
+                self.storage.save()
+            self.assertFalse(os.path.exists(self.file_path))
+            time.sleep(0.3)
+        self.assertEqual(write.call_count, 1)
+        self.assertEqual(self.saved_count(), 20)
+
+    def test_flush_writes_at_once(self):
+        """flush writes the scheduled changes without waiting"""
+        self.storage.new(User())
+        self.storage.save()
+        self.storage.flush()
+        self.assertEqual(self.saved_count(), 1)
+        with patch.object(FileStorage, "_FileStorage__write_changes") as write:
+            self.storage.flush()
+            time.sleep(0.1)
+        write.assert_not_called()
+
+    def test_failed_writes_are_logged_and_backed_off(self):
+        """a failing write is logged, tried again after longer and longer
+        delays and raised by the next flush
+        """
+        self.storage.new(User())
+        with patch.object(FileStorage, "_FileStorage__write_changes",
+                          side_effect=OSError) as write:
+            with self.assertLogs("models.engine.file_storage", "ERROR"):
+                self.storage.save()
+                time.sleep(0.4)
+            self.assertIn(write.call_count, (2, 3))
+            with self.assertRaises(OSError) as raised:
+                self.storage.flush()
+            self.assertIsInstance(raised.exception.__cause__, OSError)
+        self.assertFalse(os.path.exists(self.file_path))
+        self.storage.flush()
+        self.assertEqual(self.saved_count(), 1)
+        with patch.object(FileStorage, "_FileStorage__write_changes") as write:
+            time.sleep(0.5)
+        write.assert_not_called()
+
+    def test_failed_journal_append_is_retried(self):
+        """the records of a failed journal append are appended by the next
+        flush
+        """
+        storage = FileStorage(self.file_path, journal=True, write_behind=50)
+        storage.new(User())
+        with patch.object(Journal, "append", side_effect=OSError), \
+                self.assertLogs("models.engine.file_storage", "ERROR"):
+            storage.save()
+            time.sleep(0.1)
+        storage.flush()
+        reloaded = FileStorage(self.file_path, journal=True)
+        reloaded.reload()
+        self.assertEqual(reloaded.count(), 1)
+        os.remove(f"{self.file_path}.log")
+
+
+class TestFileStorageDirtyTracking(unittest.TestCase):
+    """Test cases for FileStorage dirty tracking"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.file_path = "dirty_test.json"
+        self.storage = FileStorage(self.file_path)
+        self.storage.reload()
+
+    def tearDown(self):
+        """cleanup test files"""
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+    def test_new_and_delete_mark_whole_object_dirty(self):
+        """new and deleted objects are dirty without attribute names"""
+        bs_mdl = BaseModel()
+        key = f"BaseModel.{bs_mdl.id}"
+        self.storage.new(bs_mdl)
+        self.assertEqual(self.storage.dirty(), {key: None})
+        self.storage.save()
+        self.assertEqual(self.storage.dirty(), {})
+        self.storage.delete(bs_mdl)
+        self.assertEqual(self.storage.dirty(), {key: None})
+
+    def test_mark_dirty_records_attribute_names(self):
+        """attributes changed after a save are tracked by name"""
+        bs_mdl = BaseModel()
+        self.storage.new(bs_mdl)
+        self.storage.save()
+        self.storage.mark_dirty(bs_mdl, "name")
+        self.storage.mark_dirty(bs_mdl, "number")
+        self.assertEqual(self.storage.dirty(),
+                         {f"BaseModel.{bs_mdl.id}": {"name", "number"}})
+
+    def test_mark_dirty_ignores_unknown_objects(self):
+        """objects that are not stored are not tracked"""
+        self.storage.mark_dirty(BaseModel(), "name")
+        self.assertEqual(self.storage.dirty(), {})
+
+    def test_save_encodes_only_dirty_objects(self):
+        """clean objects are not serialized again"""
+        objs = [BaseModel() for _ in range(3)]
+        for obj in objs:
+            self.storage.new(obj)
+        self.storage.save()
+
+        calls = []
+        to_dict = BaseModel.to_dict
+
+        def counting_to_dict(obj, *args):
+            """counts the serialized objects"""
+            calls.append(obj)
+            return to_dict(obj, *args)
+
+        BaseModel.to_dict = counting_to_dict
+        try:
+            objs[0].__dict__["name"] = "changed"
+            self.storage.mark_dirty(objs[0], "name")
+            self.storage.save()
+        finally:
+            BaseModel.to_dict = to_dict
+
+        self.assertEqual(calls, [objs[0]])
+        with open(self.file_path, 'r') as f:
+            saved = json.load(f)
+        self.assertEqual(saved, {f"BaseModel.{obj.id}": obj.to_dict()
+                                 for obj in objs})
+
+
+class TestFileStorageAttributeIndexes(unittest.TestCase):
+    """Test cases for FileStorage attribute indexes"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.file_path = "index_test.json"
+        self.storage = FileStorage(self.file_path)
+        self.storage.reload()
+
+    def tearDown(self):
+        """cleanup test files"""
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+    def test_declared_indexes_follow_new_and_delete(self):
+        """lookup finds objects through the attributes in __indexes__"""
+        cities = [City(state_id="s1"), City(state_id="s1"),
+                  City(state_id="s2")]
+        for obj in cities:
+            self.storage.new(obj)
+        self.assertEqual(set(self.storage.lookup(City, "state_id", "s1")),
+                         {f"City.{cities[0].id}", f"City.{cities[1].id}"})
+
+        self.storage.delete(cities[0])
+        self.assertEqual(list(self.storage.lookup(City, "state_id", "s1")),
+                         [f"City.{cities[1].id}"])
+
+    def test_index_follows_attribute_updates(self):
+        """indexes are updated when the attribute of a stored object is set
+        """
+        review = Review()
+        key = f"Review.{review.id}"
+        self.storage.new(review)
+        self.storage.mark_dirty(review, "place_id")
+        review.__dict__["place_id"] = "p1"
+        self.storage.mark_dirty(review, "place_id")
+        self.assertEqual(list(self.storage.lookup(Review, "place_id", "p1")),
+                         [key])
+        review.__dict__["place_id"] = "p2"
+        self.storage.mark_dirty(review, "place_id")
+        self.assertEqual(self.storage.lookup(Review, "place_id", "p1"), {})
+        self.assertEqual(list(self.storage.lookup(Review, "place_id", "p2")),
+                         [key])
+
+    def test_indexes_are_rebuilt_on_reload(self):
+        """reload indexes the reloaded objects"""
+        review = Review(place_id="p1")
+        self.storage.new(review)
+        self.storage.save()
+        self.storage.reload()
+        self.assertEqual(list(self.storage.lookup(Review, "place_id", "p1")),
+                         [f"Review.{review.id}"])
+
+    def test_add_index_and_scan_fallback_agree(self):
+        """an index added later gives the same result as a scan"""
+        users = [User(first_name="Betty"), User(first_name="Bob"),
+                 User(first_name="Betty")]
+        for obj in users:
+            self.storage.new(obj)
+        scanned = self.storage.lookup(User, "first_name", "Betty")
+        self.storage.add_index(User, "first_name")
+        indexed = self.storage.lookup(User, "first_name", "Betty")
+        self.assertEqual(scanned, indexed)
+        self.assertEqual(len(indexed), 2)
+
+        late = User(first_name="Betty")
+        self.storage.new(late)
+        self.assertIn(f"User.{late.id}",
+                      self.storage.lookup(User, "first_name", "Betty"))
+
+    def test_spatial_index(self):
+        """near and within follow new, delete and coordinate updates"""
+        sf = Place(latitude=37.7749, longitude=-122.4194)
+        oak = Place(latitude=37.8044, longitude=-122.2712)
+        la = Place(latitude=34.0522, longitude=-118.2437)
+        for obj in [la, oak, sf, City()]:
+            self.storage.new(obj)
+        self.assertEqual(self.storage.near(Place, 37.7749, -122.4194, 20),
+                         [sf, oak])
+        self.assertEqual(self.storage.near(Place, 37.7749, -122.4194, 20,
+                                           limit=1), [sf])
+        self.assertEqual(set(self.storage.within(Place, 33, -123, 38, -118)),
+                         {f"Place.{p.id}" for p in [sf, oak, la]})
+
+        self.storage.delete(oak)
+        la.__dict__["latitude"] = 37.78
+        self.storage.mark_dirty(la, "latitude")
+        la.__dict__["longitude"] = -122.42
+        self.storage.mark_dirty(la, "longitude")
+        self.assertEqual(self.storage.near(Place, 37.7749, -122.4194, 20),
+                         [sf, la])
+        self.assertEqual(self.storage.near(City, 0, 0, 100), [])
+        self.storage.save()
+        storage = FileStorage(self.file_path, indexed=True)
+        storage.reload()
+        self.assertEqual([p.id for p in storage.near(
+            Place, 37.7749, -122.4194, 20)], [sf.id, la.id])
+
+    def test_columns_and_grids_built_on_first_use(self):
+        """reload and new fill no column store or grid until one is used"""
+        places = [Place(city_id="c1", price_by_night=i, latitude=10.0,
+                        longitude=i / 100) for i in range(3)]
+        for obj in places:
+            self.storage.new(obj)
+        self.storage.save()
+        storage = FileStorage(self.file_path)
+        storage.reload()
+        storage.new(Place(price_by_night=9, latitude=50.0, longitude=0.0))
+        self.assertEqual(storage._FileStorage__columns, {})
+        self.assertEqual(storage._FileStorage__grids, {})
+
+        self.assertEqual(len(storage.near(Place, 10.0, 0.0, 5)), 3)
+        self.assertEqual(storage.columns(Place).aggregate(
+            "price_by_night", "sum"), 12)
+        storage.new(Place(price_by_night=100, latitude=10.0, longitude=0.0))
+        self.assertEqual(storage.columns(Place).aggregate(
+            "price_by_night", "sum"), 112)
+        self.assertEqual(len(storage.near(Place, 10.0, 0.0, 5)), 4)
+
+    def test_attribute_indexes_built_on_first_use(self):
+        """reload, new and changes fill no attribute index until a lookup
+        uses it, then keep it up to date
+        """
+        cities = [City(state_id="s1"), City(state_id="s2")]
+        for obj in cities:
+            self.storage.new(obj)
+        self.storage.save()
+        storage = FileStorage(self.file_path)
+        storage.reload()
+        with patch("models.storage", storage):
+            late = City(state_id="s1")
+            storage.new(late)
+            moved = storage.get(City, cities[1].id)
+            moved.state_id = "s1"
+            storage.delete(storage.get(City, cities[0].id))
+            index = storage._FileStorage__indexes[City]["state_id"]
+            self.assertEqual(index.get("s1"), set())
+
+            self.assertEqual(set(storage.lookup(City, "state_id", "s1")),
+                             {f"City.{late.id}", f"City.{moved.id}"})
+            late.state_id = "s3"
+            self.assertEqual(storage.query(City, [("state_id", "==", "s3")]),
+                             [late])
+
+
+class TestFileStorageQuery(unittest.TestCase):
+    """Test cases for FileStorage queries"""
+
+    def setUp(self):
+        """creates test places for other tests"""
+        self.storage = FileStorage("query_test.json")
+        self.places = [Place(city_id=f"c{i % 2}", price_by_night=i * 10,
+                             max_guest=i) for i in range(10)]
+        for obj in self.places:
+            self.storage.new(obj)
+
+    def test_range_conditions(self):
+        """objects must satisfy every condition"""
+        result = self.storage.query(
+            Place, [("price_by_night", "<", 50), ("max_guest", ">=", 2)])
+        self.assertEqual(set(result), set(self.places[2:5]))
+
+    def test_equality_on_indexed_attribute_uses_the_index(self):
+        """an indexed equality does not evaluate other objects"""
+        checked = []
+        cond = Condition("max_guest", ">", 0)
+        evaluate = Condition.__call__
+
+        def tracking_call(self, obj):
+            """tracks the checked objects"""
+            checked.append(obj)
+            return evaluate(self, obj)
+
+        Condition.__call__ = tracking_call
+        try:
+            result = self.storage.query(
+                Place, [cond, Condition("city_id", "=", "c1")])
+        finally:
+            Condition.__call__ = evaluate
+        self.assertEqual(set(result), set(self.places[1::2]))
+        self.assertEqual(len(checked), 5)
+
+    def test_order_limit_and_offset(self):
+        """results can be sorted and paginated"""
+        result = self.storage.query(Place, order_by="price_by_night",
+                                    reverse=True, limit=3, offset=1)
+        self.assertEqual(result, self.places[8:5:-1])
+        result = self.storage.query(Place, [("city_id", "==", "c0")],
+                                    order_by="max_guest", offset=3)
+        self.assertEqual(result, [self.places[6], self.places[8]])
+
+    def test_query_without_class_matches_every_object(self):
+        """cls defaults to every stored object"""
+        self.assertEqual(len(self.storage.query()), 10)
+        self.assertEqual(self.storage.query(User), [])
+
+
+class TestFileStorageLazy(unittest.TestCase):
+    """Test cases for FileStorage in lazy mode"""
+
+    def setUp(self):
+        """saves test objects and reloads them lazily"""
+        self.file_path = "lazy_test.json"
+        storage = FileStorage(self.file_path)
+        self.users = [User(first_name=f"u{i}") for i in range(3)]
+        self.place = Place(city_id="c1")
+        for obj in self.users + [self.place]:
+            storage.new(obj)
+        storage.save()
+        self.storage = FileStorage(self.file_path, lazy=True)
+        self.storage.reload()
+
+    def tearDown(self):
+        """cleanup test files"""
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+    def loaded(self):
+        """returns the keys of the instantiated objects"""
+        return set(self.storage._FileStorage__objects.keys())
+
+    def test_reload_instantiates_nothing(self):
+        """objects are counted and indexed without being instantiated"""
+        self.assertEqual(self.loaded(), set())
+        self.assertEqual(self.storage.count(), 4)
+        self.assertEqual(self.storage.count(User), 3)
+
+    def test_get_and_lookup_instantiate_only_their_objects(self):
+        """get and index lookups instantiate the objects they return"""
+        user = self.storage.get(User, self.users[0].id)
+        self.assertEqual(user.to_dict(), self.users[0].to_dict())
+        found = self.storage.lookup(Place, "city_id", "c1")
+        self.assertEqual(list(found), [f"Place.{self.place.id}"])
+        self.assertEqual(self.loaded(), {f"User.{self.users[0].id}",
+                                         f"Place.{self.place.id}"})
+        self.assertIs(self.storage.get(User, self.users[0].id), user)
+
+    def test_all_instantiates_requested_objects(self):
+        """all(cls) instantiates its class, all() every object"""
+        self.assertEqual(len(self.storage.all(User)), 3)
+        self.assertEqual(len(self.loaded()), 3)
+        self.assertEqual(len(self.storage.all()), 4)
+        self.assertEqual(len(self.loaded()), 4)
+
+    def test_save_keeps_pending_records(self):
+        """records never accessed are saved as they were read"""
+        self.storage.delete(self.storage.get(User, self.users[1].id))
+        self.storage.save()
+        self.assertEqual(self.loaded(), set())
+
+        storage = FileStorage(self.file_path)
+        storage.reload()
+        self.assertEqual(
+            {k: v.to_dict() for k, v in storage.all().items()},
+            {f"{obj.__class__.__name__}.{obj.id}": obj.to_dict()
+             for obj in [self.users[0], self.users[2], self.place]})
+
+
+class TestFileStorageSharded(unittest.TestCase):
+    """Test cases for FileStorage in sharded mode"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.file_path = "shard_test.json"
+        self.storage = FileStorage(self.file_path, sharded=True)
+        self.storage.reload()
+        self.users = [User() for _ in range(2)]
+        self.place = Place()
+        for obj in self.users + [self.place]:
+            self.storage.new(obj)
+        self.storage.save()
+
+    def tearDown(self):
+        """cleanup test files"""
+        paths = [f"shard_test.{name}.json"
+                 for name in ["User", "Place", "Review"]]
+        for path in paths + [self.file_path, f"{self.file_path}.log"]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_unsharded_snapshot_is_read_then_split(self):
+        """a store saved unsharded is read until its first sharded save,
+        which splits it into shards
+        """
+        for name in ["User", "Place"]:
+            os.remove(f"shard_test.{name}.json")
+        unsharded = FileStorage(self.file_path)
+        for obj in self.users + [self.place]:
+            unsharded.new(obj)
+        unsharded.save()
+        storage = FileStorage(self.file_path, sharded=True)
+        storage.reload()
+        self.assertEqual(storage.count(), 3)
+
+        storage.new(User())
+        storage.save()
+        self.assertFalse(os.path.exists(self.file_path))
+        reloaded = FileStorage(self.file_path, sharded=True)
+        reloaded.reload()
+        self.assertEqual(reloaded.count(User), 3)
+        self.assertEqual(reloaded.count(Place), 1)
+
+    def test_save_writes_one_file_per_class(self):
+        """every class is saved to its own shard"""
+        self.assertFalse(os.path.exists(self.file_path))
+        with open("shard_test.User.json", 'r') as f:
+            self.assertEqual(set(json.load(f)),
+                             {f"User.{obj.id}" for obj in self.users})
+        with open("shard_test.Place.json", 'r') as f:
+            self.assertEqual(list(json.load(f)), [f"Place.{self.place.id}"])
+
+    def test_save_rewrites_only_changed_shards(self):
+        """shards of unchanged classes are left untouched"""
+        os.utime("shard_test.User.json", (0, 0))
+        self.storage.new(Review())
+        self.place.name = "Loft"
+        self.storage.new(self.place)
+        self.storage.save()
+        self.assertEqual(os.path.getmtime("shard_test.User.json"), 0)
+        self.assertTrue(os.path.exists("shard_test.Review.json"))
+
+        self.storage.delete(self.place)
+        self.storage.save()
+        self.assertFalse(os.path.exists("shard_test.Place.json"))
+
+    def test_reload_reads_every_shard(self):
+        """reload merges the shards and reports progress over all of them"""
+        calls = []
+        storage = FileStorage(self.file_path, sharded=True)
+        storage.reload(progress=lambda read, total: calls.append(
+            (read, total)))
+        self.assertEqual(storage.count(), 3)
+        self.assertEqual(storage.count(User), 2)
+        size = sum(os.path.getsize(f"shard_test.{name}.json")
+                   for name in ["User", "Place"])
+        self.assertEqual(calls[-1], (size, size))
+
+    def test_compaction_writes_shards_of_logged_classes(self):
+        """reloaded log records mark their shards for the next compaction"""
+        storage = FileStorage(self.file_path, journal=True, sharded=True)
+        storage.reload()
+        self.users[0].first_name = "Betty"
+        storage.new(self.users[0])
+        storage.save()
+        os.utime("shard_test.Place.json", (0, 0))
+
+        storage = FileStorage(self.file_path, journal=True, sharded=True)
+        storage.reload()
+        storage.compact()
+        self.assertFalse(os.path.exists(f"{self.file_path}.log"))
+        self.assertEqual(os.path.getmtime("shard_test.Place.json"), 0)
+        storage = FileStorage(self.file_path, sharded=True)
+        storage.reload()
+        self.assertEqual(storage.get(User, self.users[0].id).first_name,
+                         "Betty")
+
+
+class TestFileStorageParallelReload(unittest.TestCase):
+    """Test cases for reloading shards in worker processes"""
+
+    def setUp(self):
+        """saves test objects in shards"""
+        self.file_path = "parallel_test.json"
+        storage = FileStorage(self.file_path, sharded=True)
+        self.objects = [User(first_name=f"u{i}") for i in range(5)]
+        self.objects += [Place(city_id="c1"), Review(text="ok")]
+        for obj in self.objects:
+            storage.new(obj)
+        storage.save()
+
+    def tearDown(self):
+        """cleanup test files"""
+        for name in ["User", "Place", "Review"]:
+            path = f"parallel_test.{name}.json"
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_reload_in_workers_matches_reload(self):
+        """workers decode the same objects as a single process reload"""
+        expected = {f"{obj.__class__.__name__}.{obj.id}": obj.to_dict()
+                    for obj in self.objects}
+        for lazy in [False, True]:
+            calls = []
+            storage = FileStorage(self.file_path, sharded=True, workers=2,
+                                  lazy=lazy)
+            storage.reload(progress=lambda read, total: calls.append(
+                (read, total)))
+            self.assertEqual(
+                {k: v.to_dict() for k, v in storage.all().items()}, expected)
+            self.assertEqual(storage.lookup(Place, "city_id", "c1"),
+                             storage.all(Place))
+            self.assertEqual(len(calls), 3)
+            self.assertEqual(calls[-1][0], calls[-1][1])
+        self.assertNotIn("HBNB_STORAGE_WORKER", os.environ)
+
+    def test_load_file(self):
+        """load_file returns the objects or the records of a file"""
+        path = "parallel_test.Place.json"
+        place = self.objects[5]
+        objects = file_storage.load_file(path)
+        self.assertEqual([(k, v.to_dict()) for k, v in objects],
+                         [(f"Place.{place.id}", place.to_dict())])
+        records = file_storage.load_file(path, lazy=True)
+        self.assertEqual(records, [(f"Place.{place.id}", place.to_dict())])
+
+
+class TestFileStorageIndexed(unittest.TestCase):
+    """Test cases for FileStorage in indexed mode"""
+
+    def setUp(self):
+        """saves test objects with an offset index"""
+        self.file_path = "indexed_test.json"
+        storage = FileStorage(self.file_path, indexed=True)
+        self.users = [User(first_name=f"u{i}") for i in range(3)]
+        self.place = Place(city_id="c1")
+        for obj in self.users + [self.place]:
+            storage.new(obj)
+        storage.save()
+        self.storage = FileStorage(self.file_path, indexed=True)
+        self.storage.reload()
+
+    def tearDown(self):
+        """cleanup test files"""
+        for path in [self.file_path, f"{self.file_path}.idx"]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def loaded(self):
+        """returns the keys of the instantiated objects"""
+        return set(self.storage._FileStorage__objects.keys())
+
+    def test_get_reads_a_single_record(self):
+        """get instantiates only the requested object"""
+        self.assertTrue(os.path.exists(f"{self.file_path}.idx"))
+        self.assertEqual(self.storage.count(User), 3)
+        user = self.storage.get(User, self.users[1].id)
+        self.assertEqual(user.to_dict(), self.users[1].to_dict())
+        self.assertEqual(self.loaded(), {f"User.{user.id}"})
+
+    def test_attribute_indexes_are_built_on_first_use(self):
+        """lookups and queries fill the attribute indexes when needed"""
+        found = self.storage.lookup(Place, "city_id", "c1")
+        self.assertEqual(list(found), [f"Place.{self.place.id}"])
+        self.assertEqual(self.storage.query(Place, [("city_id", "==", "x")]),
+                         [])
+        self.assertEqual(self.loaded(), {f"Place.{self.place.id}"})
+
+    def test_save_keeps_unread_records_and_rewrites_index(self):
+        """saving copies unread records and indexes the new file"""
+        user = self.storage.get(User, self.users[0].id)
+        user.first_name = "Betty"
+        self.storage.new(user)
+        self.storage.delete(self.storage.get(User, self.users[2].id))
+        self.storage.save()
+        self.assertEqual(self.storage.get(User, self.users[1].id).first_name,
+                         "u1")
+
+        storage = FileStorage(self.file_path, indexed=True)
+        storage.reload()
+        self.assertEqual(storage.count(), 3)
+        self.assertEqual(storage.get(User, user.id).first_name, "Betty")
+        self.assertIsNone(storage.get(User, self.users[2].id))
+
+    def test_reload_without_index_reads_the_snapshot(self):
+        """a missing or stale index falls back to reading every record"""
+        os.remove(f"{self.file_path}.idx")
+        storage = FileStorage(self.file_path, indexed=True)
+        storage.reload()
+        self.assertEqual(storage.count(User), 3)
+        self.assertEqual(storage.get(Place, self.place.id).city_id, "c1")
+
+    def test_compressed_index_raises(self):
+        """a compressed snapshot cannot be indexed"""
+        with self.assertRaises(ValueError):
+            FileStorage(self.file_path, indexed=True, compression="gzip")
@@ -0,0 +1,188 @@
+#!/usr/bin/python3
+"""Module test_formats
+
+This Module contains a tests for the storage formats
+"""
+
+import inspect
+import json
+import os
+import unittest
+from datetime import datetime, timezone
+
+import pycodestyle
+from models.engine import formats
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.user import User
+
+
+class TestFormatsDocsAndStyle(unittest.TestCase):
+    """Tests the formats module for documentation and style conformance"""
+
+    def test_pycodestyle(self):
+        """Tests compliance with pycodestyle"""
+        style = pycodestyle.StyleGuide(quiet=False)
+        result = style.check_files(
+            [
+                "models/engine/formats.py",
+                "tests/test_models/test_engine/test_formats.py"
+            ])
+        self.assertEqual(result.total_errors, 0)
+
+    def test_module_docstring(self):
+        """Tests whether the module is documented"""
+        self.assertTrue(len(formats.__doc__) >= 1)
+
+    def test_classes_docstring(self):
+        """Tests whether the classes and their methods are documented"""
+        for cls in [formats.JSONFormat, formats.JSONLinesFormat,
+                    formats.BinaryFormat, formats.ZlibFile,
+                    formats.CompressedFormat]:
+            self.assertTrue(len(cls.__doc__) >= 1)
+            for func in inspect.getmembers(cls, inspect.isfunction):
+                self.assertTrue(len(func[1].__doc__) >= 1)
+
+
+class TestFormats(unittest.TestCase):
+    """Test cases for the storage formats"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.path = "test_formats.data"
+        self.records = {
+            f"User.{i}": {"__class__": "User", "id": str(i),
+                          "created_at": datetime(2024, 1, 2, 3, 4, 5, i),
+                          "name": "é" * i, "score": i * 1.5,
+                          "big": 1 << 70, "flags": [True, False, None],
+                          "nested": {"a": [i, {"b": "c"}]}}
+            for i in range(20)}
+        self.records["User.tz"] = {
+            "__class__": "User", "id": "tz",
+            "created_at": datetime(2024, 1, 1, tzinfo=timezone.utc)}
+
+    def tearDown(self):
+        """cleanup test files"""
+        for path in [self.path, f"{self.path}.out"]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def round_trip(self, fmt):
+        """returns the records dumped and loaded back with fmt"""
+        with open(self.path, 'wb') as f:
+            fmt.dump({k: fmt.encode(k, v) for k, v in self.records.items()},
+                     f)
+        with open(self.path, 'rb') as f:
+            return dict(fmt.load(f))
+
+    def test_binary_round_trip_keeps_types(self):
+        """the binary format restores datetime and every JSON type"""
+        self.assertEqual(self.round_trip(formats.BinaryFormat()),
+                         self.records)
+
+    def test_text_round_trips(self):
+        """the JSON formats store datetime values as isoformat strings"""
+        expected = {k: {**v, "created_at": v["created_at"].isoformat()}
+                    for k, v in self.records.items()}
+        for name in ["json", "jsonl"]:
+            self.assertEqual(self.round_trip(formats.get_format(name)),
+                             expected)
+
+    def test_compressed_round_trips(self):
+        """every compression restores the records of every format"""
+        for compression in ["zlib", "gzip", "lzma"]:
+            fmt = formats.get_format("binary", compression)
+            self.assertEqual(fmt.name, f"binary.{compression}")
+            self.assertEqual(self.round_trip(fmt), self.records)
+            with open(self.path, 'rb') as f:
+                self.assertNotEqual(f.read(4), formats.BinaryFormat.MAGIC[:4])
+            records = self.round_trip(formats.get_format("json", compression))
+            self.assertEqual(set(records), set(self.records))
+
+    def test_binary_is_smaller_than_json(self):
+        """the binary encoding of a record is shorter than the JSON one"""
+        record = self.records["User.3"]
+        self.assertLess(len(formats.BinaryFormat().encode("User.3", record)),
+                        len(formats.JSONFormat().encode("User.3", record)))
+
+    def test_unknown_names_raise(self):
+        """unknown formats, compressions and files raise ValueError"""
+        with self.assertRaises(ValueError):
+            formats.get_format("xml")
+        with self.assertRaises(ValueError):
+            formats.get_format("json", "zip")
+        with open(self.path, 'wb') as f:
+            f.write(b'{"a": 1}')
+        with open(self.path, 'rb') as f:
+            with self.assertRaises(ValueError):
+                list(formats.BinaryFormat().load(f))
+
+    def test_convert(self):
+        """convert copies every record to another format"""
+        src = formats.get_format("binary", "gzip")
+        dst = formats.get_format("json")
+        with open(self.path, 'wb') as f:
+            src.dump({k: src.encode(k, v) for k, v in self.records.items()},
+                     f)
+        count = formats.convert(self.path, src, f"{self.path}.out", dst)
+        self.assertEqual(count, len(self.records))
+        with open(f"{self.path}.out", 'r') as f:
+            self.assertEqual(set(json.load(f)), set(self.records))
+
+
+class TestFileStorageFormats(unittest.TestCase):
+    """Test cases for FileStorage in every format"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.path = "test_formats_storage.data"
+
+    def tearDown(self):
+        """cleanup test files"""
+        for path in [self.path, f"{self.path}.log"]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_save_and_reload(self):
+        """objects are saved and reloaded in every format"""
+        for name in ["json", "jsonl", "binary"]:
+            for compression in [None, "zlib"]:
+                for lazy in [False, True]:
+                    storage = FileStorage(self.path, format=name,
+                                          compression=compression)
+                    user = User(id="u1", created_at="2024-01-01T00:00:00",
+                                updated_at="2024-01-01T00:00:00")
+                    user.email = "a@b.c"
+                    place = Place()
+                    place.amenity_ids = ["x", "y"]
+                    for obj in [user, place]:
+                        storage.new(obj)
+                    storage.save()
+                    storage = FileStorage(self.path, format=name,
+                                          compression=compression,
+                                          lazy=lazy)
+                    storage.reload()
+                    storage.save()
+                    storage.reload()
+                    loaded = storage.get(Place, place.id)
+                    self.assertEqual(loaded.amenity_ids, ["x", "y"])
+                    self.assertEqual(loaded.created_at, place.created_at)
+                    self.assertEqual(storage.get(User, "u1").to_dict(),
+                                     user.to_dict())
+
+    def test_journal_with_binary_snapshot(self):
+        """the log is replayed over a binary snapshot"""
+        storage = FileStorage(self.path, journal=True, format="binary")
+        user = User()
+        storage.new(user)
+        storage.compact()
+        user.first_name = "Betty"
+        storage.new(user)
+        storage.save()
+        storage = FileStorage(self.path, journal=True, format="binary")
+        storage.reload()
+        self.assertEqual(storage.get(User, user.id).first_name, "Betty")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+#!/usr/bin/python3
+"""Module test_index
+
+This Module contains a tests for AttributeIndex Class
+"""
+
+import inspect
+import unittest
+
+import pycodestyle
+from models.engine import index
+
+AttributeIndex = index.AttributeIndex
+
+
+class TestAttributeIndexDocsAndStyle(unittest.TestCase):
+    """Tests AttributeIndex class for documentation and style conformance"""
+
+    def test_pycodestyle(self):
+        """Tests compliance with pycodestyle"""
+        style = pycodestyle.StyleGuide(quiet=False)
+        result = style.check_files(
+            [
+                "models/engine/index.py",
+                "tests/test_models/test_engine/test_index.py"
+            ])
+        self.assertEqual(result.total_errors, 0)
+
+    def test_module_docstring(self):
+        """Tests whether the module is documented"""
+        self.assertTrue(len(index.__doc__) >= 1)
+
+    def test_class_docstring(self):
+        """Tests whether the class is documented"""
+        self.assertTrue(len(AttributeIndex.__doc__) >= 1)
+
+    def test_methods_docstring(self):
+        """Tests whether the class methods are documented"""
+        funcs = inspect.getmembers(AttributeIndex, inspect.isfunction)
+        for func in funcs:
+            self.assertTrue(len(func[1].__doc__) >= 1)
+
+
+class TestAttributeIndex(unittest.TestCase):
+    """Test cases for AttributeIndex Class"""
+
+    def setUp(self):
+        """creates a test index for other tests"""
+        self.index = AttributeIndex("state_id")
+
+    def test_add_and_get(self):
+        """keys are found by the value they were added with"""
+        self.index.add("City.1", "s1")
+        self.index.add("City.2", "s1")
+        self.index.add("City.3", "s2")
+        self.assertEqual(self.index.get("s1"), {"City.1", "City.2"})
+        self.assertEqual(self.index.get("s3"), set())
+        self.assertEqual(len(self.index), 3)
+
+    def test_add_replaces_previous_value(self):
+        """adding a key again moves it to its new value"""
+        self.index.add("City.1", "s1")
+        self.index.add("City.1", "s2")
+        self.assertEqual(self.index.get("s1"), set())
+        self.assertEqual(self.index.get("s2"), {"City.1"})
+
+    def test_remove(self):
+        """removed keys are no longer found"""
+        self.index.add("City.1", "s1")
+        self.index.remove("City.1")
+        self.index.remove("City.2")
+        self.assertEqual(self.index.get("s1"), set())
+        self.assertEqual(len(self.index), 0)
+
+    def test_list_values_index_every_item(self):
+        """every item of a list value is indexed"""
+        self.index.add("Place.1", ["a1", "a2", ["unhashable"]])
+        self.assertEqual(self.index.get("a2"), {"Place.1"})
+        self.assertEqual(self.index.get(["unhashable"]), set())
+        self.assertTrue(AttributeIndex.matches(["a1", "a2"], "a1"))
+        self.assertFalse(AttributeIndex.matches("a1a2", "a1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+#!/usr/bin/python3
+"""Module test_journal
+
+This Module contains a tests for Journal Class
+"""
+
+import inspect
+import os
+import unittest
+
+import pycodestyle
+from models.engine import journal
+
+Journal = journal.Journal
+
+
+class TestJournalDocsAndStyle(unittest.TestCase):
+    """Tests Journal class for documentation and style conformance"""
+
+    def test_pycodestyle(self):
+        """Tests compliance with pycodestyle"""
+        style = pycodestyle.StyleGuide(quiet=False)
+        result = style.check_files(
+            [
+                "models/engine/journal.py",
+                "tests/test_models/test_engine/test_journal.py"
+            ])
+        self.assertEqual(result.total_errors, 0)
+
+    def test_module_docstring(self):
+        """Tests whether the module is documented"""
+        self.assertTrue(len(journal.__doc__) >= 1)
+
+    def test_class_docstring(self):
+        """Tests whether the class is documented"""
+        self.assertTrue(len(Journal.__doc__) >= 1)
+
+    def test_methods_docstring(self):
+        """Tests whether the class methods are documented"""
+        funcs = inspect.getmembers(Journal, inspect.isfunction)
+        for func in funcs:
+            self.assertTrue(len(func[1].__doc__) >= 1)
+
+
+class TestJournal(unittest.TestCase):
+    """Test cases for Journal Class"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.path = "test_journal.log"
+        self.journal = Journal(self.path)
+
+    def tearDown(self):
+        """cleanup test files"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def replay(self, objects):
+        """returns objects updated by the records of the test log"""
+        for key, obj in self.journal:
+            if obj is None:
+                objects.pop(key, None)
+            else:
+                objects[key] = obj
+        return objects
+
+    def test_append_and_replay(self):
+        """records are replayed in the order they were appended"""
+        self.journal.append([Journal.put("A.1", '{"n": 1}'),
+                             Journal.put("A.2", '{"n": 2}')])
+        self.journal.append([Journal.put("A.1", '{"n": 3}'),
+                             Journal.delete("A.2")])
+        self.assertEqual(self.journal.records, 4)
+        objects = self.replay({"A.0": {"n": 0}})
+        self.assertEqual(objects, {"A.0": {"n": 0}, "A.1": {"n": 3}})
+
+    def test_group_is_replayed_whole_or_not_at_all(self):
+        """a group record is one line, ignored when it is torn"""
+        self.journal.append([Journal.put("A.1", '{"n": 1}')], group=True)
+        self.journal.append([Journal.put("A.2", '{"n": 2}'),
+                             Journal.delete("A.1")], group=True)
+        with open(self.path, 'r') as f:
+            self.assertEqual(len(f.readlines()), 2)
+        self.assertEqual(self.replay({}), {"A.2": {"n": 2}})
+        self.assertEqual(self.journal.records, 3)
+
+        with open(self.path, 'r+') as f:
+            f.truncate(os.path.getsize(self.path) - 5)
+        self.assertEqual(self.replay({}), {"A.1": {"n": 1}})
+
+    def test_append_after_torn_line(self):
+        """records appended after a torn line are read back"""
+        self.journal.append([Journal.put("A.1", '{"n": 1}')])
+        with open(self.path, 'a') as f:
+            f.write('{"op": "put", "key": "A.2", "ob')
+        self.assertEqual(self.replay({}), {"A.1": {"n": 1}})
+        self.journal.append([Journal.put("A.3", '{"n": 3}')])
+        self.journal.append([Journal.delete("A.1")])
+        self.assertEqual(self.replay({}), {"A.3": {"n": 3}})
+
+    def test_tail_reads_after_offset(self):
+        """tail yields only the records appended after an offset"""
+        self.journal.append([Journal.put("A.1", '{"n": 1}')])
+        offset = self.journal.size()
+        self.journal.append([Journal.delete("A.1"),
+                             Journal.put("A.2", '{"n": 2}')], group=True)
+        self.assertEqual(list(self.journal.tail(offset)),
+                         [("A.1", None), ("A.2", {"n": 2})])
+        self.assertEqual(list(self.journal.tail(self.journal.size())), [])
+
+    def test_append_nothing_creates_no_file(self):
+        """appending no record does not touch the file"""
+        self.journal.append([])
+        self.assertFalse(self.journal.exists())
+
+    def test_truncate_removes_the_log(self):
+        """truncate removes the file and resets the record count"""
+        self.journal.append([Journal.delete("A.1")])
+        self.assertGreater(self.journal.size(), 0)
+        self.journal.truncate()
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(self.journal.records, 0)
+
+    def test_discard_keeps_records_after_offset(self):
+        """discard drops the records before offset only"""
+        self.journal.append([Journal.delete("A.1")])
+        offset = self.journal.size()
+        self.journal.append([Journal.delete("A.2")])
+        self.journal.discard(offset)
+        self.assertEqual(self.journal.records, 1)
+        objects = self.replay({"A.1": {}, "A.2": {}})
+        self.assertEqual(objects, {"A.1": {}})
+
+
+if __name__ == "__main__":
+    unittest.main()
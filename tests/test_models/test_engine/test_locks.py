@@ -0,0 +1,100 @@
+#!/usr/bin/python3
+"""Module test_locks
+
+This Module contains a tests for RWLock Class
+"""
+
+import inspect
+import threading
+import time
+import unittest
+
+import pycodestyle
+from models.engine import locks
+
+RWLock = locks.RWLock
+
+
+class TestRWLockDocsAndStyle(unittest.TestCase):
+    """Tests RWLock class for documentation and style conformance"""
+
+    def test_pycodestyle(self):
+        """Tests compliance with pycodestyle"""
+        style = pycodestyle.StyleGuide(quiet=False)
+        result = style.check_files(
+            [
+                "models/engine/locks.py",
+                "tests/test_models/test_engine/test_locks.py"
+            ])
+        self.assertEqual(result.total_errors, 0)
+
+    def test_module_docstring(self):
+        """Tests whether the module is documented"""
+        self.assertTrue(len(locks.__doc__) >= 1)
+
+    def test_class_docstring(self):
+        """Tests whether the class is documented"""
+        self.assertTrue(len(RWLock.__doc__) >= 1)
+
+    def test_methods_docstring(self):
+        """Tests whether the class methods and the decorators are
+        documented
+        """
+        funcs = inspect.getmembers(RWLock, inspect.isfunction)
+        for func in funcs + [("reads", locks.reads),
+                             ("writes", locks.writes)]:
+            self.assertTrue(len(func[1].__doc__) >= 1)
+
+
+class TestRWLock(unittest.TestCase):
+    """Test cases for RWLock Class"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.lock = RWLock()
+        self.events = []
+
+    def run_thread(self, mode, name):
+        """starts a thread holding the lock in mode for a short while"""
+        def hold():
+            """records the time the lock was held"""
+            with getattr(self.lock, mode)():
+                self.events.append((name, "in"))
+                time.sleep(0.05)
+                self.events.append((name, "out"))
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        return thread
+
+    def test_readers_share_writers_exclude(self):
+        """readers overlap each other, a writer overlaps nobody"""
+        threads = [self.run_thread("read", "r1"),
+                   self.run_thread("read", "r2")]
+        time.sleep(0.01)
+        threads.append(self.run_thread("write", "w"))
+        time.sleep(0.01)
+        threads.append(self.run_thread("read", "r3"))
+        for thread in threads:
+            thread.join()
+        names = [name for name, _ in self.events]
+        self.assertEqual(set(names[:2]), {"r1", "r2"})
+        self.assertEqual(names[4:], ["w", "w", "r3", "r3"])
+
+    def test_reentrant(self):
+        """a writer can read and write again, a reader cannot write"""
+        with self.lock.write():
+            with self.lock.read():
+                with self.lock.write():
+                    pass
+        with self.lock.read():
+            with self.lock.read():
+                with self.assertRaises(RuntimeError):
+                    with self.lock.write():
+                        pass
+        with self.lock.write():
+            pass
+
+
+if __name__ == "__main__":
+    unittest.main()
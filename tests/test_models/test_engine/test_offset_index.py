@@ -0,0 +1,101 @@
+#!/usr/bin/python3
+"""Module test_offset_index
+
+This Module contains a tests for OffsetIndex Class
+"""
+
+import inspect
+import os
+import unittest
+
+import pycodestyle
+from models.engine import offset_index
+from models.engine.formats import get_format
+
+OffsetIndex = offset_index.OffsetIndex
+
+
+class TestOffsetIndexDocsAndStyle(unittest.TestCase):
+    """Tests OffsetIndex class for documentation and style conformance"""
+
+    def test_pycodestyle(self):
+        """Tests compliance with pycodestyle"""
+        style = pycodestyle.StyleGuide(quiet=False)
+        result = style.check_files(
+            [
+                "models/engine/offset_index.py",
+                "tests/test_models/test_engine/test_offset_index.py"
+            ])
+        self.assertEqual(result.total_errors, 0)
+
+    def test_module_docstring(self):
+        """Tests whether the module is documented"""
+        self.assertTrue(len(offset_index.__doc__) >= 1)
+
+    def test_class_docstring(self):
+        """Tests whether the class is documented"""
+        self.assertTrue(len(OffsetIndex.__doc__) >= 1)
+
+    def test_methods_docstring(self):
+        """Tests whether the class methods are documented"""
+        funcs = inspect.getmembers(OffsetIndex, inspect.isfunction)
+        for func in funcs:
+            self.assertTrue(len(func[1].__doc__) >= 1)
+
+
+class TestOffsetIndex(unittest.TestCase):
+    """Test cases for OffsetIndex Class"""
+
+    def setUp(self):
+        """writes a snapshot file in every test format"""
+        self.path = "test_offset_index.data"
+        self.records = {f"User.{i:03}": {"__class__": "User",
+                                         "id": f"{i:03}", "name": "é" * i}
+                        for i in range(100, 0, -1)}
+
+    def tearDown(self):
+        """cleanup test files"""
+        for path in [self.path, f"{self.path}.idx"]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def write(self, fmt):
+        """writes the test records and their index with fmt"""
+        offsets = []
+        with open(self.path, 'wb') as f:
+            fmt.dump({k: fmt.encode(k, v) for k, v in self.records.items()},
+                     f, offsets)
+        OffsetIndex.write(self.path, fmt.name, offsets)
+
+    def test_reads_single_records(self):
+        """every record is found and decoded on its own"""
+        for name in ["json", "jsonl", "binary"]:
+            fmt = get_format(name)
+            self.write(fmt)
+            index = OffsetIndex(self.path, name)
+            self.assertEqual(len(index), 100)
+            self.assertEqual(list(index.keys()), sorted(self.records))
+            for key, record in self.records.items():
+                self.assertEqual(fmt.decode(index.fragment(key)), record)
+            self.assertIsNone(index.find("User.999"))
+            self.assertIsNone(index.find("Place.001"))
+            with self.assertRaises(KeyError):
+                index.fragment("User.000")
+            index.close()
+
+    def test_rejects_stale_or_foreign_index(self):
+        """an index is refused for another format or a changed snapshot"""
+        self.write(get_format("json"))
+        with self.assertRaises(ValueError):
+            OffsetIndex(self.path, "binary")
+        with open(self.path, 'ab') as f:
+            f.write(b" ")
+        with self.assertRaises(ValueError):
+            OffsetIndex(self.path, "json")
+        os.remove(f"{self.path}.idx")
+        with self.assertRaises(ValueError):
+            OffsetIndex(self.path, "json")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+#!/usr/bin/python3
+"""Module test_query
+
+This Module contains a tests for Condition Class
+"""
+
+import inspect
+import unittest
+
+import pycodestyle
+from models.engine import query
+from models.place import Place
+
+Condition = query.Condition
+
+
+class TestConditionDocsAndStyle(unittest.TestCase):
+    """Tests Condition class for documentation and style conformance"""
+
+    def test_pycodestyle(self):
+        """Tests compliance with pycodestyle"""
+        style = pycodestyle.StyleGuide(quiet=False)
+        result = style.check_files(
+            [
+                "models/engine/query.py",
+                "tests/test_models/test_engine/test_query.py"
+            ])
+        self.assertEqual(result.total_errors, 0)
+
+    def test_module_docstring(self):
+        """Tests whether the module is documented"""
+        self.assertTrue(len(query.__doc__) >= 1)
+
+    def test_class_docstring(self):
+        """Tests whether the class is documented"""
+        self.assertTrue(len(Condition.__doc__) >= 1)
+
+    def test_methods_docstring(self):
+        """Tests whether the class methods are documented"""
+        funcs = inspect.getmembers(Condition, inspect.isfunction)
+        for func in funcs:
+            self.assertTrue(len(func[1].__doc__) >= 1)
+
+
+class TestCondition(unittest.TestCase):
+    """Test cases for Condition Class"""
+
+    def test_parse_conditions(self):
+        """conditions are parsed with typed values"""
+        conds = Condition.parse(
+            "price_by_night<100, max_guest>=4 latitude>1.5 name='a b'")
+        self.assertEqual(
+            [(c.name, c.op, c.value) for c in conds],
+            [("price_by_night", "<", 100), ("max_guest", ">=", 4),
+             ("latitude", ">", 1.5), ("name", "==", "a b")])
+
+    def test_parse_rejects_invalid_text(self):
+        """text that is not a condition raises ValueError"""
+        for text in ["price_by_night", "name=", "a<1, oops"]:
+            with self.assertRaises(ValueError):
+                Condition.parse(text)
+
+    def test_call_evaluates_the_condition(self):
+        """conditions are evaluated against object attributes"""
+        place = Place(price_by_night=80, amenity_ids=["a1"], name="x")
+        self.assertTrue(Condition("price_by_night", "<", 100)(place))
+        self.assertFalse(Condition("price_by_night", ">=", 100)(place))
+        self.assertTrue(Condition("amenity_ids", "==", "a1")(place))
+        self.assertTrue(Condition("amenity_ids", "!=", "a2")(place))
+        self.assertFalse(Condition("name", "<", 3)(place))
+
+
+class TestPaginate(unittest.TestCase):
+    """Test cases for the paginate function"""
+
+    def test_sort_missing_and_mixed_values(self):
+        """numbers, then other types, then missing values are sorted"""
+        places = [Place(rank=v) for v in ["b", 2.5, None, 1, "a"]]
+        places.append(Place())
+        values = [getattr(p, "rank", None)
+                  for p in query.paginate(places, "rank")]
+        self.assertEqual(values, [1, 2.5, "a", "b", None, None])
+        self.assertEqual(len(query.paginate(places, "nonexistent",
+                                            limit=2)), 2)
+        self.assertEqual(query.paginate(places, "rank", reverse=True,
+                                        limit=1), [places[0]])
+        self.assertEqual(query.paginate(places, "rank", reverse=True)[4:],
+                         [places[2], places[5]])
+
+    def test_unorderable_values(self):
+        """values that cannot be compared raise ValueError"""
+        places = [Place(name={"a": 1}), Place(name={"b": 2})]
+        with self.assertRaises(ValueError):
+            query.paginate(places, "name")
+
+
+class TestCastValue(unittest.TestCase):
+    """Test cases for the cast_value function"""
+
+    def test_strings_take_the_number_type_of_the_attribute(self):
+        """strings are converted to the int or float type of an attribute
+        and other values are kept
+        """
+        place = Place(price_by_night=80, latitude=1.5, name="x")
+        self.assertEqual(query.cast_value(place, "price_by_night", "90"), 90)
+        self.assertEqual(query.cast_value(place, "latitude", "2"), 2.0)
+        self.assertEqual(query.cast_value(place, "latitude", "n"), "n")
+        self.assertEqual(query.cast_value(place, "name", "12"), "12")
+        self.assertEqual(query.cast_value(place, "missing", "12"), "12")
+        self.assertEqual(query.cast_value(place, "max_guest", 3.5), 3.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
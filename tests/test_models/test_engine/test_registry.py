@@ -0,0 +1,70 @@
+#!/usr/bin/python3
+"""Module test_registry
+
+This Module contains a tests for the model registry
+"""
+
+import inspect
+import unittest
+
+import pycodestyle
+from models.base_model import BaseModel
+from models.engine import registry
+from models.review import Review
+
+
+class TestRegistryDocsAndStyle(unittest.TestCase):
+    """Tests registry module for documentation and style conformance"""
+
+    def test_pycodestyle(self):
+        """Tests compliance with pycodestyle"""
+        style = pycodestyle.StyleGuide(quiet=False)
+        result = style.check_files(
+            [
+                "models/engine/registry.py",
+                "tests/test_models/test_engine/test_registry.py"
+            ])
+        self.assertEqual(result.total_errors, 0)
+
+    def test_module_docstring(self):
+        """Tests whether the module is documented"""
+        self.assertTrue(len(registry.__doc__) >= 1)
+
+    def test_functions_docstring(self):
+        """Tests whether the module functions are documented"""
+        funcs = inspect.getmembers(registry, inspect.isfunction)
+        for func in funcs:
+            self.assertTrue(len(func[1].__doc__) >= 1)
+
+
+class TestRegistry(unittest.TestCase):
+    """Test cases for the model registry"""
+
+    def test_get_class_returns_model_classes(self):
+        """model classes are found by name"""
+        self.assertIs(registry.get_class("BaseModel"), BaseModel)
+        self.assertIs(registry.get_class("Review"), Review)
+
+    def test_get_class_raises_for_unknown_names(self):
+        """unknown names raise KeyError"""
+        with self.assertRaises(KeyError):
+            registry.get_class("BModel")
+
+    def test_classes_discovers_every_model(self):
+        """every module of the models package is discovered"""
+        self.assertTrue({"BaseModel", "User", "State", "City", "Amenity",
+                         "Place", "Review"} <= set(registry.classes()))
+
+    def test_subclasses_register_themselves(self):
+        """defining a subclass of BaseModel registers it"""
+        class Listing(BaseModel):
+            """a test model class"""
+
+        try:
+            self.assertIs(registry.get_class("Listing"), Listing)
+        finally:
+            registry._classes.pop("Listing")
+
+
+if __name__ == "__main__":
+    unittest.main()
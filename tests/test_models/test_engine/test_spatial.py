@@ -0,0 +1,115 @@
+#!/usr/bin/python3
+"""Module test_spatial
+
+This Module contains a tests for GridIndex Class
+"""
+
+import inspect
+import unittest
+
+import pycodestyle
+from models.engine import spatial
+
+GridIndex = spatial.GridIndex
+
+
+class TestGridIndexDocsAndStyle(unittest.TestCase):
+    """Tests GridIndex class for documentation and style conformance"""
+
+    def test_pycodestyle(self):
+        """Tests compliance with pycodestyle"""
+        style = pycodestyle.StyleGuide(quiet=False)
+        result = style.check_files(
+            [
+                "models/engine/spatial.py",
+                "tests/test_models/test_engine/test_spatial.py"
+            ])
+        self.assertEqual(result.total_errors, 0)
+
+    def test_module_docstring(self):
+        """Tests whether the module is documented"""
+        self.assertTrue(len(spatial.__doc__) >= 1)
+
+    def test_class_docstring(self):
+        """Tests whether the class is documented"""
+        self.assertTrue(len(GridIndex.__doc__) >= 1)
+
+    def test_methods_docstring(self):
+        """Tests whether the functions and methods are documented"""
+        for func in inspect.getmembers(spatial, inspect.isfunction):
+            self.assertTrue(len(func[1].__doc__) >= 1)
+        for func in inspect.getmembers(GridIndex, inspect.isfunction):
+            self.assertTrue(len(func[1].__doc__) >= 1)
+
+
+class TestSpatialFunctions(unittest.TestCase):
+    """Test cases for the distance and box functions"""
+
+    def test_distance(self):
+        """distance is the great circle distance in kilometers"""
+        self.assertAlmostEqual(spatial.distance(0, 0, 0, 1), 111.195, 3)
+        self.assertAlmostEqual(
+            spatial.distance(48.8566, 2.3522, 51.5074, -0.1278), 343.6, 1)
+        self.assertEqual(spatial.distance(10, 20, 10, 20), 0)
+
+    def test_bounding_box(self):
+        """the box holds the circle, and wraps at the antimeridian"""
+        south, west, north, east = spatial.bounding_box(0, 0, 111.195)
+        self.assertAlmostEqual(north, 1, 3)
+        self.assertAlmostEqual(west, -1, 3)
+        south, west, north, east = spatial.bounding_box(0, 179.5, 111.195)
+        self.assertGreater(west, east)
+        self.assertEqual(len(spatial.split_box(south, west, north, east)), 2)
+        self.assertEqual(spatial.bounding_box(89.5, 0, 200)[1:4:2],
+                         (-180.0, 180.0))
+
+    def test_point(self):
+        """only numbers in range are coordinates"""
+        self.assertEqual(spatial.point(1, 2), (1.0, 2.0))
+        for lat, lon in [("1", 2), (True, 2), (91, 0), (0, -181)]:
+            self.assertIsNone(spatial.point(lat, lon))
+
+
+class TestGridIndex(unittest.TestCase):
+    """Test cases for GridIndex Class"""
+
+    def setUp(self):
+        """indexes a few points"""
+        self.index = GridIndex()
+        self.points = {"sf": (37.7749, -122.4194), "oak": (37.8044, -122.2712),
+                       "sj": (37.3382, -121.8863), "la": (34.0522, -118.2437),
+                       "fiji": (-17.7134, 178.065), "samoa": (-13.759, -172.1),
+                       "bad": ("north", 3)}
+        for key, (lat, lon) in self.points.items():
+            self.index.add(key, lat, lon)
+
+    def test_near(self):
+        """near returns the keys within the radius, nearest first"""
+        self.assertEqual(len(self.index), 6)
+        found = self.index.near(37.7749, -122.4194, 70)
+        self.assertEqual([key for _, key in found], ["sf", "oak", "sj"])
+        self.assertEqual(found[0][0], 0)
+        self.assertEqual(self.index.near(0, 0, 100), [])
+        self.assertEqual([key for _, key in self.index.near(-15, 180, 900)],
+                         ["fiji", "samoa"])
+
+    def test_within(self):
+        """within returns the keys inside the box"""
+        self.assertEqual(sorted(self.index.within(37, -123, 38, -122)),
+                         ["oak", "sf"])
+        self.assertEqual(sorted(self.index.within(-20, 170, -10, -170)),
+                         ["fiji", "samoa"])
+        self.assertEqual(len(self.index.within(-90, -180, 90, 180)), 6)
+
+    def test_updates(self):
+        """points can be moved and removed"""
+        self.index.add("la", 37.78, -122.42)
+        self.index.remove("sf")
+        self.index.remove("sf")
+        self.index.add("oak", None, None)
+        self.assertEqual(self.index.within(37, -123, 38, -122), ["la"])
+        self.assertEqual(len(self.index), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+#!/usr/bin/python3
+"""Module test_stream
+
+This Module contains a tests for RecordReader and ProgressFile Classes
+"""
+
+import inspect
+import json
+import os
+import unittest
+
+import pycodestyle
+from models.engine import stream
+
+RecordReader = stream.RecordReader
+ProgressFile = stream.ProgressFile
+
+
+class TestRecordReaderDocsAndStyle(unittest.TestCase):
+    """Tests RecordReader class for documentation and style conformance"""
+
+    def test_pycodestyle(self):
+        """Tests compliance with pycodestyle"""
+        style = pycodestyle.StyleGuide(quiet=False)
+        result = style.check_files(
+            [
+                "models/engine/stream.py",
+                "tests/test_models/test_engine/test_stream.py"
+            ])
+        self.assertEqual(result.total_errors, 0)
+
+    def test_module_docstring(self):
+        """Tests whether the module is documented"""
+        self.assertTrue(len(stream.__doc__) >= 1)
+
+    def test_class_docstring(self):
+        """Tests whether the class is documented"""
+        self.assertTrue(len(RecordReader.__doc__) >= 1)
+
+    def test_methods_docstring(self):
+        """Tests whether the class methods are documented"""
+        for cls in [RecordReader, ProgressFile]:
+            funcs = inspect.getmembers(cls, inspect.isfunction)
+            for func in funcs:
+                self.assertTrue(len(func[1].__doc__) >= 1)
+
+
+class TestRecordReader(unittest.TestCase):
+    """Test cases for RecordReader Class"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.path = "test_stream.json"
+        self.objects = {f"User.{i}": {"id": str(i), "name": "é" * i,
+                                      "n": [i, {"x": None}]}
+                        for i in range(50)}
+
+    def tearDown(self):
+        """cleanup test files"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def write(self, text):
+        """writes text to the test file"""
+        with open(self.path, 'w', encoding="utf-8") as f:
+            f.write(text)
+
+    def read(self, chunk_size=1 << 16):
+        """returns the records of the test file"""
+        with open(self.path, 'rb') as f:
+            return list(RecordReader(f, chunk_size=chunk_size))
+
+    def test_reads_every_record_with_any_chunk_size(self):
+        """records are decoded whatever the chunk boundaries"""
+        self.write(json.dumps(self.objects, indent=2, ensure_ascii=False))
+        for chunk_size in [1, 7, 64, 1 << 16]:
+            records = self.read(chunk_size)
+            self.assertEqual(dict(records), self.objects)
+            self.assertEqual([k for k, _ in records], list(self.objects))
+
+    def test_empty_object(self):
+        """an empty object yields no record"""
+        self.write(" { } ")
+        self.assertEqual(self.read(), [])
+
+    def test_progress_reports_bytes_read(self):
+        """ProgressFile reports every read up to the file size"""
+        self.write(json.dumps(self.objects))
+        calls = []
+        size = os.path.getsize(self.path)
+        with open(self.path, 'rb') as f:
+            tracked = ProgressFile(f, size, lambda read, total: calls.append(
+                (read, total)))
+            records = list(RecordReader(tracked, chunk_size=100))
+        self.assertEqual(dict(records), self.objects)
+        self.assertEqual(calls[-1], (size, size))
+        self.assertEqual(len(calls), -(-size // 100))
+
+    def test_malformed_file_raises(self):
+        """a file that is not one JSON object raises ValueError"""
+        for text in ['[1, 2]', '{"a": {"b": 1}', '{"a" 1}']:
+            self.write(text)
+            with self.assertRaises(ValueError):
+                self.read(chunk_size=4)
+
+
+if __name__ == "__main__":
+    unittest.main()